@@ -4,10 +4,19 @@ Action Agent - Handles DO mode command execution.
 
 from strands import Agent
 from strands.tools import tool
-from typing import List, Dict
-import os
+from datetime import datetime, timezone
+from typing import List, Dict, Optional
 import json
 
+from app.config import settings
+from app.services.agent_executor import agent_executor
+from app.services.agent_pool import AgentPool
+from app.services.agent_stream import EventCallback, forward_events
+from app.services.dataset_registry import Dataset
+from app.services.model_cascade import action_cascade, strip_confidence
+from app.services.time_context import reference_time_line, time_context
+from app.utils.prompt_format import serialize_records
+
 SYSTEM_INSTRUCTION_ACTIONS = """
 You are an AI action agent for X360. You execute operational tasks with precision.
 
@@ -20,6 +29,8 @@ Capabilities:
 
 Always confirm what action you're taking before executing.
 Provide clear feedback on action results.
+If you cannot tell which action the command asks for, or which tickets it applies to,
+take no action and end your reply with <confidence>low</confidence>.
 """
 
 
@@ -27,13 +38,23 @@ class ActionAgent:
     """Agent for handling DO mode action execution."""
 
     def __init__(self):
-        model_id = os.getenv("BEDROCK_MODEL_ACTION", "amazon.nova-pro-v1:0")
-        print(f"[DEBUG] ActionAgent initializing with model: {model_id}")
-        self.agent = Agent(
-            model=model_id,
-            system_prompt=SYSTEM_INSTRUCTION_ACTIONS
+        # BEDROCK_MODEL_ACTION is the strong tier; the cascade tries the fast tier
+        # first. Both pools take their model IDs from the cascade.
+        self.cascade = action_cascade
+        self.model = self.cascade.models["strong"]
+        print(f"[DEBUG] ActionAgent initializing with model: {self.model}")
+        self.pool = AgentPool(
+            "action",
+            lambda: self._new_agent(self.cascade.models["strong"]),
+            max_size=settings.agent_pool_size,
+            checkout_timeout_seconds=settings.agent_pool_checkout_timeout_seconds,
+        )
+        self.fast_pool = AgentPool(
+            "action-fast",
+            lambda: self._new_agent(self.cascade.models["fast"]),
+            max_size=settings.agent_pool_size,
+            checkout_timeout_seconds=settings.agent_pool_checkout_timeout_seconds,
         )
-        self.model = model_id
 
     @tool
     def update_ticket_status(self, ticket_id: str, new_status: str, reason: str) -> dict:
@@ -67,33 +88,72 @@ class ActionAgent:
             "message": "Notification sent"
         }
 
-    async def execute(self, command: str, context: dict) -> str:
+    def _new_agent(self, model: Optional[str] = None) -> Agent:
+        """Build an agent with the action tools."""
+        return Agent(
+            model=model or self.model,
+            system_prompt=SYSTEM_INSTRUCTION_ACTIONS,
+            tools=[
+                self.update_ticket_status,
+                self.trigger_automation,
+                self.send_notification
+            ]
+        )
+
+    def _invoke(
+        self,
+        prompt: str,
+        on_event: Optional[EventCallback] = None,
+        tier: str = "strong",
+        limits: Optional[dict] = None
+    ):
+        """Run one prompt on a pooled agent of a cascade tier (called on an executor thread)."""
+        pool = self.fast_pool if tier == "fast" else self.pool
+        kwargs = {"limits": limits} if limits else {}
+        with pool.lease() as agent, forward_events(agent, on_event):
+            return agent(prompt, **kwargs), None
+
+    def _run(self, command: str, prompt: str, on_event: Optional[EventCallback] = None):
+        """
+        Run a prompt through the model cascade (called on an executor thread).
+
+        An attempt whose actions already ran is kept rather than escalated.
+        """
+        response, _ = self.cascade.run(
+            command, lambda tier, limits: self._invoke(prompt, on_event, tier, limits), on_event
+        )
+        return response
+
+    async def execute(
+        self,
+        command: str,
+        context: dict,
+        dataset: Optional[Dataset] = None,
+        on_event: Optional[EventCallback] = None
+    ) -> str:
         """
         Execute an action command.
 
         Args:
             command: User's action command
             context: Context including data
+            dataset: Uploaded dataset to use instead of context['data']
+            on_event: Receives text deltas and tool events as the agent runs
 
         Returns:
             Execution result message
         """
 
-        # Create agent with action tools
-        agent_with_tools = Agent(
-            model=self.model,
-            system_prompt=SYSTEM_INSTRUCTION_ACTIONS,
-            tools=[
-                self.update_ticket_status,
-                self.trigger_automation,
-                self.send_notification
-            ]
-        )
+        # Provide context, with the same SLA timing fields and reference time as ASK mode
+        now = datetime.now(timezone.utc)
+        if dataset is not None:
+            data_context = dataset.serialized(now)
+        else:
+            data_context = serialize_records(time_context.store(context.get('data', []), now).tickets)
 
-        # Provide context
-        data_context = json.dumps(context.get('data', []), indent=2)
+        full_prompt = f"""{reference_time_line(now)}
 
-        full_prompt = f"""SYSTEM DATA:
+SYSTEM DATA:
 {data_context}
 
 USER COMMAND: {command}
@@ -101,7 +161,7 @@ USER COMMAND: {command}
 Execute the requested action and provide clear feedback."""
 
         try:
-            response = agent_with_tools(full_prompt)
+            response = await agent_executor.run(self._run, command, full_prompt, on_event)
             response_text = str(response)
 
             # Extract just the <response> content if present, otherwise use full text
@@ -109,6 +169,7 @@ Execute the requested action and provide clear feedback."""
             response_match = re.search(r'<response>(.*?)</response>', response_text, re.DOTALL)
             if response_match:
                 response_text = response_match.group(1).strip()
+            response_text, _ = strip_confidence(response_text)
 
             return response_text
         except Exception as e:
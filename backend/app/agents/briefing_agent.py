@@ -3,10 +3,35 @@ Briefing Agent (Night Watchman) - Analyzes virtualization layer data.
 """
 
 from strands import Agent
-from strands_tools import current_time
-from typing import List, Dict
+from datetime import datetime, timezone
+from pydantic import BaseModel
+from typing import AsyncIterator, List, Dict, Optional, Set, Tuple, Type
+import asyncio
 import os
 import json
+import logging
+
+from app.config import settings
+from app.services.agent_executor import agent_executor
+from app.models.briefing import BriefingItem, BriefingNarrative, BriefingSummary
+from app.services.briefing_delta import (
+    BriefingSnapshot,
+    briefing_snapshots,
+    changed_ticket_ids,
+    fingerprint_tickets,
+    touches,
+    unaffected,
+)
+from app.services.briefing_partition import merge_items, partition_tickets
+from app.services.sla_analyzer import sla_analyzer, dataset_profile, sort_items, summarize_findings
+from app.services.time_context import reference_time_line
+from app.utils.json_stream import JsonItemStream, extract_json_object
+from app.utils.prompt_format import serialize_records
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the prompts change so cached briefings are not reused
+PROMPT_VERSION = "6"
 
 # System instruction from constants.ts
 SYSTEM_INSTRUCTION_NIGHT_WATCHMAN = """
@@ -14,23 +39,17 @@ You are "Night Watchman," an AI agent that monitors a unified virtualization lay
 aggregating data from ServiceNow, Salesforce, Jira, Zendesk, Datadog, and PagerDuty.
 
 Your purpose:
-- Detect SLA breaches (tickets approaching or past due dates)
-- Identify data conflicts between systems (duplicates, inconsistencies)
+- Summarize SLA breaches (tickets approaching or past due dates)
+- Summarize data conflicts between systems (duplicates, inconsistencies)
 - Surface actionable insights (patterns, urgent items, resource bottlenecks)
 
-## Available Tools:
-
-### current_time
-Use to get the current date and time when needed for:
-- Determining if tickets are overdue (past their dueDate)
-- Identifying tickets approaching SLA breach (near their dueDate)
-- Any date/time comparisons with ticket dates
-
-The tool returns current time in ISO 8601 format. Compare date portions with ticket dueDate fields.
+SLA breaches and data conflicts are precomputed and provided to you as findings.
+Treat them as verified facts; your job is the narrative and the insights.
+Each prompt states the REFERENCE TIME the findings were computed against.
 
 Return structured JSON with:
 - summary: Brief overview of system health
-- items: Array of issues with severity, type, and suggested actions
+- insights: Array of insights with severity and suggested actions
 """
 
 
@@ -40,49 +59,319 @@ class BriefingAgent:
     def __init__(self):
         model_id = os.getenv("BEDROCK_MODEL_BRIEFING", "amazon.nova-pro-v1:0")
         print(f"[DEBUG] BriefingAgent initializing with model: {model_id}")
-        self.agent = Agent(
-            model=model_id,
-            system_prompt=SYSTEM_INSTRUCTION_NIGHT_WATCHMAN,
-            tools=[current_time]
-        )
+        self.model = model_id
+        self.analyzer = sla_analyzer
+        self.snapshots = briefing_snapshots
+
+    @property
+    def prompt_version(self) -> str:
+        """Prompt version including the dataset encoding (part of cache keys)."""
+        return f"{PROMPT_VERSION}-{settings.prompt_data_format}"
 
-    async def analyze_data(self, data: List[dict]) -> dict:
+    async def analyze_data(self, data: List[dict], dataset_id: Optional[str] = None) -> dict:
         """
         Analyze virtualization layer data and generate briefing.
 
+        SLA breaches and data conflicts are computed locally by the SLA
+        analyzer; the model only writes the summary and insights over those
+        precomputed findings. When a previous snapshot of the same dataset
+        exists, only items touching changed tickets are re-derived.
+
+        Args:
+            data: List of tickets from various systems
+            dataset_id: Identifies the dataset across requests for delta briefings
+
+        Returns:
+            Dictionary with summary and list of briefing items. If the model
+            call failed, 'fallback' is set so callers can avoid caching it.
+        """
+        now = datetime.now(timezone.utc)
+        fingerprints, reusable, changed, findings, kept_insights = self._plan(data, dataset_id, now)
+        if reusable is not None:
+            return self._format_result(reusable.summary, reusable.findings + reusable.insights)
+
+        # Call agent and parse JSON response
+        try:
+            if len(data) > settings.briefing_partition_threshold:
+                summary, new_insights = await self._narrate_partitioned(
+                    data, findings, now, changed, kept_insights
+                )
+            else:
+                prompt = self._build_narrative_prompt(data, findings, now, changed, kept_insights)
+                output = await agent_executor.run(self._invoke_structured, prompt, BriefingNarrative)
+                summary, raw_insights = self._parse_narrative(output)
+                new_insights = self._collect_insights(raw_insights, findings + kept_insights)
+
+            insights = kept_insights + new_insights
+
+            if summary is None:
+                # Insights were salvaged but the summary was lost; serve them without caching
+                result = self._format_result(summarize_findings(findings, len(data)), findings + insights)
+                result["fallback"] = True
+                return result
+
+            self.snapshots.put(dataset_id, BriefingSnapshot(
+                fingerprints, now.date(), findings, insights, summary
+            ))
+            return self._format_result(summary, findings + insights)
+
+        except Exception as e:
+            print(f"Briefing agent error: {e}")
+            # Findings are still valid without the model; only the narrative is lost
+            result = self._format_result(summarize_findings(findings, len(data)), findings + kept_insights)
+            result["fallback"] = True
+            return result
+
+    async def stream_analysis(self, data: List[dict], dataset_id: Optional[str] = None) -> AsyncIterator[dict]:
+        """
+        Stream a briefing as events, emitting each item as soon as it exists.
+
+        Precomputed findings are emitted immediately, then insights are parsed
+        out of the model's streamed output one by one, followed by the summary.
+
         Args:
             data: List of tickets from various systems
+            dataset_id: Identifies the dataset across requests for delta briefings
+
+        Yields:
+            {"event": "item", "data": item}, then {"event": "summary", "data": {...}}
+        """
+        now = datetime.now(timezone.utc)
+        fingerprints, reusable, changed, findings, kept_insights = self._plan(data, dataset_id, now)
+
+        for item in findings + kept_insights:
+            yield {"event": "item", "data": item.model_dump()}
+
+        if reusable is not None:
+            yield {"event": "summary", "data": {"summary": reusable.summary}}
+            return
+
+        try:
+            if len(data) > settings.briefing_partition_threshold:
+                summary, new_insights = await self._narrate_partitioned(
+                    data, findings, now, changed, kept_insights
+                )
+                for item in new_insights:
+                    yield {"event": "item", "data": item.model_dump()}
+            else:
+                prompt = self._build_narrative_prompt(data, findings, now, changed, kept_insights)
+                parser = JsonItemStream(array_key="insights")
+                new_insights = []
+                async for event in self._new_agent().stream_async(prompt):
+                    if "data" not in event:
+                        continue
+                    raw_insights = parser.feed(event["data"])
+                    for item in self._collect_insights(raw_insights, findings + kept_insights + new_insights):
+                        new_insights.append(item)
+                        yield {"event": "item", "data": item.model_dump()}
+
+                summary = extract_json_object(parser.text, string_keys=("summary",)).get("summary")
+                if not summary:
+                    raise ValueError("Streamed response has no summary")
+
+            self.snapshots.put(dataset_id, BriefingSnapshot(
+                fingerprints, now.date(), findings, kept_insights + new_insights, summary
+            ))
+            yield {"event": "summary", "data": {"summary": summary}}
+
+        except Exception as e:
+            print(f"Briefing agent error: {e}")
+            yield {
+                "event": "summary",
+                "data": {"summary": summarize_findings(findings, len(data)), "fallback": True}
+            }
+
+    def _plan(self, data: List[dict], dataset_id: Optional[str], now: datetime):
+        """
+        Compute findings locally, reusing the dataset's previous snapshot.
+
+        Returns:
+            Tuple of (fingerprints, reusable snapshot or None, changed IDs or
+            None for a full briefing, findings, insights kept from the snapshot)
+        """
+        fingerprints = fingerprint_tickets(data)
+        previous = self.snapshots.get(dataset_id)
+
+        if previous is None or previous.reference_date != now.date():
+            return fingerprints, None, None, self.analyzer.analyze(data, now=now), []
+
+        changed = changed_ticket_ids(previous.fingerprints, fingerprints)
+        if not changed:
+            return fingerprints, previous, changed, previous.findings, previous.insights
+
+        # Conflicts group by ID, so analyzing every record of the changed IDs is exact
+        changed_data = [t for t in data if str(t.get("id")) in changed]
+        findings = sort_items(
+            unaffected(previous.findings, changed) + self.analyzer.analyze(changed_data, now=now)
+        )
+        logger.debug(f"Delta briefing: {len(changed)} of {len(fingerprints)} ticket IDs changed")
+        return fingerprints, None, changed, findings, unaffected(previous.insights, changed)
+
+    def _new_agent(self) -> Agent:
+        """Create a fresh agent per call (agents are not reentrant and keep history)."""
+        return Agent(
+            model=self.model,
+            system_prompt=SYSTEM_INSTRUCTION_NIGHT_WATCHMAN
+        )
+
+    async def _narrate_partitioned(
+        self,
+        data: List[dict],
+        findings: List[BriefingItem],
+        now: datetime,
+        changed: Optional[Set[str]],
+        kept_insights: List[BriefingItem]
+    ) -> Tuple[str, List[BriefingItem]]:
+        """
+        Map-reduce narrative for datasets too large for one prompt.
+
+        Map: one partial briefing per shard, run concurrently under
+        BRIEFING_MAX_CONCURRENCY. Reduce: merge and de-duplicate the partial
+        insights and write one summary over the partial summaries.
+        """
+        shards = partition_tickets(
+            data,
+            key=settings.briefing_partition_key,
+            max_shard_size=settings.briefing_shard_max_tickets
+        )
+        if changed:
+            # Delta briefing: only shards containing changed tickets need new insights
+            shards = [shard for shard in shards if any(str(t.get("id")) in changed for t in shard)]
+
+        semaphore = asyncio.Semaphore(settings.briefing_max_concurrency)
+
+        async def run_shard(shard: List[dict]) -> Tuple[str, List[BriefingItem]]:
+            shard_ids = {str(t.get("id")) for t in shard}
+            prompt = self._build_narrative_prompt(
+                shard,
+                [item for item in findings if touches(item, shard_ids)],
+                now,
+                changed & shard_ids if changed else None,
+                [item for item in kept_insights if touches(item, shard_ids)]
+            )
+            async with semaphore:
+                output = await agent_executor.run(self._invoke_structured, prompt, BriefingNarrative)
+            summary, raw_insights = self._parse_narrative(output)
+            return summary or "", self._collect_insights(raw_insights, findings + kept_insights)
+
+        results = await asyncio.gather(*(run_shard(shard) for shard in shards), return_exceptions=True)
+        partials = [r for r in results if not isinstance(r, BaseException)]
+        failures = len(results) - len(partials)
+        if failures:
+            print(f"Briefing agent: {failures} of {len(shards)} partial briefings failed")
+        if shards and not partials:
+            raise RuntimeError("All partial briefings failed")
+
+        insights = merge_items(shard_insights for _, shard_insights in partials)
+
+        prompt = self._build_reduce_prompt(
+            data, findings, now, [summary for summary, _ in partials if summary], kept_insights + insights
+        )
+        output = await agent_executor.run(self._invoke_structured, prompt, BriefingSummary)
+        if not output.get('summary'):
+            raise ValueError("Response missing required fields")
+
+        return output['summary'], insights
+
+    def _invoke_structured(self, prompt: str, output_model: Type[BaseModel]) -> dict:
+        """
+        Run a fresh agent with its output bound to output_model.
+
+        Blocking; run it through the agent executor. If the model's output
+        does not validate, every valid field and insight is salvaged from
+        what it produced instead of retrying the call.
 
         Returns:
-            Dictionary with summary and list of briefing items
+            The structured output as a dict (possibly partial or empty)
+        """
+        agent = self._new_agent()
+        try:
+            response = agent(prompt, structured_output_model=output_model)
+        except Exception as e:
+            print(f"Structured output failed, salvaging partial output: {e}")
+            return salvage_from_messages(getattr(agent, "messages", []))
+
+        structured = getattr(response, "structured_output", None)
+        if structured is not None:
+            return structured.model_dump()
+        return extract_json_object(str(response), array_key="insights", string_keys=("summary",))
+
+    @staticmethod
+    def _parse_narrative(output: dict) -> Tuple[Optional[str], List[dict]]:
+        """
+        Split narrative output into its summary and raw insights.
+
+        Raises:
+            ValueError: If neither a summary nor any insight could be recovered
         """
-        from pydantic import BaseModel
+        summary = output.get('summary') or None
+        insights = output.get('insights') or []
+        if summary is None and not insights:
+            raise ValueError("Response missing required fields")
+        return summary, insights
+
+    @staticmethod
+    def _format_result(summary: str, items: List[BriefingItem]) -> dict:
+        return {
+            "summary": summary,
+            "items": [item.model_dump() for item in items]
+        }
+
+    def _build_narrative_prompt(
+        self,
+        data: List[dict],
+        findings: List[BriefingItem],
+        now: datetime,
+        changed: Optional[Set[str]] = None,
+        kept_insights: Optional[List[BriefingItem]] = None
+    ) -> str:
+        """Build the compact prompt asking the model for a summary and insights."""
+        findings_context = serialize_records(
+            [item.model_dump(exclude={"suggestedAction"}) for item in findings]
+        )
+        profile_context = json.dumps(dataset_profile(data), separators=(",", ":"))
 
-        # Define the expected output structure
-        class BriefingOutput(BaseModel):
-            summary: str
-            items: List[dict]
+        if changed:
+            insight_instruction = (
+                "insights: up to 3 NEW patterns involving the changed tickets only "
+                "(existing insights below are kept as-is)"
+            )
+            delta_context = f"""
+CHANGED TICKET IDS SINCE LAST BRIEFING:
+{json.dumps(sorted(changed))}
 
-        # Format data for analysis
-        data_context = json.dumps(data, indent=2)
+EXISTING INSIGHTS (still valid, do not repeat):
+{json.dumps([i.title for i in kept_insights or []])}
+"""
+        else:
+            insight_instruction = (
+                "insights: up to 3 important patterns (resource bottlenecks, "
+                "customers at risk, systems out of sync)"
+            )
+            delta_context = ""
+
+        return f"""Write the morning briefing narrative for the virtualization layer.
 
-        prompt = f"""Analyze this data from the virtualization layer and generate a morning briefing.
+{reference_time_line(now)}
+TICKETS ANALYZED: {len(data)}
 
-DATA:
-{data_context}
+DATASET PROFILE (counts):
+{profile_context}
 
-Identify:
-1. SLA breaches (tickets near or past due date - use the current_time tool to get today's date, then compare with each ticket's dueDate field)
-2. Data conflicts (duplicate tickets with same ID but different statuses or priorities)
-3. Important insights (patterns, urgent items)
+PRECOMPUTED FINDINGS (SLA breaches and data conflicts, already verified - do not recompute or repeat them):
+{findings_context}
+{delta_context}
+Write:
+1. summary: a brief overview of system health based on the findings and profile
+2. {insight_instruction}
 
 IMPORTANT: Return ONLY valid JSON matching this exact structure (no markdown, no code blocks, just raw JSON):
 {{
   "summary": "Brief overview of system health",
-  "items": [
+  "insights": [
     {{
       "id": "unique_id",
-      "type": "SLA_BREACH or DATA_CONFLICT or INSIGHT",
+      "type": "INSIGHT",
       "title": "Short title",
       "description": "Detailed description",
       "severity": "CRITICAL or HIGH or MEDIUM or LOW",
@@ -95,43 +384,90 @@ IMPORTANT: Return ONLY valid JSON matching this exact structure (no markdown, no
 Return only the JSON object, nothing else.
 """
 
-        # Call agent and parse JSON response
-        try:
-            response = self.agent(prompt)
-            response_text = str(response)
-
-            # Extract just the <response> content if present, otherwise use full text
-            import re
-            response_match = re.search(r'<response>(.*?)</response>', response_text, re.DOTALL)
-            if response_match:
-                response_text = response_match.group(1).strip()
-
-            # Try to parse JSON from response
-            # Remove markdown code blocks if present
-            if "```json" in response_text:
-                start = response_text.find("```json") + 7
-                end = response_text.find("```", start)
-                response_text = response_text[start:end].strip()
-            elif "```" in response_text:
-                start = response_text.find("```") + 3
-                end = response_text.find("```", start)
-                response_text = response_text[start:end].strip()
-
-            # Parse JSON
-            result = json.loads(response_text)
-
-            # Validate structure
-            if 'summary' not in result or 'items' not in result:
-                raise ValueError("Response missing required fields")
+    def _build_reduce_prompt(
+        self,
+        data: List[dict],
+        findings: List[BriefingItem],
+        now: datetime,
+        partial_summaries: List[str],
+        insights: List[BriefingItem]
+    ) -> str:
+        """Build the prompt that merges partial briefings into one summary."""
+        finding_counts: Dict[str, Dict[str, int]] = {}
+        for item in findings:
+            by_severity = finding_counts.setdefault(item.type, {})
+            by_severity[item.severity] = by_severity.get(item.severity, 0) + 1
 
-            return result
+        top_findings = [item.title for item in findings[:20]]
 
-        except Exception as e:
-            print(f"Briefing agent error: {e}")
-            return {
-                "summary": "System is offline. Displaying cached operational data.",
-                "items": []
-            }
+        return f"""Write the overall morning briefing summary from {len(partial_summaries)} partial briefings.
+
+{reference_time_line(now)}
+TICKETS ANALYZED: {len(data)}
+
+DATASET PROFILE (counts):
+{json.dumps(dataset_profile(data), separators=(",", ":"))}
+
+FINDING COUNTS (by type and severity):
+{json.dumps(finding_counts, separators=(",", ":"))}
+
+MOST SEVERE FINDINGS:
+{json.dumps(top_findings)}
+
+PARTIAL SUMMARIES:
+{json.dumps(partial_summaries)}
+
+INSIGHTS:
+{json.dumps([item.title for item in insights])}
+
+IMPORTANT: Return ONLY valid JSON matching this exact structure (no markdown, no code blocks, just raw JSON):
+{{
+  "summary": "Brief overview of overall system health"
+}}
+
+Return only the JSON object, nothing else.
+"""
+
+    @staticmethod
+    def _collect_insights(raw_insights: List[dict], findings: List[BriefingItem]) -> List[BriefingItem]:
+        """Validate model insights, skipping malformed ones and ID collisions."""
+        taken_ids = {item.id for item in findings}
+        insights = []
+        for raw in raw_insights or []:
+            try:
+                item = BriefingItem(**{**raw, "type": "INSIGHT"})
+            except Exception as e:
+                print(f"Skipping malformed insight: {e}")
+                continue
+            if item.id in taken_ids:
+                counter = len(taken_ids)
+                while f"insight-{counter}" in taken_ids:
+                    counter += 1
+                item.id = f"insight-{counter}"
+            taken_ids.add(item.id)
+            insights.append(item)
+        return insights
+
+
+def salvage_from_messages(messages: List[dict]) -> dict:
+    """
+    Recover narrative output from an agent's messages after a failed call.
+
+    Looks at the most recent assistant turns for a structured-output tool
+    call (whose input may fail validation as a whole) or plain JSON text.
+    """
+    for message in reversed(messages):
+        if message.get("role") != "assistant":
+            continue
+        for block in message.get("content", []):
+            tool_input = block.get("toolUse", {}).get("input")
+            if isinstance(tool_input, dict) and ("summary" in tool_input or "insights" in tool_input):
+                return tool_input
+            if "text" in block:
+                salvaged = extract_json_object(block["text"], array_key="insights", string_keys=("summary",))
+                if salvaged:
+                    return salvaged
+    return {}
 
 
 # Initialize agent instance
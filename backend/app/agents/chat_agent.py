@@ -3,13 +3,38 @@ Chat Agent - Handles ASK mode interactions.
 """
 
 from strands import Agent
+from strands.agent.conversation_manager import NullConversationManager
 from strands.tools import tool
-from strands_tools import retrieve, current_time
-from typing import List, Dict
+from strands.tools.executors import ConcurrentToolExecutor
+from datetime import datetime, timezone
+from contextvars import ContextVar
+from typing import Callable, List, Dict, Optional
+import contextlib
 import os
 import json
+import time
+import logging
 
 from app.config import settings
+from app.services.agent_executor import agent_executor
+from app.services.agent_pool import AgentPool
+from app.services.agent_stream import EventCallback, forward_events
+from app.services.answer_cache import answer_cache
+from app.services.chat_history import RunningSummary, history_manager
+from app.services.chat_relevance import ChatContext
+from app.services.citations import collect_citations
+from app.services.chat_sessions import ChatSession, chat_sessions, context_key
+from app.services.dataset_registry import Dataset
+from app.services.intent_router import intent_router
+from app.services.kb_cache import cached_retrieve_tool, kb_cache
+from app.services.model_cascade import chat_cascade, strip_confidence
+from app.services.speculative_retrieval import speculative_retriever
+from app.services.ticket_store import TicketStore
+from app.services.time_context import reference_time_line, time_context
+from app.utils.hashing import dataset_hash
+from app.utils.prompt_format import estimate_tokens
+
+logger = logging.getLogger(__name__)
 
 # Set environment variables for the retrieve tool before it's used
 os.environ.setdefault("KNOWLEDGE_BASE_ID", settings.knowledge_base_id)
@@ -17,6 +42,10 @@ os.environ.setdefault("AWS_REGION", settings.knowledge_base_region)
 os.environ.setdefault("MIN_SCORE", str(settings.knowledge_base_min_score))
 os.environ.setdefault("RETRIEVE_ENABLE_METADATA_DEFAULT", "true")
 
+# Indexed dataset of the request being served. Bound server-side so tools take
+# only IDs or filters; the executor copies it into the worker thread running the agent.
+_request_store: ContextVar[TicketStore] = ContextVar("request_store", default=TicketStore([]))
+
 SYSTEM_INSTRUCTION_CHAT = """
 You are an AI agent assistant for X360, a virtualized ops platform.
 You help operators understand tickets, data conflicts, system insights, and provide knowledge from documentation.
@@ -24,11 +53,20 @@ You help operators understand tickets, data conflicts, system insights, and prov
 ## Available Tools:
 
 ### query_tickets
-Use for questions about specific ticket data in the current dataset:
-- Finding tickets by ID, status, priority, or customer
-- Data conflicts between systems
+Use to fetch full records for specific tickets in the current dataset.
+Pass only the ticket IDs; the dataset is already available to the tool.
+Useful for:
+- Details of tickets by ID
+- Data conflicts between systems (every duplicate record is returned)
 - SLA breaches related to specific tickets
-- Ticket aggregations or counts
+
+### find_tickets
+Use to filter, sort and count tickets without reading the whole dataset:
+- filters on status, priority, customer, source, assignee (value or list of values),
+  dueBefore/dueAfter (ISO dates, inclusive), open (true = not closed/resolved),
+  overdue (true = open and past due)
+- sort by "dueDate" or "priority"; prefix with "-" for descending
+- the result's "total" is the full match count, even when fewer tickets are returned
 
 ### retrieve
 Use for questions requiring documentation or best practices:
@@ -38,16 +76,17 @@ Use for questions requiring documentation or best practices:
 - General knowledge not in ticket data
 When calling retrieve, use the 'text' parameter with your query.
 
-### current_time
-Use to get the current date and time when needed for:
-- Determining if tickets are overdue
-- Calculating time-based SLA breaches
-- Any date/time comparisons
+## Dates and SLAs:
+Each prompt states a REFERENCE TIME. Open tickets in the dataset carry
+daysOverdue and daysUntilDue computed against it; use those fields for
+overdue and SLA questions instead of comparing dates yourself.
 
 ## Decision Guidelines:
-1. **Ticket-specific queries** → use query_tickets
+1. **Ticket-specific queries** → use query_tickets (by ID) or find_tickets (by field, counts, rankings)
 2. **Knowledge/how-to queries** → use retrieve
 3. **Hybrid queries** → use both tools (e.g., "What's wrong with TKT-101 and how do I fix it?")
+4. Tool calls that do not depend on each other's results (such as query_tickets and retrieve
+   for a hybrid query) belong in the same turn; they run in parallel
 
 ## Line of Business Clarification:
 Policies and procedures differ between lines of business:
@@ -60,50 +99,34 @@ When a user asks about policies, procedures, SLAs, or compliance and it is NOT c
 
 If the context (e.g., ticket data, previous conversation) makes the line of business clear, proceed without asking.
 
+## Confidence:
+If the ticket data and documentation do not let you answer reliably, end your reply with
+<confidence>low</confidence>.
+
 Be concise and actionable. Reference specific ticket IDs when relevant.
 """
 
 
-def extract_citations_from_text(response_text: str) -> List[Dict]:
-    """Extract citation metadata from retrieve tool output."""
-    citations = []
-    lines = response_text.split('\n')
-
-    current_citation = {}
-    for line in lines:
-        if line.startswith('Score: '):
-            if current_citation:
-                citations.append(current_citation)
-            current_citation = {'score': float(line.split(': ')[1])}
-        elif line.startswith('Document ID: '):
-            current_citation['documentId'] = line.split(': ', 1)[1]
-        elif line.startswith('Metadata: ') and 'x-amz-bedrock-kb-source-uri' in line:
-            import ast
-            try:
-                metadata_str = line.split(': ', 1)[1]
-                metadata = ast.literal_eval(metadata_str)
-                current_citation['sourceUri'] = metadata.get('x-amz-bedrock-kb-source-uri', '')
-                current_citation['chunkId'] = metadata.get('x-amz-bedrock-kb-chunk-id', '')
-                current_citation['dataSourceId'] = metadata.get('x-amz-bedrock-kb-data-source-id', '')
-            except:
-                pass
-
-    if current_citation:
-        citations.append(current_citation)
-
-    return citations if citations else None
-
-
 class ChatAgent:
     """Agent for handling ASK mode chat interactions."""
 
     def __init__(self):
-        model_id = os.getenv("BEDROCK_MODEL_CHAT", "amazon.nova-lite-v1:0")
-        self.agent = Agent(
-            model=model_id,
-            system_prompt=SYSTEM_INSTRUCTION_CHAT
+        # Requests start on the fast tier (BEDROCK_MODEL_CHAT); the cascade escalates
+        # to the strong tier. Both pools take their model IDs from the cascade.
+        self.cascade = chat_cascade
+        self.model = self.cascade.models["fast"]
+        self.pool = AgentPool(
+            "chat",
+            lambda: self._new_agent(self.cascade.models["fast"]),
+            max_size=settings.agent_pool_size,
+            checkout_timeout_seconds=settings.agent_pool_checkout_timeout_seconds,
+        )
+        self.strong_pool = AgentPool(
+            "chat-strong",
+            lambda: self._new_agent(self.cascade.models["strong"]),
+            max_size=settings.agent_pool_size,
+            checkout_timeout_seconds=settings.agent_pool_checkout_timeout_seconds,
         )
-        self.model = model_id
 
         # Knowledge Base configuration (stored for reference)
         self.kb_id = settings.knowledge_base_id
@@ -112,118 +135,321 @@ class ChatAgent:
         self.kb_max_results = settings.knowledge_base_max_results
 
     @tool
-    def query_tickets(self, ticket_ids: List[str], context_data: dict) -> List[dict]:
-        """Find specific tickets by ID from the context data."""
-        tickets = context_data.get('data', [])
-        return [t for t in tickets if t.get('id') in ticket_ids]
-
-    async def chat(self, message: str, history: List[dict], context: dict) -> Dict:
+    def query_tickets(self, ticket_ids: List[str]) -> List[dict]:
         """
-        Process chat message with conversation history and context.
+        Look up tickets by ID in the current dataset.
 
         Args:
-            message: User's message
-            history: Conversation history
-            context: Context including data and briefing
+            ticket_ids: Ticket IDs to return, e.g. ["TKT-101", "TKT-102"]
+        """
+        return _request_store.get().get(ticket_ids)
 
-        Returns:
-            Dict with 'response' (str) and 'citations' (List[dict] or None)
+    @tool
+    def find_tickets(self, filters: Optional[dict] = None, sort: str = "", limit: int = 20) -> dict:
         """
+        Filter and sort tickets in the current dataset.
 
-        # Add tools with context (both ticket queries and knowledge base)
-        agent_with_tools = Agent(
-            model=self.model,
+        Args:
+            filters: e.g. {"status": "Open", "priority": ["High", "Critical"], "dueBefore": "2026-01-24"}.
+                Keys: status, priority, customer, source, assignee, dueBefore, dueAfter, open, overdue
+            sort: "dueDate", "-dueDate", "priority" or "-priority" (empty keeps dataset order)
+            limit: Maximum tickets to return (default 20)
+        """
+        return _request_store.get().find(filters or {}, sort or None, limit)
+
+    def _new_agent(self, model: Optional[str] = None) -> Agent:
+        """Build a tool-equipped chat agent (both ticket queries and knowledge base)."""
+        return Agent(
+            model=model or self.model,
             system_prompt=SYSTEM_INSTRUCTION_CHAT,
-            tools=[self.query_tickets, retrieve, current_time]
+            tools=[self.query_tickets, self.find_tickets, cached_retrieve_tool(kb_cache)],
+            # Tool calls of one model turn run in parallel (sync tools on worker threads)
+            tool_executor=ConcurrentToolExecutor(),
+            # Sessions compact their own message list (_record_turn); a sliding
+            # window would silently drop the message carrying the context block
+            conversation_manager=NullConversationManager()
         )
 
-        # Build conversation context
-        data_context = json.dumps(context.get('data', []), indent=2)
-        briefing_context = json.dumps(context.get('briefing', {}), indent=2)
+    def _invoke(
+        self,
+        prompt: str,
+        messages: Optional[List[dict]] = None,
+        on_event: Optional[EventCallback] = None,
+        tier: str = "fast",
+        limits: Optional[dict] = None
+    ):
+        """
+        Run one prompt on a pooled agent (called on an executor thread).
 
-        # Format conversation history
-        conversation = "\n".join([
-            f"{'User' if msg['role'] == 'user' else 'Agent'}: {msg['content']}"
-            for msg in history
-        ])
+        Args:
+            prompt: The new user turn
+            messages: A session's prior conversation to continue, if any
+                (copied, so an escalated attempt starts from the same turn)
+            on_event: Receives text deltas and tool events while the agent runs
+            tier: Cascade tier whose pool runs the prompt ("fast" or "strong")
+            limits: Strands invocation limits (the fast tier's turn budget)
 
-        full_prompt = f"""CURRENT DATASET:
-{data_context}
+        Returns:
+            Tuple of (agent result, conversation after the turn or None)
+        """
+        pool = self.strong_pool if tier == "strong" else self.pool
+        kwargs = {"limits": limits} if limits else {}
+        with pool.lease() as agent, forward_events(agent, on_event):
+            if messages is None:
+                return agent(prompt, **kwargs), None
+            agent.messages = list(messages)
+            response = agent(prompt, **kwargs)
+            return response, agent.messages
+
+    def _run(
+        self,
+        message: str,
+        prompt: str,
+        messages: Optional[List[dict]] = None,
+        on_event: Optional[EventCallback] = None
+    ):
+        """
+        Run a prompt through the model cascade (called on an executor thread).
 
-LATEST BRIEFING:
-{briefing_context}
+        Each attempt collects its own citations, so an escalated answer never
+        cites what the discarded fast attempt retrieved.
+
+        Returns:
+            Tuple of (agent result, (conversation after the turn or None, citations))
+        """
+        def attempt(tier: str, limits: Optional[dict]):
+            with collect_citations() as collector:
+                response, conversation = self._invoke(prompt, messages, on_event, tier, limits)
+            return response, (conversation, collector.citations())
+
+        return self.cascade.run(message, attempt, on_event)
+
+    async def chat(
+        self,
+        message: str,
+        history: List[dict],
+        context: dict,
+        dataset: Optional[Dataset] = None,
+        session: Optional[ChatSession] = None,
+        on_event: Optional[EventCallback] = None
+    ) -> Dict:
+        """
+        Process chat message with conversation history and context.
+
+        Args:
+            message: User's message
+            history: Conversation history (only used to seed a new session)
+            context: Context including data and briefing
+            dataset: Uploaded dataset to use instead of context['data']; its
+                indexed view and prompt encoding are reused across messages
+            session: Server-side session; the agent's message list is kept
+                between turns and only the new message is appended
+            on_event: Receives text deltas and tool events as the agent runs
+                (see agent_stream); not called for answers that skip the model
+
+        Returns:
+            Dict with 'response' (str) and 'citations' (List[dict] or None)
+        """
+
+        # SLA timing and the ticket indexes are built once per dataset and day
+        now = datetime.now(timezone.utc)
+        if dataset is not None:
+            store = dataset.store(now)
+            data_hash = dataset.content_hash
+        else:
+            data_hash = dataset_hash(context.get('data', []))
+            store = time_context.store(context.get('data', []), now, data_hash)
+        relevant: Optional[ChatContext] = None
+
+        def context_block() -> str:
+            return f"""{reference_time_line(now)}
+
+{relevant.render()}"""
+
+        # Turns of one session are serialized so its message list stays consistent
+        async with (session.lock if session is not None else contextlib.nullcontext()):
+            if session is not None and not session.turns and not session.recent and history:
+                # New or expired session: seed it with the client's history
+                session.summary, session.recent = history_manager.compact(RunningSummary(), history)
+
+            # Simple lookups, counts and overdue lists are answered from the
+            # index; the same question on the same dataset, briefing and
+            # conversation state is answered from cache. Neither calls Bedrock.
+            routed = intent_router.route(message, store)
+            scope = answer_cache.scope(
+                data_hash, context.get('briefing'), now, session.recent if session is not None else history
+            )
+            local = {"response": routed.response, "citations": None} if routed else answer_cache.get(scope, message)
+            if local is not None:
+                if session is not None:
+                    self._record_local_turn(
+                        session, message, local["response"], context_key(data_hash, context.get('briefing'), now)
+                    )
+                return {"response": local["response"], "citations": local["citations"]}
+
+            # Only the tickets and briefing items relevant to this message are
+            # sent; the tools reach the rest of the dataset
+            relevant = ChatContext(
+                store,
+                context.get('briefing'),
+                message,
+                top_k=settings.chat_relevant_tickets_top_k,
+                briefing_items=settings.chat_relevant_briefing_items,
+            )
+
+            if session is None:
+                full_prompt = f"""{context_block()}
 
 CONVERSATION HISTORY:
-{conversation}
+{history_manager.render(history)}
 
 USER: {message}
 
 AGENT:"""
+                messages = None
+            else:
+                key = context_key(data_hash, context.get('briefing'), now)
+                full_prompt = self._session_prompt(session, message, key, context_block, relevant)
+                messages = list(session.messages)
+                prior = len(messages)
+
+            store_token = _request_store.set(store)
+            try:
+                # Hybrid questions start their knowledge base query before the model runs
+                with speculative_retriever.speculate(message, store, kb_cache.results):
+                    started = time.perf_counter()
+                    response, (messages, citations) = await agent_executor.run(
+                        self._run, message, full_prompt, messages, on_event
+                    )
+                    intent_router.record_agent_latency(time.perf_counter() - started)
+                response_text = str(response)
+
+                # Extract just the <response> content if present, otherwise use full text
+                import re
+                response_match = re.search(r'<response>(.*?)</response>', response_text, re.DOTALL)
+                if response_match:
+                    response_text = response_match.group(1).strip()
+                response_text, _ = strip_confidence(response_text)
+
+                logger.debug(f"Collected {len(citations or [])} citations")
+
+                if session is not None:
+                    self._record_turn(session, message, response_text, messages, prior, key)
+                answer_cache.set(scope, message, {"response": response_text, "citations": citations})
+
+                return {
+                    "response": response_text,
+                    "citations": citations
+                }
+            except Exception as e:
+                print(f"Chat agent error: {e}")
+                return {
+                    "response": "I am having trouble connecting to the X360 core. Please check your connection.",
+                    "citations": None
+                }
+            finally:
+                _request_store.reset(store_token)
+
+    @staticmethod
+    def _session_prompt(
+        session: ChatSession,
+        message: str,
+        key: str,
+        context_block: Callable[[], str],
+        relevant: Optional[ChatContext] = None
+    ) -> str:
+        """
+        Build the next user turn of a session.
+
+        The context block is only sent on the first turn, after compaction and
+        when the dataset, briefing or reference date changed; otherwise the
+        turn is the message, preceded by the tickets it matches (if any). A
+        fresh message list gets the compacted conversation so far (or the
+        client's seed history).
+        """
+        if session.context_key == key:
+            if relevant is not None and relevant.matched:
+                return f"{relevant.tickets_block()}\n\nUSER: {message}"
+            return message
+
+        parts = [context_block()]
+        if session.messages:
+            parts[0] = f"CONTEXT UPDATED (replaces the earlier dataset and briefing):\n{parts[0]}"
+        elif session.recent or session.summary.folded:
+            parts.append(
+                f"CONVERSATION HISTORY:\n{history_manager.render_compacted(session.summary, session.recent)}"
+            )
+        parts.append(f"USER: {message}")
+        return "\n\n".join(parts)
+
+    @classmethod
+    def _record_local_turn(cls, session: ChatSession, message: str, response_text: str, key: str) -> None:
+        """
+        Store a turn answered without the model (intent router or answer cache).
+
+        When the agent's message list already holds the current context, the
+        exchange is appended to it as if the model had answered; otherwise the
+        list is dropped and the next turn resends the context with the
+        conversation (including this exchange) from the session log.
+        """
+        if session.messages and session.context_key == key:
+            messages = session.messages + [
+                {"role": "user", "content": [{"text": message}]},
+                {"role": "assistant", "content": [{"text": response_text}]},
+            ]
+            cls._record_turn(session, message, response_text, messages, len(session.messages), key)
+            return
+
+        session.messages = []
+        session.context_key = None
+        session.turns += 1
+        session.recent.extend([
+            {"role": "user", "content": message},
+            {"role": "model", "content": response_text},
+        ])
+        chat_sessions.save(session)
+
+    @staticmethod
+    def _record_turn(
+        session: ChatSession,
+        message: str,
+        response_text: str,
+        messages: List[dict],
+        prior: int,
+        key: str
+    ) -> None:
+        """
+        Store a completed turn, compacting the session once it outgrows the budget.
+
+        Compaction folds older turns into the running summary and starts a new
+        message list; the next turn resends the context block with the
+        compacted history, so the agent's input stays bounded. Tool-heavy
+        sessions also compact once the message list outgrows
+        CHAT_SESSION_MAX_MESSAGES, since short turns add messages faster
+        than tokens.
+        """
+        session.messages = messages
+        session.context_key = key
+        session.turns += 1
+        session.recent.extend([
+            {"role": "user", "content": message},
+            {"role": "model", "content": response_text},
+        ])
+        # The prompt message carries the context block; count the user's words
+        # plus everything the agent added (tool calls, tool results, reply)
+        session.conversation_tokens += estimate_tokens(message) + estimate_tokens(
+            json.dumps(messages[prior + 1:], default=str)
+        )
+
+        if (session.conversation_tokens > history_manager.token_budget
+                or len(session.messages) > settings.chat_session_max_messages):
+            session.summary, session.recent = history_manager.compact(session.summary, session.recent)
+            session.messages = []
+            session.context_key = None
+            session.conversation_tokens = 0
+            logger.debug(f"Session {session.session_id} compacted after {session.turns} turns")
 
-        def search_for_retrieve_in_trace(trace_dict, depth=0):
-            """Recursively search for retrieve tool in trace tree."""
-            trace_name = trace_dict.get('name', 'unknown')
-
-            # Check if this is the retrieve tool (name could be 'retrieve' or 'Tool: retrieve')
-            if trace_name == 'retrieve' or 'retrieve' in trace_name.lower():
-                # Look for the tool output in the message
-                if 'message' in trace_dict:
-                    message = trace_dict['message']
-
-                    if isinstance(message, dict) and 'content' in message:
-                        tool_output = message['content']
-
-                        # The retrieve tool returns: [{'text': 'formatted citation text'}]
-                        if isinstance(tool_output, list) and len(tool_output) > 0:
-                            content_block = tool_output[0]
-                            if isinstance(content_block, dict) and 'text' in content_block:
-                                citation_text = content_block['text']
-                                return extract_citations_from_text(citation_text)
-
-                        # Fallback: if tool_output is a string
-                        elif isinstance(tool_output, str):
-                            return extract_citations_from_text(tool_output)
-
-            # Recursively search children
-            if 'children' in trace_dict and trace_dict['children']:
-                for child_trace in trace_dict['children']:
-                    result = search_for_retrieve_in_trace(child_trace, depth + 1)
-                    if result:
-                        return result
-
-            return None
-
-        try:
-            response = agent_with_tools(full_prompt)
-            response_text = str(response)
-
-            # Extract just the <response> content if present, otherwise use full text
-            import re
-            response_match = re.search(r'<response>(.*?)</response>', response_text, re.DOTALL)
-            if response_match:
-                response_text = response_match.group(1).strip()
-
-            # Extract citations from AgentResult traces
-            citations = None
-            if hasattr(response, 'metrics') and hasattr(response.metrics, 'traces'):
-                for trace in response.metrics.traces:
-                    trace_dict = trace.to_dict() if hasattr(trace, 'to_dict') else trace.__dict__
-                    citations = search_for_retrieve_in_trace(trace_dict)
-                    if citations:
-                        break
-
-            print(f"[CITATIONS DEBUG] Extracted citations: {citations}")
-
-            return {
-                "response": response_text,
-                "citations": citations
-            }
-        except Exception as e:
-            print(f"Chat agent error: {e}")
-            return {
-                "response": "I am having trouble connecting to the X360 core. Please check your connection.",
-                "citations": None
-            }
+        chat_sessions.save(session)
 
 
 # Initialize agent instance
@@ -19,11 +19,100 @@ class Settings(BaseSettings):
     bedrock_model_chat: str = "amazon.nova-lite-v1:0"
     bedrock_model_action: str = "amazon.nova-pro-v1:0"
 
+    # Model cascade: the fast tier answers first, the strong tier only on escalation triggers
+    # (ASK: the chat model is the fast tier; DO: the action model is the strong tier)
+    chat_cascade_enabled: bool = True
+    chat_cascade_strong_model: str = "amazon.nova-pro-v1:0"
+    chat_cascade_max_turns: int = 6
+    action_cascade_enabled: bool = True
+    action_cascade_fast_model: str = "amazon.nova-lite-v1:0"
+    cascade_long_question_tokens: int = 150
+    cascade_multi_entity_count: int = 3
+
+    # Thread pool for blocking agent calls (keeps the event loop responsive)
+    agent_executor_max_workers: int = 16
+    agent_executor_max_queue: int = 64
+
+    # Pre-built agents per mode (chat, action), reused across requests
+    agent_pool_size: int = 8
+    agent_pool_checkout_timeout_seconds: float = 30.0
+
+    # Dataset encoding in agent prompts: json, minified, table or dictionary
+    prompt_data_format: str = "table"
+
+    # Uploaded datasets kept server-side (LRU beyond this count)
+    dataset_registry_max_datasets: int = 32
+
+    # Server-side ASK mode chat sessions (expire after this long idle; compacted
+    # once the agent's message list grows past max_messages)
+    chat_session_ttl_seconds: int = 1800
+    chat_session_max_sessions: int = 256
+    chat_session_max_messages: int = 40
+
+    # ASK mode history: recent turns kept verbatim, older ones summarized
+    chat_history_token_budget: int = 1500
+    chat_history_keep_turns: int = 4
+
+    # ASK mode prompts: most relevant tickets and briefing items sent per message
+    chat_relevant_tickets_top_k: int = 15
+    chat_relevant_briefing_items: int = 5
+
+    # ASK mode answer cache: similar questions on the same dataset reuse the answer
+    answer_cache_enabled: bool = True
+    answer_cache_similarity_threshold: float = 0.85
+    answer_cache_max_scopes: int = 256
+    answer_cache_entries_per_scope: int = 64
+    answer_cache_ttl_seconds: int = 900
+
+    # ASK mode fast path: lookup/count/overdue questions answered without the LLM
+    intent_router_enabled: bool = True
+    intent_router_list_limit: int = 10
+
+    # Hybrid ASK questions: knowledge base retrieval started in parallel with the first model call
+    speculative_retrieval_enabled: bool = True
+    speculative_retrieval_min_overlap: float = 0.6
+    speculative_retrieval_timeout_seconds: float = 10.0
+    speculative_retrieval_max_workers: int = 4
+
     # AWS Bedrock Knowledge Base
     knowledge_base_id: str = "WKSR8FEXOD"
     knowledge_base_region: str = "us-west-2"
     knowledge_base_min_score: float = 0.4
     knowledge_base_max_results: int = 5
+    knowledge_base_backend: str = "bedrock"  # "bedrock", "local" or "tiered" (local first)
+
+    # Local offline knowledge base (markdown/text documents, BM25 index on disk)
+    local_kb_docs_dir: str = "kb_docs"
+    local_kb_index_path: str = ".cache/local_kb_index.json"
+    local_kb_chunk_chars: int = 1200
+
+    # Knowledge Base retrieve result cache ("memory" or "sqlite")
+    kb_cache_enabled: bool = True
+    kb_cache_backend: str = "memory"
+    kb_cache_path: str = ".cache/kb_cache.sqlite3"
+    kb_cache_ttl_seconds: int = 3600
+    kb_cache_max_entries: int = 512
+
+    # Briefing result cache ("memory" or "sqlite")
+    briefing_cache_enabled: bool = True
+    briefing_cache_backend: str = "memory"
+    briefing_cache_path: str = ".cache/briefing_cache.sqlite3"
+    briefing_cache_ttl_seconds: int = 900
+    briefing_cache_max_entries: int = 128
+
+    # Incremental briefing: number of datasets whose last snapshot is kept
+    briefing_snapshot_max_datasets: int = 16
+
+    # Night Watchman background briefings
+    briefing_schedule_enabled: bool = False
+    briefing_schedule_interval_seconds: int = 3600
+    briefing_schedule_scenario: Optional[str] = None  # test_data scenario to watch (demo)
+
+    # Map-reduce briefing for datasets larger than the threshold
+    briefing_partition_threshold: int = 2000
+    briefing_partition_key: str = "customer"  # "customer" or "source"
+    briefing_shard_max_tickets: int = 1000
+    briefing_max_concurrency: int = 4
 
     # API Configuration
     api_host: str = "0.0.0.0"
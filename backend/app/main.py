@@ -3,10 +3,14 @@ X360 AI Agent - FastAPI Backend
 Main application entry point.
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.routers import briefing, chat
+from app.agents import action_agent, chat_agent
+from app.services.agent_executor import agent_executor
+from app.services.briefing_scheduler import briefing_scheduler
+from app.routers import briefing, chat, datasets
 import logging
 
 # Configure logging
@@ -15,10 +19,29 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop the Night Watchman background briefing scheduler."""
+    if settings.briefing_schedule_enabled:
+        if settings.briefing_schedule_scenario:
+            # Demo only: the test scenario loader is not imported otherwise
+            from app.utils.test_data_loader import load_scenario
+            scenario = settings.briefing_schedule_scenario
+            briefing_scheduler.register_source(scenario, lambda: load_scenario(scenario))
+        logger.info(f"Night Watchman scheduler every {settings.briefing_schedule_interval_seconds}s")
+        briefing_scheduler.start()
+    yield
+    await briefing_scheduler.stop()
+
+
 app = FastAPI(
     title="X360 AI Agent API",
     description="FastAPI backend with Strands agents for X360",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS Configuration
@@ -33,6 +56,7 @@ app.add_middleware(
 # Include routers
 app.include_router(briefing.router, prefix="/api/v1", tags=["briefing"])
 app.include_router(chat.router, prefix="/api/v1", tags=["chat"])
+app.include_router(datasets.router, prefix="/api/v1", tags=["datasets"])
 
 
 @app.get("/")
@@ -47,7 +71,12 @@ async def health():
     return {
         "status": "healthy",
         "version": "1.0.0",
-        "bedrock_region": settings.aws_default_region
+        "bedrock_region": settings.aws_default_region,
+        "agent_executor": agent_executor.stats(),
+        "agent_pools": {
+            "chat": chat_agent.pool.stats(),
+            "action": action_agent.pool.stats()
+        }
     }
 
 
@@ -3,15 +3,19 @@ Pydantic models for request/response validation.
 """
 
 from .ticket import Ticket
-from .briefing import BriefingItem, BriefingRequest, BriefingResponse
+from .briefing import BriefingItem, BriefingRequest, BriefingResponse, StoredBriefingResponse
 from .chat import ChatMessage, ChatRequest, ChatResponse
+from .dataset import DatasetUploadRequest, DatasetResponse
 
 __all__ = [
     "Ticket",
     "BriefingItem",
     "BriefingRequest",
     "BriefingResponse",
+    "StoredBriefingResponse",
     "ChatMessage",
     "ChatRequest",
     "ChatResponse",
+    "DatasetUploadRequest",
+    "DatasetResponse",
 ]
@@ -18,10 +18,24 @@ class BriefingItem(BaseModel):
     suggestedAction: Optional[str] = None
 
 
+class BriefingNarrative(BaseModel):
+    """Structured model output: briefing summary plus insight items."""
+
+    summary: str
+    insights: List[BriefingItem] = []
+
+
+class BriefingSummary(BaseModel):
+    """Structured model output for the reduce step of a partitioned briefing."""
+
+    summary: str
+
+
 class BriefingRequest(BaseModel):
     """Request payload for briefing analysis."""
 
-    data: List[dict]  # RAW_CHAOTIC_DATA from frontend
+    data: Optional[List[dict]] = None  # RAW_CHAOTIC_DATA from frontend; omit to use an uploaded dataset
+    datasetId: Optional[str] = None  # Uploaded dataset, and identity for delta briefings across requests
 
 
 class BriefingResponse(BaseModel):
@@ -29,3 +43,13 @@ class BriefingResponse(BaseModel):
 
     summary: str
     items: List[BriefingItem]
+
+
+class StoredBriefingResponse(BriefingResponse):
+    """Precomputed briefing served by the Night Watchman scheduler."""
+
+    datasetId: str
+    version: int
+    datasetHash: str
+    generatedAt: str
+    checkedAt: str
@@ -28,9 +28,11 @@ class ChatRequest(BaseModel):
     """Request payload for chat interaction."""
 
     message: str
-    history: List[ChatMessage]
+    history: List[ChatMessage] = []  # Not needed on later turns of a session
     mode: Literal["ASK", "DO"]
     context: Optional[dict] = None  # Contains data and briefing
+    datasetId: Optional[str] = None  # Uploaded dataset to use instead of context['data']
+    sessionId: Optional[str] = None  # ASK mode: keep the conversation server-side
 
 
 class ChatResponse(BaseModel):
@@ -39,3 +41,4 @@ class ChatResponse(BaseModel):
     response: str
     timestamp: int
     citations: Optional[List[Citation]] = None
+    sessionId: Optional[str] = None
@@ -0,0 +1,22 @@
+"""
+Dataset models for server-side ticket set uploads.
+"""
+
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class DatasetUploadRequest(BaseModel):
+    """Request payload for uploading a ticket set."""
+
+    data: List[dict]
+    datasetId: Optional[str] = None  # Defaults to an ID derived from the content hash
+
+
+class DatasetResponse(BaseModel):
+    """A stored dataset, referenced by datasetId in chat and briefing requests."""
+
+    datasetId: str
+    contentHash: str
+    ticketCount: int
+    createdAt: str
@@ -2,6 +2,6 @@
 API route handlers.
 """
 
-from . import briefing, chat
+from . import briefing, chat, datasets
 
-__all__ = ["briefing", "chat"]
+__all__ = ["briefing", "chat", "datasets"]
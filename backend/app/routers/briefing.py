@@ -3,8 +3,14 @@ Briefing API endpoints.
 """
 
 from fastapi import APIRouter, HTTPException
-from app.models.briefing import BriefingRequest, BriefingResponse
+from typing import List, Optional, Tuple
+from fastapi.responses import StreamingResponse
+from app.models.briefing import BriefingRequest, BriefingResponse, StoredBriefingResponse
 from app.agents.briefing_agent import briefing_agent
+from app.services.briefing_cache import briefing_cache
+from app.services.briefing_scheduler import briefing_scheduler
+from app.services.dataset_registry import Dataset, DatasetNotFoundError, dataset_registry
+from app.utils.sse import format_sse
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,14 +25,29 @@ async def run_briefing(request: BriefingRequest):
     Analyzes data from multiple systems and returns:
     - Summary of system health
     - List of items (SLA breaches, conflicts, insights)
+
+    Results are cached by dataset content, model and prompt version, so
+    reposting the same data returns immediately. Pass datasetId without data
+    to brief an uploaded dataset.
     """
+    data, dataset = _resolve_data(request)
     try:
-        logger.info(f"Running briefing analysis on {len(request.data)} data points")
+        logger.info(f"Running briefing analysis on {len(data)} data points")
+
+        cache_key = _cache_key(data, dataset)
+        cached = briefing_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Briefing cache hit: {len(cached.get('items', []))} items")
+            return BriefingResponse(**cached)
 
-        result = await briefing_agent.analyze_data(request.data)
+        result = await briefing_agent.analyze_data(data, dataset_id=request.datasetId)
 
         logger.info(f"Briefing complete: {len(result.get('items', []))} items found")
 
+        if not result.get("fallback"):
+            briefing_cache.set(cache_key, result)
+            _remember(request, data, dataset, result)
+
         return BriefingResponse(**result)
 
     except Exception as e:
@@ -36,3 +57,108 @@ async def run_briefing(request: BriefingRequest):
             summary="System is offline. Displaying cached operational data.",
             items=[]
         )
+
+
+@router.post("/briefing/stream")
+async def stream_briefing(request: BriefingRequest):
+    """
+    Stream a morning briefing as Server-Sent Events.
+
+    Events:
+    - item: one BriefingItem, emitted as soon as it is produced
+    - summary: {"summary": "..."} once the narrative is complete
+    - done: {"itemCount": n, "cached": bool}, always last
+    """
+    data, dataset = _resolve_data(request)
+
+    async def events():
+        cache_key = _cache_key(data, dataset)
+        cached = briefing_cache.get(cache_key)
+        if cached is not None:
+            for item in cached["items"]:
+                yield format_sse("item", item)
+            yield format_sse("summary", {"summary": cached["summary"]})
+            yield format_sse("done", {"itemCount": len(cached["items"]), "cached": True})
+            return
+
+        items = []
+        summary = None
+        try:
+            async for event in briefing_agent.stream_analysis(data, dataset_id=request.datasetId):
+                if event["event"] == "item":
+                    items.append(event["data"])
+                else:
+                    summary = event["data"]
+                yield format_sse(event["event"], event["data"])
+        except Exception as e:
+            logger.error(f"Briefing stream failed: {str(e)}", exc_info=True)
+            yield format_sse("error", {"message": "System is offline. Displaying cached operational data."})
+
+        if summary is not None and not summary.get("fallback"):
+            result = {"summary": summary["summary"], "items": items}
+            briefing_cache.set(cache_key, result)
+            _remember(request, data, dataset, result)
+
+        logger.info(f"Briefing stream complete: {len(items)} items")
+        yield format_sse("done", {"itemCount": len(items), "cached": False})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/briefing/latest", response_model=StoredBriefingResponse)
+async def latest_briefing(datasetId: Optional[str] = None):
+    """
+    Return the latest precomputed briefing without calling Bedrock.
+
+    Briefings are stored by the Night Watchman scheduler and by successful
+    POST /briefing calls.
+    """
+    stored = briefing_scheduler.latest(datasetId)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="No briefing has been computed for this dataset yet")
+    return StoredBriefingResponse(**stored.to_dict())
+
+
+def _resolve_data(request: BriefingRequest) -> Tuple[List[dict], Optional[Dataset]]:
+    """Return the request's tickets: inline data, or the uploaded dataset it references."""
+    if request.data is not None:
+        return request.data, None
+    if request.datasetId is None:
+        raise HTTPException(status_code=422, detail="Provide data or the datasetId of an uploaded dataset")
+    try:
+        dataset = dataset_registry.get(request.datasetId)
+    except DatasetNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Dataset {request.datasetId} not found; upload it again")
+    return dataset.tickets, dataset
+
+
+def _cache_key(data: List[dict], dataset: Optional[Dataset]) -> str:
+    return briefing_cache.make_key(
+        data,
+        briefing_agent.model,
+        briefing_agent.prompt_version,
+        content_hash=dataset.content_hash if dataset else None,
+    )
+
+
+def _remember(request: BriefingRequest, data: List[dict], dataset: Optional[Dataset], result: dict) -> None:
+    """
+    Store the result as latest and keep watching uploaded datasets overnight.
+
+    Inline data is not watched: it can never change, so re-briefing it would
+    only repeat this result.
+    """
+    briefing_scheduler.record(request.datasetId, data, result)
+    if dataset is not None:
+        # Re-uploads under the same ID are picked up by the next scheduled run
+        briefing_scheduler.register_source(dataset.dataset_id, dataset_registry.loader(dataset.dataset_id))
+
+
+@router.get("/briefing/cache/stats")
+async def briefing_cache_stats():
+    """Return briefing cache hit/miss counters."""
+    return briefing_cache.stats()
@@ -2,10 +2,22 @@
 Chat API endpoints.
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from typing import AsyncIterator, Optional, Tuple
 from app.models.chat import ChatRequest, ChatResponse
 from app.agents.chat_agent import chat_agent
 from app.agents.action_agent import action_agent
+from app.services.agent_stream import EventCallback, stream_events
+from app.services.answer_cache import answer_cache
+from app.services.intent_router import intent_router
+from app.services.chat_sessions import chat_sessions
+from app.services.dataset_registry import Dataset, DatasetNotFoundError, dataset_registry
+from app.services.kb_cache import kb_cache
+from app.services.model_cascade import action_cascade, chat_cascade
+from app.services.speculative_retrieval import speculative_retriever
+from app.utils.sse import format_sse
 import logging
 import time
 
@@ -20,7 +32,94 @@ async def send_chat_message(request: ChatRequest):
 
     - ASK mode: Uses chat agent for Q&A
     - DO mode: Uses action agent for executing commands
+
+    With datasetId, the uploaded dataset replaces context['data']. With
+    sessionId (ASK mode), the conversation is kept server-side: send only the
+    new message; history seeds the session if it is new or has expired.
+    """
+    dataset = _resolve_dataset(request)
+    return await _respond(request, dataset)
+
+
+@router.post("/chat/stream")
+async def stream_chat_message(request: ChatRequest):
+    """
+    Stream a chat response (ASK or DO mode) as Server-Sent Events.
+
+    Takes the same request as POST /chat. Events:
+    - delta: {"text": "..."}, response text as the model generates it
+    - tool_start: {"toolUseId", "name", "input"} when the agent calls a tool
+    - tool_end: {"toolUseId", "name", "status"} when the tool returns
+    - citations: {"citations": [...]}, knowledge base sources (ASK mode)
+    - response: the complete ChatResponse, always last
+    """
+    dataset = _resolve_dataset(request)
+
+    async def events():
+        async for event, data in _chat_events(request, dataset):
+            yield format_sse(event, data)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/chat/ws")
+async def chat_websocket(websocket: WebSocket):
     """
+    Stream chat responses over a WebSocket.
+
+    Each text frame from the client is a ChatRequest; the server answers with
+    the same events as POST /chat/stream, sent as {"event": ..., "data": ...}
+    JSON frames and ending with the response event. Invalid requests get an
+    error event and the connection stays open for the next message.
+    """
+    await websocket.accept()
+    try:
+        while True:
+            payload = await websocket.receive_text()
+            try:
+                request = ChatRequest.model_validate_json(payload)
+                dataset = _resolve_dataset(request)
+            except ValidationError as e:
+                await websocket.send_json({"event": "error", "data": {
+                    "message": "Invalid chat request",
+                    "errors": e.errors(include_url=False, include_context=False),
+                }})
+                continue
+            except HTTPException as e:
+                await websocket.send_json({"event": "error", "data": {"message": e.detail}})
+                continue
+
+            async for event, data in _chat_events(request, dataset):
+                await websocket.send_json({"event": event, "data": data})
+    except WebSocketDisconnect:
+        logger.info("Chat WebSocket closed by client")
+
+
+def _resolve_dataset(request: ChatRequest) -> Optional[Dataset]:
+    """
+    Return the uploaded dataset named by the request, if any.
+
+    Raises:
+        HTTPException: 404 if datasetId is unknown or expired
+    """
+    if request.datasetId is None:
+        return None
+    try:
+        return dataset_registry.get(request.datasetId)
+    except DatasetNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Dataset {request.datasetId} not found; upload it again")
+
+
+async def _respond(
+    request: ChatRequest,
+    dataset: Optional[Dataset],
+    on_event: Optional[EventCallback] = None
+) -> ChatResponse:
+    """Run the request through the ASK or DO agent, passing on_event to it."""
     try:
         logger.info(f"Chat request - Mode: {request.mode}, Message: {request.message[:50]}...")
 
@@ -28,7 +127,9 @@ async def send_chat_message(request: ChatRequest):
 
         if request.mode == "DO":
             # Use action agent for DO mode
-            response_text = await action_agent.execute(request.message, request.context or {})
+            response_text = await action_agent.execute(
+                request.message, request.context or {}, dataset=dataset, on_event=on_event
+            )
             duration = time.time() - start_time
             logger.info(f"Chat response generated in {duration:.2f}s")
 
@@ -41,10 +142,14 @@ async def send_chat_message(request: ChatRequest):
             # Use chat agent for ASK mode
             # Convert Pydantic models to dicts for the agent
             history_dicts = [msg.model_dump() for msg in request.history]
+            session = chat_sessions.get_or_create(request.sessionId) if request.sessionId else None
             result = await chat_agent.chat(
                 message=request.message,
                 history=history_dicts,
-                context=request.context or {}
+                context=request.context or {},
+                dataset=dataset,
+                session=session,
+                on_event=on_event
             )
 
             duration = time.time() - start_time
@@ -53,7 +158,8 @@ async def send_chat_message(request: ChatRequest):
             return ChatResponse(
                 response=result["response"],
                 timestamp=int(time.time() * 1000),
-                citations=result.get("citations")
+                citations=result.get("citations"),
+                sessionId=request.sessionId
             )
 
     except Exception as e:
@@ -63,3 +169,62 @@ async def send_chat_message(request: ChatRequest):
             timestamp=int(time.time() * 1000),
             citations=None
         )
+
+
+async def _chat_events(request: ChatRequest, dataset: Optional[Dataset]) -> AsyncIterator[Tuple[str, dict]]:
+    """
+    Yield (event, data) pairs for a streamed chat response.
+
+    Answers that skip the model (fast path, answer cache) and DO mode agents
+    that produce no text deltas arrive as a single delta.
+    """
+    streamed = False
+    async for event in stream_events(lambda on_event: _respond(request, dataset, on_event)):
+        if event["event"] != "result":
+            streamed = streamed or event["event"] == "delta"
+            yield event["event"], event["data"]
+            continue
+
+        response: ChatResponse = event["data"]
+        if not streamed and response.response:
+            yield "delta", {"text": response.response}
+        if request.mode == "ASK":
+            yield "citations", {"citations": [c.model_dump() for c in response.citations or []]}
+        yield "response", response.model_dump()
+
+
+@router.delete("/chat/sessions/{session_id}", status_code=204)
+async def end_chat_session(session_id: str):
+    """End a server-side chat session (idle sessions also expire on their own)."""
+    chat_sessions.delete(session_id)
+    return Response(status_code=204)
+
+
+@router.get("/chat/kb-cache/stats")
+async def kb_cache_stats():
+    """Return knowledge base retrieve cache hit/miss counters."""
+    return kb_cache.stats()
+
+
+@router.get("/chat/answer-cache/stats")
+async def answer_cache_stats():
+    """Return ASK mode answer cache hit/miss counters."""
+    return answer_cache.stats()
+
+
+@router.get("/chat/router/stats")
+async def intent_router_stats():
+    """Return fast-path intent router counts and latencies."""
+    return intent_router.stats()
+
+
+@router.get("/chat/speculative-retrieval/stats")
+async def speculative_retrieval_stats():
+    """Return how often speculative knowledge base retrievals were used."""
+    return speculative_retriever.stats()
+
+
+@router.get("/chat/cascade/stats")
+async def model_cascade_stats():
+    """Return model cascade escalation rates and per-tier latency for ASK and DO mode."""
+    return {"chat": chat_cascade.stats(), "action": action_cascade.stats()}
@@ -0,0 +1,36 @@
+"""
+Dataset API endpoints.
+"""
+
+from fastapi import APIRouter, HTTPException
+from app.models.dataset import DatasetResponse, DatasetUploadRequest
+from app.services.briefing_scheduler import briefing_scheduler
+from app.services.dataset_registry import DatasetNotFoundError, dataset_registry
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.post("/datasets", response_model=DatasetResponse)
+async def upload_dataset(request: DatasetUploadRequest):
+    """
+    Upload a ticket set once and reference it by datasetId afterwards.
+
+    Chat and briefing requests that pass datasetId no longer need to carry
+    the tickets. Uploading identical content returns the same dataset;
+    re-uploading under an existing datasetId replaces its content.
+    """
+    dataset = dataset_registry.register(request.data, dataset_id=request.datasetId)
+    briefing_scheduler.register_source(dataset.dataset_id, dataset_registry.loader(dataset.dataset_id))
+    logger.info(f"Dataset {dataset.dataset_id} stored: {len(dataset.tickets)} tickets")
+    return DatasetResponse(**dataset.to_dict())
+
+
+@router.get("/datasets/{dataset_id}", response_model=DatasetResponse)
+async def get_dataset(dataset_id: str):
+    """Return metadata for a stored dataset (404 if unknown or evicted)."""
+    try:
+        return DatasetResponse(**dataset_registry.get(dataset_id).to_dict())
+    except DatasetNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Dataset {dataset_id} not found; upload it again")
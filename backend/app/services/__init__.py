@@ -1,7 +1,8 @@
 """
-Services for external integrations.
+Services for external integrations and local analysis.
 """
 
 from .bedrock_client import BedrockClient
+from .sla_analyzer import SLAAnalyzer
 
-__all__ = ["BedrockClient"]
+__all__ = ["BedrockClient", "SLAAnalyzer"]
@@ -0,0 +1,74 @@
+"""
+Bounded executor for blocking Strands agent invocations.
+
+Agent calls block on Bedrock for seconds at a time. Running them on a
+dedicated thread pool keeps the uvicorn event loop free to serve other
+requests, while the queue limit sheds load instead of piling up work.
+"""
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from app.config import settings
+
+
+class AgentQueueFullError(RuntimeError):
+    """Raised when more agent calls are pending than the executor allows."""
+
+
+class AgentExecutor:
+    """Runs blocking agent calls off the event loop with bounded concurrency."""
+
+    def __init__(self, max_workers: int = 16, max_queue: int = 64):
+        """
+        Args:
+            max_workers: Agent calls that may run at the same time
+            max_queue: Additional calls that may wait for a free worker
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="agent")
+        self._pending = 0
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run func(*args) on the agent thread pool and await the result.
+
+        Context variables are copied into the worker thread so request-scoped
+        state is visible to agent tools.
+
+        Raises:
+            AgentQueueFullError: If max_workers + max_queue calls are already pending
+        """
+        if self._pending >= self.max_workers + self.max_queue:
+            raise AgentQueueFullError(
+                f"Agent executor saturated ({self._pending} calls pending)"
+            )
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            context = contextvars.copy_context()
+            return await loop.run_in_executor(
+                self._executor, functools.partial(context.run, func, *args)
+            )
+        finally:
+            self._pending -= 1
+
+    def stats(self) -> dict:
+        """Return executor sizing and current load."""
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "pending": self._pending,
+        }
+
+
+# Singleton instance
+agent_executor = AgentExecutor(
+    max_workers=settings.agent_executor_max_workers,
+    max_queue=settings.agent_executor_max_queue,
+)
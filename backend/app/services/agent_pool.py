@@ -0,0 +1,159 @@
+"""
+Bounded pools of pre-built Strands agents.
+
+Constructing an Agent per request repeats tool-spec generation, Bedrock
+client setup and system-prompt handling. A pool keeps tool-equipped agents
+per mode and hands them out one request at a time; the conversation state
+is reset on checkin so nothing leaks between requests, while the model
+client (and its HTTP connections) is reused.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List
+
+from strands.agent.state import AgentState
+from strands.telemetry.metrics import EventLoopMetrics
+
+logger = logging.getLogger(__name__)
+
+
+class AgentPoolExhaustedError(RuntimeError):
+    """Raised when no agent becomes available within the checkout timeout."""
+
+
+def reset_agent(agent: Any) -> None:
+    """Clear an agent's conversation, state and per-run metrics."""
+    agent.messages = []
+    agent.state = AgentState()
+    agent.event_loop_metrics = EventLoopMetrics()
+
+
+class AgentPool:
+    """A bounded, thread-safe pool of agents for one mode."""
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        max_size: int = 8,
+        checkout_timeout_seconds: float = 30.0
+    ):
+        """
+        Args:
+            name: Mode name used in metrics ("chat", "action")
+            factory: Builds a new tool-equipped agent
+            max_size: Maximum number of agents (idle plus checked out)
+            checkout_timeout_seconds: How long checkout waits for a free agent
+        """
+        self.name = name
+        self.max_size = max_size
+        self.checkout_timeout_seconds = checkout_timeout_seconds
+        self._factory = factory
+        self._idle: List[Any] = []
+        self._size = 0
+        self._condition = threading.Condition()
+
+        self._created = 0
+        self._checkouts = 0
+        self._reuses = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._discarded = 0
+        self._wait_seconds = 0.0
+
+    def checkout(self) -> Any:
+        """
+        Take an agent from the pool, building one if the pool is not full.
+
+        Blocks (on the calling worker thread) while every agent is in use.
+
+        Raises:
+            AgentPoolExhaustedError: If no agent is free before the timeout
+        """
+        started = time.monotonic()
+        deadline = started + self.checkout_timeout_seconds
+        with self._condition:
+            waited = False
+            while not self._idle and self._size >= self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise AgentPoolExhaustedError(
+                        f"No {self.name} agent available after {self.checkout_timeout_seconds}s"
+                    )
+                waited = True
+                self._condition.wait(remaining)
+
+            self._checkouts += 1
+            if waited:
+                self._waits += 1
+                self._wait_seconds += time.monotonic() - started
+            if self._idle:
+                self._reuses += 1
+                # LIFO: the most recently used agent has the warmest connection
+                return self._idle.pop()
+            self._size += 1
+
+        try:
+            agent = self._factory()
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._created += 1
+        return agent
+
+    def checkin(self, agent: Any, discard: bool = False) -> None:
+        """
+        Return an agent to the pool with its conversation reset.
+
+        Args:
+            agent: Agent obtained from checkout()
+            discard: Drop the agent instead of returning it
+        """
+        if not discard:
+            try:
+                reset_agent(agent)
+            except Exception as e:
+                logger.debug(f"{self.name} agent reset failed, discarding: {e}")
+                discard = True
+
+        with self._condition:
+            if discard:
+                self._size -= 1
+                self._discarded += 1
+            else:
+                self._idle.append(agent)
+            self._condition.notify()
+
+    @contextmanager
+    def lease(self) -> Iterator[Any]:
+        """Check out an agent for the duration of a with block."""
+        agent = self.checkout()
+        try:
+            yield agent
+        finally:
+            # Reset also clears a half-finished tool loop left by a failed run
+            self.checkin(agent)
+
+    def stats(self) -> dict:
+        """Return pool sizing and usage counters."""
+        with self._condition:
+            return {
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "created": self._created,
+                "checkouts": self._checkouts,
+                "reuses": self._reuses,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "discarded": self._discarded,
+                "avg_wait_ms": round(1000 * self._wait_seconds / self._waits, 2) if self._waits else 0.0,
+            }
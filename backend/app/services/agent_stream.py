@@ -0,0 +1,172 @@
+"""
+Streaming of agent runs to clients.
+
+Agents run on the agent executor's worker threads. While a pooled agent is
+leased, its Strands callback handler (which receives every event of the
+Strands async stream) is replaced with an AgentEventRelay. The relay turns
+those events into client events and hands them to the event loop:
+- delta: {"text": "..."}, visible model text as it is generated
+- tool_start: {"toolUseId", "name", "input"}, when the model calls a tool
+- tool_end: {"toolUseId", "name", "status"}, when the tool has returned
+- escalated: {"reason", "model"}, when the model cascade retries on the
+  strong tier; deltas sent before it belong to the discarded attempt
+
+<thinking> and <confidence> blocks are dropped from deltas and <response>
+tags are removed, matching the cleanup applied to the final response text.
+"""
+
+import asyncio
+import contextlib
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, Optional
+
+EventCallback = Callable[[dict], None]
+
+# Model output between these tags is never shown to the user
+HIDDEN_TAGS = ("thinking", "confidence")
+# Tags removed from the text while their content is kept
+STRIPPED_TAGS = ("response",)
+# Longest text after "<" that is held back waiting for ">"
+MAX_TAG_LENGTH = 16
+
+
+class VisibleText:
+    """Filters streamed model text down to what the user should see."""
+
+    def __init__(self):
+        self._pending = ""
+        self._hidden: Optional[str] = None
+
+    def feed(self, text: str) -> str:
+        """Add a chunk of model text and return the part that can be shown now."""
+        self._pending += text
+        out = []
+        while self._pending:
+            if self._hidden is not None:
+                close = f"</{self._hidden}>"
+                end = self._pending.find(close)
+                if end < 0:
+                    # Keep what could be the start of the closing tag
+                    self._pending = self._pending[-(len(close) - 1):]
+                    break
+                self._pending = self._pending[end + len(close):]
+                self._hidden = None
+                continue
+
+            start = self._pending.find("<")
+            if start < 0:
+                out.append(self._pending)
+                self._pending = ""
+                break
+            out.append(self._pending[:start])
+            rest = self._pending[start:]
+            end = rest.find(">")
+            if end < 0 or end > MAX_TAG_LENGTH:
+                if end < 0 and len(rest) <= MAX_TAG_LENGTH:
+                    # Possibly a tag split across chunks
+                    self._pending = rest
+                    break
+                out.append("<")
+                self._pending = rest[1:]
+                continue
+
+            name = rest[1:end].strip("/ ").lower()
+            if name in HIDDEN_TAGS and not rest.startswith("</"):
+                self._hidden = name
+            elif name not in HIDDEN_TAGS and name not in STRIPPED_TAGS:
+                out.append(rest[:end + 1])
+            self._pending = rest[end + 1:]
+        return "".join(out)
+
+    def flush(self) -> str:
+        """Return text held back at the end of the stream."""
+        text = "" if self._hidden is not None else self._pending
+        self._pending = ""
+        return text
+
+
+class AgentEventRelay:
+    """Strands callback handler that forwards client events to on_event."""
+
+    def __init__(self, on_event: EventCallback):
+        self.on_event = on_event
+        self._text = VisibleText()
+        self._tool_names: Dict[str, str] = {}
+
+    def __call__(self, **event: Any) -> None:
+        if "data" in event:
+            self._delta(self._text.feed(event["data"]))
+            return
+
+        message = event.get("message")
+        if not isinstance(message, dict):
+            return
+        for block in message.get("content", []):
+            # The model's message lists the tool calls it makes; the next
+            # message carries their results
+            if "toolUse" in block:
+                self._delta(self._text.flush())
+                tool_use = block["toolUse"]
+                self._tool_names[tool_use["toolUseId"]] = tool_use["name"]
+                self.on_event({"event": "tool_start", "data": {
+                    "toolUseId": tool_use["toolUseId"],
+                    "name": tool_use["name"],
+                    "input": tool_use.get("input"),
+                }})
+            elif "toolResult" in block:
+                tool_result = block["toolResult"]
+                self.on_event({"event": "tool_end", "data": {
+                    "toolUseId": tool_result["toolUseId"],
+                    "name": self._tool_names.get(tool_result["toolUseId"]),
+                    "status": tool_result.get("status"),
+                }})
+
+    def close(self) -> None:
+        """Forward text still held back by the filter."""
+        self._delta(self._text.flush())
+
+    def _delta(self, text: str) -> None:
+        if text:
+            self.on_event({"event": "delta", "data": {"text": text}})
+
+
+@contextlib.contextmanager
+def forward_events(agent: Any, on_event: Optional[EventCallback]) -> Iterator[None]:
+    """Relay a leased agent's events to on_event for the duration of a with block."""
+    if on_event is None:
+        yield
+        return
+    previous = getattr(agent, "callback_handler", None)
+    relay = AgentEventRelay(on_event)
+    agent.callback_handler = relay
+    try:
+        yield
+        relay.close()
+    finally:
+        agent.callback_handler = previous
+
+
+async def stream_events(run: Callable[[EventCallback], Awaitable[Any]]) -> AsyncIterator[dict]:
+    """
+    Run run(on_event) and yield its events as they arrive.
+
+    on_event may be called from any thread. Ends with
+    {"event": "result", "data": <return value of run>}; exceptions from run
+    propagate after the events emitted before them.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def on_event(event: dict) -> None:
+        loop.call_soon_threadsafe(queue.put_nowait, event)
+
+    task = asyncio.ensure_future(run(on_event))
+    # Events are queued before the executor reports completion, so the
+    # sentinel always comes after them
+    task.add_done_callback(lambda _: loop.call_soon(queue.put_nowait, None))
+    while True:
+        event = await queue.get()
+        if event is None:
+            break
+        yield event
+    yield {"event": "result", "data": task.result()}
+
@@ -0,0 +1,176 @@
+"""
+Semantic answer cache for ASK mode.
+
+Operators keep asking the same questions about the same dataset ("which
+tickets are critical?"). Answers are stored per scope - dataset content
+hash, briefing, reference date and a digest of the last exchange - and
+looked up by similarity of the question's canonical form (filler words
+dropped, remaining words sorted; compared by character trigram Jaccard), so
+rephrasings hit without a Bedrock call. Ticket IDs, numbers, negations and
+question words must match exactly: "status of TKT-101" never answers
+"status of TKT-105". A new dataset version or briefing is a new scope, so
+stale answers are never served.
+"""
+
+import hashlib
+import logging
+import re
+from datetime import datetime
+from typing import FrozenSet, List, Optional
+
+from app.config import settings
+from app.services.chat_sessions import context_key
+from app.services.ticket_store import TICKET_ID_PATTERN
+from app.utils.cache import CacheStats, MemoryCache
+from app.utils.similarity import jaccard, normalize_text, shingles
+
+logger = logging.getLogger(__name__)
+
+# Words that flip a question's meaning without changing its shingles much
+NEGATIONS = {"not", "no", "never", "without", "except", "excluding", "non"}
+QUESTION_WORDS = {"why", "when", "who", "whom", "whose", "how", "where"}
+
+# Words that do not change what is being asked ("which"/"what" are
+# interchangeable here; why/when/who/how/where are kept)
+FILLER_WORDS = {
+    "a", "all", "an", "any", "are", "can", "could", "currently", "do", "does", "give",
+    "i", "is", "list", "me", "now", "of", "please", "right", "show", "tell", "the",
+    "there", "what", "which", "you",
+}
+
+_NUMBER = re.compile(r"\d+")
+_WORD = re.compile(r"[a-z0-9']+")
+
+# Exchanges of the conversation that make a follow-up question depend on it
+HISTORY_MESSAGES = 2
+
+
+def history_digest(history: List[dict]) -> str:
+    """Digest of the last exchange (empty for a first question)."""
+    recent = history[-HISTORY_MESSAGES:]
+    if not recent:
+        return ""
+    text = "|".join(f"{m.get('role')}:{m.get('content')}" for m in recent)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def canonical_question(question: str) -> str:
+    """Normalized question with filler words dropped and the rest sorted."""
+    words = _WORD.findall(normalize_text(question))
+    return " ".join(sorted(word for word in words if word not in FILLER_WORDS))
+
+
+def salient_tokens(question: str) -> FrozenSet[str]:
+    """Tokens that must match exactly: ticket IDs, numbers, negations and question words."""
+    ids = set(TICKET_ID_PATTERN.findall(question.upper()))
+    text = normalize_text(TICKET_ID_PATTERN.sub(" ", question.upper()).lower())
+    numbers = set(_NUMBER.findall(text))
+    words = {
+        word for word in _WORD.findall(text)
+        if word in NEGATIONS or word in QUESTION_WORDS or word.endswith("n't")
+    }
+    return frozenset(ids | numbers | words)
+
+
+class _Entry:
+    def __init__(self, question: str, answer: dict):
+        self.question = normalize_text(question)
+        self.shingles = shingles(canonical_question(question))
+        self.salient = salient_tokens(question)
+        self.answer = answer
+
+
+class AnswerCache:
+    """Stores ASK mode answers per scope and matches questions by similarity."""
+
+    def __init__(
+        self,
+        threshold: float = 0.85,
+        max_scopes: int = 256,
+        entries_per_scope: int = 64,
+        ttl_seconds: Optional[float] = 900,
+        enabled: bool = True
+    ):
+        """
+        Args:
+            threshold: Minimum trigram Jaccard similarity for a hit (0-1)
+            max_scopes: Scopes (dataset/briefing/history combinations) kept, LRU
+            entries_per_scope: Answers kept per scope, oldest dropped first
+            ttl_seconds: Lifetime of a scope's answers
+            enabled: Disable to always call the model
+        """
+        self.threshold = threshold
+        self.entries_per_scope = entries_per_scope
+        self.enabled = enabled
+        self._scopes = MemoryCache(max_entries=max_scopes, ttl_seconds=ttl_seconds)
+        # Question-level counters (the scope cache counts scope lookups)
+        self.stats_counters = CacheStats()
+        self.similar_hits = 0
+
+    @staticmethod
+    def scope(data_hash: str, briefing: Optional[dict], now: datetime, history: List[dict]) -> str:
+        """Key of everything besides the question that an answer depends on."""
+        return f"{context_key(data_hash, briefing, now)}:{history_digest(history)}"
+
+    def get(self, scope: str, question: str) -> Optional[dict]:
+        """Return the stored answer for the most similar question in scope, if close enough."""
+        if not self.enabled:
+            return None
+        entries: Optional[List[_Entry]] = self._scopes.get(scope)
+        if not entries:
+            self.stats_counters.misses += 1
+            return None
+
+        normalized = normalize_text(question)
+        salient = salient_tokens(question)
+        question_shingles = shingles(canonical_question(question))
+        best, best_score = None, 0.0
+        for entry in entries:
+            if entry.question == normalized:
+                self.stats_counters.hits += 1
+                return entry.answer
+            if entry.salient != salient:
+                continue
+            score = jaccard(question_shingles, entry.shingles)
+            if score > best_score:
+                best, best_score = entry, score
+
+        if best is not None and best_score >= self.threshold:
+            self.stats_counters.hits += 1
+            self.similar_hits += 1
+            logger.debug(f"Answer cache: similar question matched ({best_score:.2f})")
+            return best.answer
+        self.stats_counters.misses += 1
+        return None
+
+    def set(self, scope: str, question: str, answer: dict) -> None:
+        """Store an answer ({"response", "citations"}) for question in scope."""
+        if not self.enabled:
+            return
+        entries = [e for e in (self._scopes.get(scope) or []) if e.question != normalize_text(question)]
+        entries.append(_Entry(question, answer))
+        self._scopes.set(scope, entries[-self.entries_per_scope:])
+
+    def clear(self) -> None:
+        self._scopes.clear()
+
+    def stats(self) -> dict:
+        """Return scope count and lookup counters (hits include similar_hits)."""
+        return {
+            "enabled": self.enabled,
+            "scopes": len(self._scopes),
+            **self.stats_counters.to_dict(),
+            "similar_hits": self.similar_hits,
+            "evictions": self._scopes.stats.evictions,
+            "expirations": self._scopes.stats.expirations,
+        }
+
+
+# Singleton instance
+answer_cache = AnswerCache(
+    threshold=settings.answer_cache_similarity_threshold,
+    max_scopes=settings.answer_cache_max_scopes,
+    entries_per_scope=settings.answer_cache_entries_per_scope,
+    ttl_seconds=settings.answer_cache_ttl_seconds,
+    enabled=settings.answer_cache_enabled,
+)
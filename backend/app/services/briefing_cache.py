@@ -0,0 +1,74 @@
+"""
+Content-addressed cache for briefing results.
+
+Briefings are keyed by the canonical hash of the ticket set, the model ID,
+the prompt version and the reference date (SLA status changes at midnight),
+so reposting the same dataset returns the stored briefing without calling
+Bedrock.
+"""
+
+import hashlib
+from datetime import date, datetime, timezone
+from typing import List, Optional
+
+from app.config import settings
+from app.utils.cache import create_cache
+from app.utils.hashing import dataset_hash
+
+
+class BriefingCache:
+    """Stores briefing results by dataset content, model and prompt version."""
+
+    def __init__(self, backend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+
+    @staticmethod
+    def make_key(
+        data: List[dict],
+        model_id: str,
+        prompt_version: str,
+        reference_date: Optional[date] = None,
+        content_hash: Optional[str] = None
+    ) -> str:
+        """
+        Build the cache key for a dataset/model/prompt combination.
+
+        content_hash skips rehashing when dataset_hash(data) is already known
+        (e.g. for datasets held by the dataset registry).
+        """
+        reference_date = reference_date or datetime.now(timezone.utc).date()
+        parts = [content_hash or dataset_hash(data), model_id, prompt_version, reference_date.isoformat()]
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached briefing for key, if any."""
+        if not self.enabled:
+            return None
+        return self.backend.get(key)
+
+    def set(self, key: str, result: dict) -> None:
+        """Store a briefing result."""
+        if self.enabled:
+            self.backend.set(key, result)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current size."""
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            **self.backend.stats.to_dict(),
+        }
+
+
+# Singleton instance
+briefing_cache = BriefingCache(
+    create_cache(
+        settings.briefing_cache_backend,
+        max_entries=settings.briefing_cache_max_entries,
+        ttl_seconds=settings.briefing_cache_ttl_seconds,
+        path=settings.briefing_cache_path,
+    ),
+    enabled=settings.briefing_cache_enabled,
+)
@@ -0,0 +1,99 @@
+"""
+Incremental (delta) briefing support.
+
+Remembers the last ticket snapshot and its briefing items per dataset so a
+new request only re-derives items whose relatedTicketIds touch tickets that
+were added, removed or modified since the previous briefing. Items without
+related tickets describe the whole dataset and are re-derived on any change.
+Requests without a dataset ID are not tracked (there is nothing to tell one
+client's data from another's).
+"""
+
+import hashlib
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set
+
+from app.config import settings
+from app.models.briefing import BriefingItem
+from app.services.sla_analyzer import group_by_id
+from app.utils.cache import MemoryCache
+from app.utils.hashing import canonical_json
+
+DEFAULT_DATASET_ID = "default"
+
+
+def fingerprint_tickets(data: List[dict]) -> Dict[str, str]:
+    """Map each ticket ID to a hash of all its records (duplicates included)."""
+    fingerprints = {}
+    for ticket_id, records in group_by_id(data).items():
+        payload = "\n".join(sorted(canonical_json(r) for r in records))
+        fingerprints[ticket_id] = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return fingerprints
+
+
+def changed_ticket_ids(previous: Dict[str, str], current: Dict[str, str]) -> Set[str]:
+    """Return IDs that were added, removed or modified between two snapshots."""
+    return {
+        ticket_id for ticket_id in previous.keys() | current.keys()
+        if previous.get(ticket_id) != current.get(ticket_id)
+    }
+
+
+def touches(item: BriefingItem, ticket_ids: Set[str]) -> bool:
+    """Return True if the item relates to any of the given ticket IDs."""
+    return not ticket_ids.isdisjoint(item.relatedTicketIds)
+
+
+def unaffected(items: Iterable[BriefingItem], ticket_ids: Set[str]) -> List[BriefingItem]:
+    """
+    Keep the items that do not relate to any of the given ticket IDs.
+
+    Dataset-wide items (no related tickets) are only kept when nothing changed.
+    """
+    return [
+        item for item in items
+        if not touches(item, ticket_ids) and (item.relatedTicketIds or not ticket_ids)
+    ]
+
+
+class BriefingSnapshot:
+    """Ticket fingerprints and briefing output from one briefing run."""
+
+    def __init__(
+        self,
+        fingerprints: Dict[str, str],
+        reference_date: date,
+        findings: List[BriefingItem],
+        insights: List[BriefingItem],
+        summary: str
+    ):
+        self.fingerprints = fingerprints
+        self.reference_date = reference_date
+        self.findings = findings
+        self.insights = insights
+        self.summary = summary
+
+
+class BriefingSnapshotStore:
+    """Keeps the latest snapshot per dataset, evicting least recently used datasets."""
+
+    def __init__(self, max_datasets: int = 16):
+        self._snapshots = MemoryCache(max_entries=max_datasets)
+
+    def get(self, dataset_id: Optional[str]) -> Optional[BriefingSnapshot]:
+        """Return the dataset's last snapshot (always None without a dataset ID)."""
+        if dataset_id is None:
+            return None
+        return self._snapshots.get(dataset_id)
+
+    def put(self, dataset_id: Optional[str], snapshot: BriefingSnapshot) -> None:
+        """Store the dataset's snapshot (skipped without a dataset ID)."""
+        if dataset_id is not None:
+            self._snapshots.set(dataset_id, snapshot)
+
+    def clear(self) -> None:
+        self._snapshots.clear()
+
+
+# Singleton instance
+briefing_snapshots = BriefingSnapshotStore(max_datasets=settings.briefing_snapshot_max_datasets)
@@ -0,0 +1,75 @@
+"""
+Partitioning and merging for map-reduce briefings.
+
+Large datasets are sharded by a categorical field (customer or source) so
+each partial briefing fits in the model context. All records that share a
+ticket ID always land in the same shard, which keeps DATA_CONFLICT
+detection correct.
+"""
+
+from typing import Dict, Iterable, List
+
+from app.models.briefing import BriefingItem
+from app.services.sla_analyzer import SEVERITY_RANK, group_by_id, sort_items
+
+
+def partition_tickets(data: List[dict], key: str = "customer", max_shard_size: int = 1000) -> List[List[dict]]:
+    """
+    Split tickets into shards of at most max_shard_size records.
+
+    Each ticket ID group is assigned to the bucket of its first record's key
+    value. Small buckets are packed together; a bucket larger than the limit
+    is split on ticket ID boundaries, so a shard only exceeds the limit when
+    a single ID has more duplicates than the limit allows.
+
+    Args:
+        data: List of tickets
+        key: Ticket field to partition on ("customer" or "source")
+        max_shard_size: Target maximum number of records per shard
+
+    Returns:
+        List of shards (each a list of tickets)
+    """
+    buckets: Dict[str, List[List[dict]]] = {}
+    for records in group_by_id(data).values():
+        bucket = str(records[0].get(key, "Unknown"))
+        buckets.setdefault(bucket, []).append(records)
+
+    shards: List[List[dict]] = []
+    current: List[dict] = []
+    # Largest buckets first so related tickets stay together as much as possible
+    for groups in sorted(buckets.values(), key=lambda g: -sum(len(r) for r in g)):
+        for records in groups:
+            if current and len(current) + len(records) > max_shard_size:
+                shards.append(current)
+                current = []
+            current.extend(records)
+    if current:
+        shards.append(current)
+
+    return shards
+
+
+def merge_items(item_lists: Iterable[List[BriefingItem]]) -> List[BriefingItem]:
+    """
+    Merge partial briefing items, removing duplicates.
+
+    Items are duplicates when they share an ID, or the same type and set of
+    related tickets; the most severe copy wins.
+    """
+    merged: Dict[tuple, BriefingItem] = {}
+    seen_ids = set()
+    for items in item_lists:
+        for item in items:
+            signature = (item.type, tuple(sorted(item.relatedTicketIds)))
+            existing = merged.get(signature)
+            if existing is not None:
+                if SEVERITY_RANK[item.severity] > SEVERITY_RANK[existing.severity]:
+                    merged[signature] = item.model_copy(update={"id": existing.id})
+                continue
+            if item.id in seen_ids:
+                item = item.model_copy(update={"id": f"{item.id}-{len(seen_ids)}"})
+            seen_ids.add(item.id)
+            merged[signature] = item
+
+    return sort_items(list(merged.values()))
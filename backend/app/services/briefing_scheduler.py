@@ -0,0 +1,169 @@
+"""
+Night Watchman scheduler - precomputes briefings in the background.
+
+An asyncio task re-runs the briefing for every registered dataset on a
+fixed interval and stores the result with a version and timestamp, so
+GET /api/v1/briefing/latest never waits on Bedrock.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from app.agents.briefing_agent import briefing_agent
+from app.config import settings
+from app.services.briefing_cache import briefing_cache
+from app.services.briefing_delta import DEFAULT_DATASET_ID
+from app.services.dataset_registry import DatasetNotFoundError
+from app.utils.cache import MemoryCache
+from app.utils.hashing import dataset_hash
+
+
+class StoredBriefing:
+    """A precomputed briefing with version and timestamps."""
+
+    def __init__(self, dataset_id: str, version: int, data_hash: str, briefing: dict):
+        self.dataset_id = dataset_id
+        self.version = version
+        self.dataset_hash = data_hash
+        self.briefing = briefing
+        self.generated_at = datetime.now(timezone.utc)
+        self.checked_at = self.generated_at
+
+    def to_dict(self) -> dict:
+        return {
+            "datasetId": self.dataset_id,
+            "version": self.version,
+            "datasetHash": self.dataset_hash,
+            "generatedAt": self.generated_at.isoformat(),
+            "checkedAt": self.checked_at.isoformat(),
+            "summary": self.briefing["summary"],
+            "items": self.briefing["items"],
+        }
+
+
+class BriefingScheduler:
+    """Periodically precomputes briefings for registered datasets."""
+
+    def __init__(self, interval_seconds: float = 3600, max_datasets: int = 16):
+        self.interval_seconds = interval_seconds
+        self.max_datasets = max_datasets
+        self._sources: Dict[str, Callable[[], List[dict]]] = {}
+        # Latest briefing per dataset; inline POSTs add entries too, so it is bounded (LRU)
+        self._latest = MemoryCache(max_entries=max_datasets)
+        self._task: Optional[asyncio.Task] = None
+
+    def register_source(self, dataset_id: str, loader: Callable[[], List[dict]]) -> None:
+        """
+        Register a dataset to watch.
+
+        Args:
+            dataset_id: Dataset identifier (also used for delta briefings)
+            loader: Returns the current ticket list when called
+        """
+        self._sources.pop(dataset_id, None)
+        self._sources[dataset_id] = loader
+        while len(self._sources) > self.max_datasets:
+            oldest = next(iter(self._sources))
+            del self._sources[oldest]
+            self._latest.delete(oldest)
+
+    def record(self, dataset_id: Optional[str], data: List[dict], briefing: dict) -> Optional[StoredBriefing]:
+        """
+        Store a briefing as the latest for its dataset.
+
+        The version only increments when the briefing content changes. A
+        briefing without a dataset ID is stored as the default dataset's only
+        when its data is what the watched default source currently returns.
+
+        Returns:
+            The stored briefing, or None if it was not stored
+        """
+        content = {"summary": briefing["summary"], "items": briefing["items"]}
+        data_hash = dataset_hash(data)
+        if dataset_id is None:
+            if not self._is_default_source_data(data_hash):
+                return None
+            dataset_id = DEFAULT_DATASET_ID
+
+        current = self._latest.get(dataset_id)
+        if current is not None and current.briefing == content and current.dataset_hash == data_hash:
+            current.checked_at = datetime.now(timezone.utc)
+            return current
+
+        stored = StoredBriefing(dataset_id, (current.version if current else 0) + 1, data_hash, content)
+        self._latest.set(dataset_id, stored)
+        return stored
+
+    def _is_default_source_data(self, data_hash: str) -> bool:
+        loader = self._sources.get(DEFAULT_DATASET_ID)
+        if loader is None:
+            return False
+        try:
+            return dataset_hash(loader()) == data_hash
+        except Exception:
+            return False
+
+    def latest(self, dataset_id: Optional[str] = None) -> Optional[StoredBriefing]:
+        """Return the latest stored briefing for a dataset."""
+        return self._latest.get(dataset_id or DEFAULT_DATASET_ID)
+
+    async def run_once(self) -> int:
+        """
+        Precompute briefings for every registered dataset.
+
+        Returns:
+            Number of datasets briefed successfully
+        """
+        completed = 0
+        for dataset_id, loader in list(self._sources.items()):
+            try:
+                data = loader()
+                result = await briefing_agent.analyze_data(data, dataset_id=dataset_id)
+            except DatasetNotFoundError:
+                print(f"Night Watchman: dataset '{dataset_id}' was evicted, no longer watching it")
+                self._sources.pop(dataset_id, None)
+                continue
+            except Exception as e:
+                print(f"Night Watchman: briefing for '{dataset_id}' failed: {e}")
+                continue
+
+            if result.get("fallback"):
+                print(f"Night Watchman: model unavailable for '{dataset_id}', keeping previous briefing")
+                continue
+
+            self.record(dataset_id, data, result)
+            briefing_cache.set(
+                briefing_cache.make_key(data, briefing_agent.model, briefing_agent.prompt_version),
+                result
+            )
+            completed += 1
+
+        return completed
+
+    async def _run_forever(self) -> None:
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        """Start the background loop on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        """Cancel the background loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Singleton instance
+briefing_scheduler = BriefingScheduler(
+    interval_seconds=settings.briefing_schedule_interval_seconds,
+    max_datasets=settings.briefing_snapshot_max_datasets,
+)
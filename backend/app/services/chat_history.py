@@ -0,0 +1,184 @@
+"""
+Token-budgeted conversation history for ASK mode.
+
+The last few turns are kept verbatim; older turns are folded into a running
+summary that is updated incrementally (only newly rolled-off messages are
+processed) and cached by a chained digest of the summarized prefix, so a
+client resending a long history does not pay to re-summarize it each turn.
+
+The summary is extractive - each rolled-off message becomes one short line
+and ticket IDs are tracked separately - so compaction never costs a model call.
+"""
+
+import hashlib
+import re
+from typing import List, Optional, Tuple
+
+from app.config import settings
+from app.services.ticket_store import TICKET_ID_PATTERN
+from app.utils.cache import MemoryCache
+from app.utils.prompt_format import estimate_tokens
+
+# Most recent ticket IDs listed in the summary
+MAX_SUMMARY_TICKET_IDS = 30
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+def format_history(history: List[dict]) -> str:
+    """Flatten ChatMessage-shaped dicts into prompt text."""
+    return "\n".join(
+        f"{'User' if msg['role'] == 'user' else 'Agent'}: {msg['content']}"
+        for msg in history
+    )
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 3].rstrip() + "..."
+
+
+def _summary_line(message: dict) -> str:
+    content = message.get("content", "")
+    if message.get("role") == "user":
+        return f"User asked: {_clip(content, 160)}"
+    first_sentence = _SENTENCE_END.split(content.strip(), maxsplit=1)[0]
+    return f"Agent: {_clip(first_sentence, 200)}"
+
+
+class RunningSummary:
+    """Extractive summary of the messages rolled out of the verbatim window."""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.ticket_ids: List[str] = []
+        self.folded = 0    # messages folded in so far
+        self.omitted = 0   # summary lines dropped to stay within budget
+
+    def folded_with(self, messages: List[dict], max_tokens: int) -> "RunningSummary":
+        """Return a copy with messages folded in, trimmed to max_tokens."""
+        summary = RunningSummary()
+        summary.lines = list(self.lines)
+        summary.ticket_ids = list(self.ticket_ids)
+        summary.folded = self.folded + len(messages)
+        summary.omitted = self.omitted
+
+        for message in messages:
+            summary.lines.append(_summary_line(message))
+            for ticket_id in TICKET_ID_PATTERN.findall(message.get("content", "")):
+                if ticket_id in summary.ticket_ids:
+                    summary.ticket_ids.remove(ticket_id)
+                summary.ticket_ids.append(ticket_id)
+        summary.ticket_ids = summary.ticket_ids[-MAX_SUMMARY_TICKET_IDS:]
+
+        while len(summary.lines) > 1 and estimate_tokens(summary.render()) > max_tokens:
+            summary.lines.pop(0)
+            summary.omitted += 1
+        return summary
+
+    def render(self) -> str:
+        if not self.folded:
+            return ""
+        parts = [f"EARLIER CONVERSATION (summary of {self.folded} messages):"]
+        if self.ticket_ids:
+            parts.append(f"Tickets discussed: {', '.join(self.ticket_ids)}")
+        if self.omitted:
+            parts.append(f"({self.omitted} older points omitted)")
+        parts.extend(f"- {line}" for line in self.lines)
+        return "\n".join(parts)
+
+
+class HistoryManager:
+    """Keeps conversation history within a token budget."""
+
+    def __init__(self, token_budget: int = 1500, keep_turns: int = 4, cache_entries: int = 256):
+        """
+        Args:
+            token_budget: Approximate token limit for the rendered history
+            keep_turns: User turns (with their replies) kept verbatim
+            cache_entries: Running summaries cached for stateless clients
+        """
+        self.token_budget = token_budget
+        self.keep_turns = keep_turns
+        self.summary_budget = token_budget // 3
+        self._summaries = MemoryCache(max_entries=cache_entries)
+
+    def split(self, history: List[dict]) -> Tuple[List[dict], List[dict]]:
+        """Split history into (older, recent) with keep_turns user turns in recent."""
+        user_turns = 0
+        for index in range(len(history) - 1, -1, -1):
+            if history[index].get("role") == "user":
+                user_turns += 1
+                if user_turns == self.keep_turns:
+                    return history[:index], history[index:]
+        return [], list(history)
+
+    def compact(self, summary: RunningSummary, history: List[dict]) -> Tuple[RunningSummary, List[dict]]:
+        """Fold everything older than the verbatim window into summary."""
+        older, recent = self.split(history)
+        if older:
+            summary = summary.folded_with(older, self.summary_budget)
+        return summary, recent
+
+    def render(self, history: List[dict]) -> str:
+        """
+        Render client-side history for a prompt within the token budget.
+
+        Short histories are rendered verbatim exactly as before.
+        """
+        older, recent = self.split(history)
+        if not older and estimate_tokens(format_history(recent)) <= self.token_budget:
+            return format_history(recent)
+        return self.render_compacted(self._summarize(older), recent)
+
+    def render_compacted(self, summary: RunningSummary, recent: List[dict]) -> str:
+        """Render a summary plus verbatim recent turns, trimming the turns to fit."""
+        summary_text = summary.render()
+        remaining = self.token_budget - estimate_tokens(summary_text)
+        recent = self._fit(recent, remaining)
+        if not summary_text:
+            return format_history(recent)
+        return f"{summary_text}\nRECENT TURNS:\n{format_history(recent)}"
+
+    def stats(self) -> dict:
+        return {"cached_summaries": len(self._summaries), **self._summaries.stats.to_dict()}
+
+    def _summarize(self, older: List[dict]) -> RunningSummary:
+        """Summary of older, reusing the longest cached prefix summary."""
+        digests = [""]
+        for message in older:
+            digest = hashlib.sha256(
+                f"{digests[-1]}|{message.get('role')}|{message.get('content')}".encode("utf-8")
+            ).hexdigest()
+            digests.append(digest)
+
+        summary, start = RunningSummary(), 0
+        for length in range(len(older), 0, -1):
+            cached: Optional[RunningSummary] = self._summaries.get(digests[length])
+            if cached is not None:
+                summary, start = cached, length
+                break
+
+        if start < len(older):
+            summary = summary.folded_with(older[start:], self.summary_budget)
+            self._summaries.set(digests[-1], summary)
+        return summary
+
+    @staticmethod
+    def _fit(recent: List[dict], budget: int) -> List[dict]:
+        """Drop the oldest verbatim messages, then clip the remaining ones, until they fit."""
+        recent = list(recent)
+        while len(recent) > 1 and estimate_tokens(format_history(recent)) > budget:
+            recent.pop(0)
+        if recent and estimate_tokens(format_history(recent)) > budget:
+            # A single oversized message: keep its start (roughly 4 characters per token)
+            last = recent[-1]
+            recent[-1] = {**last, "content": _clip(last.get("content", ""), max(200, budget * 4))}
+        return recent
+
+
+# Singleton instance
+history_manager = HistoryManager(
+    token_budget=settings.chat_history_token_budget,
+    keep_turns=settings.chat_history_keep_turns,
+)
@@ -0,0 +1,104 @@
+"""
+Relevance-based context selection for ASK mode prompts.
+
+Instead of serializing the whole dataset into every chat prompt, each message
+gets a compact dataset overview plus the top-K tickets and briefing items
+most relevant to the question (ticket-ID mentions, BM25 over title, customer
+and assignee, status/priority/SLA keywords). Prompt size therefore stays flat
+as the dataset grows; the model reaches any other ticket through the
+query_tickets and find_tickets tools. The ticket index is built once per
+dataset version (see TicketStore.search).
+"""
+
+import json
+from typing import List, Optional, Set
+
+from app.services.sla_analyzer import SEVERITY_RANK
+from app.services.ticket_store import TicketStore
+from app.utils.bm25 import tokenize
+from app.utils.prompt_format import serialize_briefing, serialize_records
+
+# An item about a selected ticket outranks one that only shares words
+RELATED_TICKET_SCORE = 10
+
+
+def select_briefing_items(
+    items: List[dict],
+    message: str,
+    ticket_ids: Set[str],
+    limit: int
+) -> List[dict]:
+    """
+    Pick the briefing items most relevant to a message.
+
+    Args:
+        items: BriefingItem-shaped dicts
+        message: The user's question
+        ticket_ids: IDs of tickets matched by the question
+        limit: Maximum number of items returned
+
+    Returns:
+        Up to limit items; the most severe ones when nothing matches
+    """
+    words = set(tokenize(message))
+
+    def relevance(item: dict) -> int:
+        related = len(ticket_ids.intersection(item.get("relatedTicketIds") or []))
+        text = f"{item.get('title', '')} {item.get('description', '')}"
+        return RELATED_TICKET_SCORE * related + len(words.intersection(tokenize(text)))
+
+    ranked = sorted(
+        enumerate(items),
+        key=lambda pair: (-relevance(pair[1]), -SEVERITY_RANK.get(pair[1].get("severity"), -1), pair[0]),
+    )
+    return [item for _, item in ranked[:limit]]
+
+
+class ChatContext:
+    """Tickets and briefing items selected for one message."""
+
+    def __init__(
+        self,
+        store: TicketStore,
+        briefing: Optional[dict],
+        message: str,
+        top_k: int,
+        briefing_items: int
+    ):
+        """
+        Args:
+            store: Indexed, time-annotated dataset
+            briefing: BriefingResponse-shaped dict, if any
+            message: The user's question
+            top_k: Maximum tickets included
+            briefing_items: Maximum briefing items included
+        """
+        self.store = store
+        self.tickets, self.matched = store.search(message, top_k)
+        self.briefing = None
+        if briefing:
+            ticket_ids = {str(t.get("id")) for t in self.tickets} if self.matched else set()
+            self.briefing = {
+                "summary": briefing.get("summary", ""),
+                "items": select_briefing_items(briefing.get("items") or [], message, ticket_ids, briefing_items),
+            }
+
+    def tickets_block(self) -> str:
+        """Selected tickets with a header telling the model how to reach the rest."""
+        label = "RELEVANT TICKETS" if self.matched else "MOST URGENT OPEN TICKETS"
+        return (
+            f"{label} ({len(self.tickets)} of {len(self.store)}; "
+            f"use query_tickets or find_tickets for any others):\n"
+            f"{serialize_records(self.tickets)}"
+        )
+
+    def render(self) -> str:
+        """Dataset overview, selected tickets and selected briefing items."""
+        overview = json.dumps(self.store.profile(), separators=(",", ":"))
+        return f"""DATASET OVERVIEW ({len(self.store)} tickets; value counts):
+{overview}
+
+{self.tickets_block()}
+
+LATEST BRIEFING:
+{serialize_briefing(self.briefing)}"""
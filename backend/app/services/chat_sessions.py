@@ -0,0 +1,83 @@
+"""
+Server-side chat sessions for ASK mode.
+
+A session keeps the Strands agent's message list between turns, so each
+request only appends the new user message instead of resending and
+re-flattening the whole history. The dataset and briefing context is sent
+once at the start of the session (and again only when it changes), which
+keeps the conversation prefix stable for provider-side prompt caching.
+Idle sessions expire after CHAT_SESSION_TTL_SECONDS. Once a session's
+conversation outgrows CHAT_HISTORY_TOKEN_BUDGET, its message list is compacted
+into a summary plus recent turns (see chat_history).
+"""
+
+import asyncio
+import hashlib
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from app.config import settings
+from app.services.chat_history import RunningSummary
+from app.utils.cache import MemoryCache
+from app.utils.hashing import canonical_json
+
+
+class ChatSession:
+    """Conversation state for one session_id."""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.messages: List[dict] = []
+        self.context_key: Optional[str] = None  # Identifies the context last sent to the model
+        self.turns = 0
+        # Plain-text log for history compaction: older turns folded into the
+        # summary, recent turns verbatim; conversation_tokens counts what the
+        # agent's message list holds beyond the context block
+        self.summary = RunningSummary()
+        self.recent: List[dict] = []
+        self.conversation_tokens = 0
+        self.created_at = datetime.now(timezone.utc)
+        # Turns of one session run one at a time; different sessions run concurrently
+        self.lock = asyncio.Lock()
+
+
+def context_key(data_hash: str, briefing: Optional[dict], now: datetime) -> str:
+    """Key for the context block: dataset content, briefing and reference date."""
+    parts = [data_hash, canonical_json(briefing or {}), now.date().isoformat()]
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+class ChatSessionStore:
+    """Holds chat sessions with idle expiry and LRU eviction."""
+
+    def __init__(self, max_sessions: int = 256, ttl_seconds: float = 1800):
+        self._sessions = MemoryCache(max_entries=max_sessions, ttl_seconds=ttl_seconds)
+
+    def get_or_create(self, session_id: str) -> ChatSession:
+        """Return the live session for session_id, starting a new one if it expired."""
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = ChatSession(session_id)
+            self._sessions.set(session_id, session)
+        return session
+
+    def save(self, session: ChatSession) -> None:
+        """Store the session after a turn, restarting its idle timer."""
+        self._sessions.set(session.session_id, session)
+
+    def delete(self, session_id: str) -> None:
+        """End a session (no-op if it does not exist)."""
+        self._sessions.delete(session_id)
+
+    def clear(self) -> None:
+        self._sessions.clear()
+
+    def stats(self) -> dict:
+        return {"sessions": len(self._sessions), **self._sessions.stats.to_dict()}
+
+
+# Singleton instance
+chat_sessions = ChatSessionStore(
+    max_sessions=settings.chat_session_max_sessions,
+    ttl_seconds=settings.chat_session_ttl_seconds,
+)
@@ -0,0 +1,91 @@
+"""
+Per-request knowledge base citations.
+
+The retrieve tool records the structured results it returns (Bedrock
+RetrievalResult dicts) into the collector of the request being served,
+while the tool runs. The chat agent reads the collected citations after the
+agent loop, de-duplicated by document and chunk and sorted by score,
+instead of recovering them from the trace text afterwards.
+"""
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# RetrievalResultLocation type -> field holding the document identifier
+# (the same Document ID the retrieve tool shows the model)
+DOCUMENT_ID_FIELDS = {
+    "customDocumentLocation": "id",
+    "s3Location": "uri",
+    "webLocation": "url",
+    "confluenceLocation": "url",
+    "salesforceLocation": "url",
+    "sharePointLocation": "url",
+    "kendraDocumentLocation": "uri",
+    "sqlLocation": "query",
+}
+
+
+def citation_from_result(result: dict) -> dict:
+    """Build a Citation dict from one retrieval result."""
+    location = result.get("location") or {}
+    document_id = "Unknown"
+    for location_type, field in DOCUMENT_ID_FIELDS.items():
+        if location_type in location:
+            document_id = location[location_type].get(field, "Unknown")
+            break
+    metadata = result.get("metadata") or {}
+    return {
+        "score": float(result.get("score", 0.0)),
+        "documentId": document_id,
+        "sourceUri": metadata.get("x-amz-bedrock-kb-source-uri"),
+        "chunkId": metadata.get("x-amz-bedrock-kb-chunk-id"),
+        "dataSourceId": metadata.get("x-amz-bedrock-kb-data-source-id"),
+    }
+
+
+class CitationCollector:
+    """Citations of one request, keeping the best score per document chunk."""
+
+    def __init__(self):
+        self._citations: Dict[Tuple[str, Optional[str]], dict] = {}
+        self._lock = threading.Lock()
+
+    def add(self, results: List[dict]) -> None:
+        """Record the results of one retrieve call."""
+        with self._lock:
+            for result in results:
+                citation = citation_from_result(result)
+                key = (citation["documentId"], citation["chunkId"])
+                if key not in self._citations or citation["score"] > self._citations[key]["score"]:
+                    self._citations[key] = citation
+
+    def citations(self) -> Optional[List[dict]]:
+        """Collected citations, highest score first (None if there are none)."""
+        with self._lock:
+            if not self._citations:
+                return None
+            return sorted(self._citations.values(), key=lambda c: -c["score"])
+
+
+# Collector of the request being served; copied into the threads running its agent
+_collector: ContextVar[Optional[CitationCollector]] = ContextVar("citation_collector", default=None)
+
+
+@contextmanager
+def collect_citations() -> Iterator[CitationCollector]:
+    """Collect citations recorded by retrieve calls inside the with block."""
+    collector = CitationCollector()
+    token = _collector.set(collector)
+    try:
+        yield collector
+    finally:
+        _collector.reset(token)
+
+
+def record_citations(results: List[dict]) -> None:
+    """Add retrieval results to the current request's collector, if any."""
+    collector = _collector.get()
+    if collector is not None:
+        collector.add(results)
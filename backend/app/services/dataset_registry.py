@@ -0,0 +1,118 @@
+"""
+Server-side dataset registry.
+
+Clients upload a ticket set once (POST /api/v1/datasets) and reference it
+by datasetId in chat and briefing requests, instead of re-sending megabytes
+of tickets with every message. The registry keeps the parsed tickets, their
+content hash and a per-day indexed, time-annotated view, with LRU eviction.
+"""
+
+from datetime import date, datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from app.config import settings
+from app.services.ticket_store import TicketStore
+from app.services.time_context import annotate_tickets
+from app.utils.cache import MemoryCache
+from app.utils.hashing import dataset_hash
+from app.utils.prompt_format import serialize_records
+
+
+class DatasetNotFoundError(KeyError):
+    """Raised when a datasetId is unknown or has been evicted."""
+
+
+class Dataset:
+    """An uploaded ticket set with its content hash and cached derived views."""
+
+    def __init__(self, dataset_id: str, tickets: List[dict], content_hash: str):
+        self.dataset_id = dataset_id
+        self.tickets = tickets
+        self.content_hash = content_hash
+        self.created_at = datetime.now(timezone.utc)
+        self._view_date: Optional[date] = None
+        self._store: Optional[TicketStore] = None
+        self._serialized: Dict[str, str] = {}
+
+    def store(self, now: Optional[datetime] = None) -> TicketStore:
+        """Indexed tickets annotated with SLA timing for now's date (rebuilt once per day)."""
+        now = now or datetime.now(timezone.utc)
+        if self._store is None or self._view_date != now.date():
+            self._store = TicketStore(annotate_tickets(self.tickets, now))
+            self._serialized = {}
+            self._view_date = now.date()
+        return self._store
+
+    def serialized(self, now: Optional[datetime] = None) -> str:
+        """Prompt encoding of the annotated tickets, cached per day and format."""
+        store = self.store(now)
+        fmt = settings.prompt_data_format
+        if fmt not in self._serialized:
+            self._serialized[fmt] = serialize_records(store.tickets, fmt)
+        return self._serialized[fmt]
+
+    def to_dict(self) -> dict:
+        return {
+            "datasetId": self.dataset_id,
+            "contentHash": self.content_hash,
+            "ticketCount": len(self.tickets),
+            "createdAt": self.created_at.isoformat(),
+        }
+
+
+class DatasetRegistry:
+    """Keeps uploaded datasets in memory with LRU eviction."""
+
+    def __init__(self, max_datasets: int = 32):
+        self._datasets = MemoryCache(max_entries=max_datasets)
+
+    def register(self, tickets: List[dict], dataset_id: Optional[str] = None) -> Dataset:
+        """
+        Store a dataset.
+
+        Args:
+            tickets: Ticket records
+            dataset_id: Client-chosen ID; re-uploading under the same ID replaces
+                the content. Defaults to an ID derived from the content hash, so
+                identical uploads share one entry.
+
+        Returns:
+            The stored dataset (the existing one if the content is unchanged)
+        """
+        content_hash = dataset_hash(tickets)
+        dataset_id = dataset_id or f"ds-{content_hash[:16]}"
+
+        existing = self._datasets.get(dataset_id)
+        if existing is not None and existing.content_hash == content_hash:
+            return existing
+
+        dataset = Dataset(dataset_id, tickets, content_hash)
+        self._datasets.set(dataset_id, dataset)
+        return dataset
+
+    def get(self, dataset_id: str) -> Dataset:
+        """
+        Return a stored dataset.
+
+        Raises:
+            DatasetNotFoundError: If the ID is unknown or was evicted
+        """
+        dataset = self._datasets.get(dataset_id)
+        if dataset is None:
+            raise DatasetNotFoundError(dataset_id)
+        return dataset
+
+    def loader(self, dataset_id: str) -> Callable[[], List[dict]]:
+        """Return a callable that fetches the dataset's current tickets (for the scheduler)."""
+        return lambda: self.get(dataset_id).tickets
+
+    def clear(self) -> None:
+        self._datasets.clear()
+
+    def stats(self) -> dict:
+        """Return registry size and lookup counters."""
+        return {"datasets": len(self._datasets), **self._datasets.stats.to_dict()}
+
+
+# Singleton instance
+dataset_registry = DatasetRegistry(max_datasets=settings.dataset_registry_max_datasets)
@@ -0,0 +1,299 @@
+"""
+Rules-based fast path for simple ASK mode questions.
+
+Lookups ("show TKT-101"), counts ("how many critical tickets are open?")
+and overdue lists ("which tickets are overdue?") are answered straight from
+the indexed ticket view with a templated response, skipping the agent loop
+and its tool calls. Intent is scored with compiled patterns plus a small
+keyword-weight model; the question falls through to the agent when no
+intent wins clearly or when it contains any word the router does not
+understand ("what's wrong with TKT-101 and how do I fix it?").
+"""
+
+import logging
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.services.ticket_store import (
+    OPEN_KEYWORDS,
+    OVERDUE_KEYWORDS,
+    PRIORITY_KEYWORDS,
+    STATUS_KEYWORDS,
+    TICKET_ID_PATTERN,
+    TicketStore,
+)
+
+logger = logging.getLogger(__name__)
+
+INTENTS = ("lookup", "count", "overdue")
+
+# Keyword weights per intent; pattern matches add PATTERN_WEIGHT
+INTENT_KEYWORDS: Dict[str, Dict[str, float]] = {
+    "lookup": {"details": 1.5, "detail": 1.5, "status": 1.0, "info": 1.0,
+               "information": 1.0, "lookup": 1.5, "look": 1.0, "about": 0.5},
+    "count": {"many": 2.0, "count": 2.0, "number": 1.5, "total": 1.0},
+    "overdue": {"overdue": 2.0, "breached": 2.0, "breach": 1.5, "breaches": 1.5,
+                "late": 1.0, "sla": 0.5},
+}
+INTENT_PATTERNS: Dict[str, re.Pattern] = {
+    "count": re.compile(r"^\s*(how many|count|number of|total number of)\b"),
+    "lookup": TICKET_ID_PATTERN,
+}
+PATTERN_WEIGHT = 3.0
+
+# Winning intent must beat the runner-up by at least this much
+MIN_MARGIN = 1.0
+
+# Words that carry no intent or filter
+FILLER_WORDS = {
+    "a", "all", "an", "and", "any", "are", "assigned", "at", "currently", "do", "does", "for",
+    "from", "get", "give", "have", "how", "i", "in", "is", "it", "list", "me", "now", "of", "on",
+    "our", "please", "priority", "right", "s", "show", "tell", "that", "the", "there", "ticket",
+    "tickets", "to", "up", "us", "we", "what", "which", "with",
+}
+
+_WORD = re.compile(r"[a-z]+")
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+_PAST_DUE = re.compile(r"\bpast\s+(its\s+|their\s+)?due(\s+date)?\b")
+
+# How filter words are echoed in answers; priority labels go last ("open high-priority tickets")
+FILTER_LABELS = {"progress": "in progress", "active": "open", "unresolved": "open"}
+FILTER_LABELS.update({word: "overdue" for word in OVERDUE_KEYWORDS})
+PRIORITY_LABELS = {word: f"{word}-priority" for word in PRIORITY_KEYWORDS}
+PRIORITY_LABELS["urgent"] = "critical- or high-priority"
+FILTER_LABELS.update(PRIORITY_LABELS)
+
+
+class RoutedAnswer:
+    """A question answered without the agent."""
+
+    def __init__(self, intent: str, response: str):
+        self.intent = intent
+        self.response = response
+
+
+def _conflict_note(records: int, tickets: int) -> str:
+    """Note for a count where some tickets have several records."""
+    if records <= tickets:
+        return ""
+    # Duplicate IDs are conflicting copies of one ticket from different systems
+    return f" ({records} records; some tickets have conflicting records across systems)"
+
+
+def _plural(count: int, word: str) -> str:
+    return f"{count} {word}{'' if count == 1 else 's'}"
+
+
+def _timing(ticket: dict) -> str:
+    """SLA timing from the time_context annotation, e.g. '3 days overdue'."""
+    if ticket.get("daysOverdue"):
+        return f"{_plural(ticket['daysOverdue'], 'day')} overdue"
+    if ticket.get("daysUntilDue") == 0:
+        return "due today"
+    if ticket.get("daysUntilDue") is not None:
+        return f"due in {_plural(ticket['daysUntilDue'], 'day')}"
+    return ""
+
+
+def _ticket_line(ticket: dict) -> str:
+    details = [str(ticket.get("status")), f"{ticket.get('priority')} priority"]
+    if _timing(ticket):
+        details.append(_timing(ticket))
+    details.append(f"assignee {ticket.get('assignee') or 'none'}")
+    return (
+        f"- {ticket.get('id')}: {ticket.get('title')} ({ticket.get('customer')}) - "
+        f"{', '.join(details)}"
+    )
+
+
+class IntentRouter:
+    """Answers lookup, count and overdue questions from a TicketStore."""
+
+    def __init__(self, list_limit: int = 10, enabled: bool = True):
+        """
+        Args:
+            list_limit: Maximum tickets listed in an answer
+            enabled: Disable to send every question to the agent
+        """
+        self.list_limit = list_limit
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._routed: Dict[str, int] = {intent: 0 for intent in INTENTS}
+        self._fallthrough = 0
+        self._routed_seconds = 0.0
+        self._agent_calls = 0
+        self._agent_seconds = 0.0
+
+    def route(self, message: str, store: TicketStore) -> Optional[RoutedAnswer]:
+        """
+        Answer message directly if it is a simple lookup, count or overdue question.
+
+        Returns:
+            The templated answer, or None to fall through to the agent
+        """
+        if not self.enabled:
+            return None
+        start = time.perf_counter()
+        answer = self._answer(message, store)
+        with self._lock:
+            if answer is None:
+                self._fallthrough += 1
+            else:
+                self._routed[answer.intent] += 1
+                self._routed_seconds += time.perf_counter() - start
+        if answer is not None:
+            logger.debug(f"Intent router answered a question as {answer.intent}")
+        return answer
+
+    def record_agent_latency(self, seconds: float) -> None:
+        """Record how long a fallthrough question took in the agent, for comparison."""
+        with self._lock:
+            self._agent_calls += 1
+            self._agent_seconds += seconds
+
+    def classify(self, message: str, store: TicketStore) -> Tuple[Optional[str], dict]:
+        """
+        Score intents and extract filters.
+
+        Returns:
+            (intent or None when unsure, {"ids", "filters", "labels"})
+        """
+        ids = list(dict.fromkeys(TICKET_ID_PATTERN.findall(message.upper())))
+        text = f" {_NON_WORD.sub(' ', TICKET_ID_PATTERN.sub(' ', message.upper()).lower())} "
+        text = _PAST_DUE.sub("overdue", text)
+
+        # Known customer names become filters (longest first: "acme corp" before "acme")
+        customer = None
+        for name in sorted(store.values("customer"), key=len, reverse=True):
+            words = _NON_WORD.sub(" ", name).strip()
+            if words and f" {words} " in text:
+                customer = name
+                text = text.replace(f" {words} ", " ")
+                break
+
+        words = _WORD.findall(text)
+        known = FILLER_WORDS | OPEN_KEYWORDS | OVERDUE_KEYWORDS | set(STATUS_KEYWORDS) | set(PRIORITY_KEYWORDS)
+        known |= {word for keywords in INTENT_KEYWORDS.values() for word in keywords}
+        if any(word not in known for word in words):
+            return None, {}
+
+        scores = {intent: sum(INTENT_KEYWORDS[intent].get(word, 0.0) for word in words) for intent in INTENTS}
+        for intent, pattern in INTENT_PATTERNS.items():
+            if pattern.search(message.upper() if intent == "lookup" else message.lower()):
+                scores[intent] += PATTERN_WEIGHT
+        ranked = sorted(scores.items(), key=lambda pair: -pair[1])
+        (best, top), (_, runner_up) = ranked[0], ranked[1]
+        if top == 0 or top - runner_up < MIN_MARGIN or (best == "lookup") != bool(ids):
+            return None, {}
+
+        filters = {}
+        word_set = set(words)
+        statuses = sorted({s for w in word_set & set(STATUS_KEYWORDS) for s in STATUS_KEYWORDS[w]})
+        if statuses:
+            filters["status"] = statuses
+        priorities = sorted({p for w in word_set & set(PRIORITY_KEYWORDS) for p in PRIORITY_KEYWORDS[w]})
+        if priorities:
+            filters["priority"] = priorities
+        if word_set & OPEN_KEYWORDS:
+            filters["open"] = True
+        if word_set & OVERDUE_KEYWORDS:
+            filters["overdue"] = True
+        if customer:
+            filters["customer"] = customer
+
+        filter_words = OPEN_KEYWORDS | OVERDUE_KEYWORDS | set(STATUS_KEYWORDS) | set(PRIORITY_KEYWORDS)
+        labels = [FILTER_LABELS.get(word, word) for word in words if word in filter_words]
+        if best == "overdue":
+            labels.insert(0, "overdue")
+        # "overdue" implies open
+        labels = [label for label in dict.fromkeys(labels) if not (label == "open" and "overdue" in labels)]
+        labels.sort(key=lambda label: label in PRIORITY_LABELS.values())
+        return best, {"ids": ids, "filters": filters, "labels": labels}
+
+    def stats(self) -> dict:
+        """Routed/fallthrough counts and average latency of each path."""
+        with self._lock:
+            routed = sum(self._routed.values())
+            total = routed + self._fallthrough
+            return {
+                "enabled": self.enabled,
+                "routed": routed,
+                "routed_by_intent": dict(self._routed),
+                "fallthrough": self._fallthrough,
+                "routed_ratio": round(routed / total, 4) if total else 0.0,
+                "avg_routed_ms": round(1000 * self._routed_seconds / routed, 3) if routed else 0.0,
+                "avg_agent_ms": round(1000 * self._agent_seconds / self._agent_calls, 1) if self._agent_calls else 0.0,
+            }
+
+    def _answer(self, message: str, store: TicketStore) -> Optional[RoutedAnswer]:
+        intent, parsed = self.classify(message, store)
+        if intent == "lookup":
+            return RoutedAnswer(intent, self._lookup(parsed["ids"], store))
+        if intent == "count":
+            return RoutedAnswer(intent, self._count(parsed["filters"], parsed["labels"], store))
+        if intent == "overdue":
+            return RoutedAnswer(intent, self._overdue(parsed["filters"], parsed["labels"], store))
+        return None
+
+    @staticmethod
+    def _lookup(ids: List[str], store: TicketStore) -> str:
+        sections = []
+        for ticket_id in ids:
+            records = store.get([ticket_id])
+            if not records:
+                sections.append(f"{ticket_id} was not found in the current dataset.")
+            elif len(records) == 1:
+                sections.append(_ticket_line(records[0])[2:])
+            else:
+                lines = [f"{ticket_id} has {len(records)} conflicting records:"]
+                lines.extend(f"{_ticket_line(r)} [source {r.get('source')}]" for r in records)
+                sections.append("\n".join(lines))
+        return "\n\n".join(sections)
+
+    def _count(self, filters: dict, labels: List[str], store: TicketStore) -> str:
+        result = store.find(filters, limit=len(store))
+        records = result["total"]
+        total = len({t.get("id") for t in result["tickets"]})
+        noun = "".join(f"{label} " for label in labels) + f"ticket{'' if total == 1 else 's'}"
+        suffix = self._customer_suffix(filters, store)
+        if total == 0:
+            return f"There are no {noun}{suffix}."
+        answer = f"There {'is' if total == 1 else 'are'} {total} {noun}{suffix}{_conflict_note(records, total)}"
+        return f"{answer}."
+
+    def _overdue(self, filters: dict, labels: List[str], store: TicketStore) -> str:
+        filters = {**filters, "overdue": True}
+        result = store.find(filters, sort="dueDate", limit=len(store))
+        records = result["total"]
+        # One line per ticket: its most overdue record
+        unique: dict = {}
+        for ticket in result["tickets"]:
+            unique.setdefault(ticket.get("id"), ticket)
+        total, tickets = len(unique), list(unique.values())[:self.list_limit]
+        noun = "".join(f"{label} " for label in labels) + f"ticket{'' if total == 1 else 's'}"
+        suffix = self._customer_suffix(filters, store)
+        if total == 0:
+            return f"There are no {noun}{suffix}."
+        lines = [f"{total} {noun}{suffix}{_conflict_note(records, total)}, most overdue first:"]
+        lines.extend(_ticket_line(t) for t in tickets)
+        if total > len(tickets):
+            lines.append(f"...and {total - len(tickets)} more.")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _customer_suffix(filters: dict, store: TicketStore) -> str:
+        """' for <Customer>' in the dataset's spelling, if a customer was named."""
+        if not filters.get("customer"):
+            return ""
+        match = store.find({"customer": filters["customer"]}, limit=1)["tickets"]
+        return f" for {match[0]['customer'] if match else filters['customer']}"
+
+
+# Singleton instance
+intent_router = IntentRouter(
+    list_limit=settings.intent_router_list_limit,
+    enabled=settings.intent_router_enabled,
+)
@@ -0,0 +1,212 @@
+"""
+Cache for Bedrock Knowledge Base retrieve results.
+
+Operators ask the same procedure questions all day, so retrieve results are
+cached by the normalized query, knowledge base, score threshold and result
+count. Entries hold the structured retrieval results: a hit is formatted
+into the same tool output as the original call and records the same
+citations. Misses go to the backend selected by KNOWLEDGE_BASE_BACKEND (see
+local_kb).
+"""
+
+import functools
+import hashlib
+import logging
+import os
+from typing import Any, List, Optional
+
+import boto3
+from botocore.config import Config
+from strands.tools import PythonAgentTool
+from strands_tools import retrieve as retrieve_module
+
+from app.config import settings
+from app.services.citations import record_citations
+from app.services.local_kb import local_kb
+from app.services.speculative_retrieval import claim_speculative_results
+from app.utils.cache import create_cache
+from app.utils.hashing import canonical_json
+from app.utils.similarity import normalize_text
+
+logger = logging.getLogger(__name__)
+
+KNOWLEDGE_BASE_BACKENDS = ("bedrock", "local", "tiered")
+
+# Bumped when the shape of cached entries changes, so old entries never hit
+ENTRY_FORMAT = 2
+
+
+def _min_score(tool_input: dict) -> float:
+    return float(tool_input.get("score", os.getenv("MIN_SCORE", "0.4")))
+
+
+@functools.lru_cache(maxsize=None)
+def _agent_runtime_client(region: str, profile_name: Optional[str] = None):
+    """
+    Shared bedrock-agent-runtime client per region and AWS profile (boto3
+    clients are thread-safe). No profile means the default credential chain.
+
+    Configured like the retrieve tool's own client, with a connection pool
+    large enough for concurrent requests sharing it.
+    """
+    session = boto3.Session(profile_name=profile_name) if profile_name else boto3
+    return session.client(
+        "bedrock-agent-runtime",
+        region_name=region,
+        config=Config(user_agent_extra="strands-agents-retrieve", max_pool_connections=50),
+    )
+
+
+def search_bedrock(tool_input: dict) -> List[dict]:
+    """
+    Query the Bedrock Knowledge Base with the retrieve tool's parameters.
+
+    Returns:
+        RetrievalResult dicts scoring at least the minimum score
+
+    Raises:
+        Exception: If retrieveFilter is malformed (the retrieve tool's own validation)
+    """
+    retrieval_config = {"vectorSearchConfiguration": {"numberOfResults": tool_input.get("numberOfResults", 10)}}
+    if tool_input.get("retrieveFilter") and retrieve_module._validate_filter(tool_input["retrieveFilter"]):
+        retrieval_config["vectorSearchConfiguration"]["filter"] = tool_input["retrieveFilter"]
+    client = _agent_runtime_client(
+        tool_input.get("region", os.getenv("AWS_REGION", "us-west-2")), tool_input.get("profile_name")
+    )
+    response = client.retrieve(
+        retrievalQuery={"text": tool_input["text"]},
+        knowledgeBaseId=tool_input.get("knowledgeBaseId", os.getenv("KNOWLEDGE_BASE_ID")),
+        retrievalConfiguration=retrieval_config,
+    )
+    return retrieve_module.filter_results_by_score(response.get("retrievalResults", []), _min_score(tool_input))
+
+
+def fetch(tool_input: dict) -> List[dict]:
+    """
+    Run a retrieve query against the configured knowledge base backend.
+
+    Returns:
+        RetrievalResult dicts scoring at least the minimum score
+
+    Raises:
+        ValueError: If KNOWLEDGE_BASE_BACKEND is not one of KNOWLEDGE_BASE_BACKENDS
+    """
+    backend = settings.knowledge_base_backend
+    if backend == "bedrock":
+        return search_bedrock(tool_input)
+    if backend not in ("local", "tiered"):
+        raise ValueError(f"Unknown knowledge base backend: {backend}; use {list(KNOWLEDGE_BASE_BACKENDS)}")
+    results = local_kb.search(tool_input["text"], tool_input.get("numberOfResults", 10), _min_score(tool_input))
+    if not results and backend == "tiered":
+        return search_bedrock(tool_input)
+    return results
+
+
+def format_output(results: List[dict], tool_input: dict) -> str:
+    """Tool output for the model, in the strands_tools retrieve format."""
+    enable_metadata = tool_input.get(
+        "enableMetadata",
+        os.getenv("RETRIEVE_ENABLE_METADATA_DEFAULT", "false").lower() == "true"
+    )
+    formatted = retrieve_module.format_results_for_display(results, enable_metadata)
+    return f"Retrieved {len(results)} results with score >= {tool_input.get('score', _min_score(tool_input))}:\n{formatted}"
+
+
+class RetrieveCache:
+    """Stores retrieval results by query and retrieval settings."""
+
+    def __init__(self, backend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+
+    @staticmethod
+    def make_key(tool_input: dict) -> str:
+        """
+        Build the cache key for a retrieve call.
+
+        Parameters the model leaves out are resolved with the same defaults
+        (environment variables) the retrieve tool uses, so explicit and
+        implicit defaults share an entry. enableMetadata only changes how
+        results are displayed, so it is not part of the key.
+        """
+        parts = {
+            "format": ENTRY_FORMAT,
+            "backend": settings.knowledge_base_backend,
+            "query": normalize_text(tool_input.get("text", "")),
+            "knowledgeBaseId": tool_input.get("knowledgeBaseId", os.getenv("KNOWLEDGE_BASE_ID")),
+            "region": tool_input.get("region", os.getenv("AWS_REGION", "us-west-2")),
+            "profileName": tool_input.get("profile_name"),
+            "minScore": _min_score(tool_input),
+            "numberOfResults": tool_input.get("numberOfResults", 10),
+            "retrieveFilter": tool_input.get("retrieveFilter"),
+        }
+        return hashlib.sha256(canonical_json(parts).encode("utf-8")).hexdigest()
+
+    def retrieve(self, tool: dict, **kwargs: Any) -> dict:
+        """
+        Drop-in replacement for the strands_tools retrieve function.
+
+        A matching speculative retrieval of the current request (see
+        speculative_retrieval) answers the call when there is one. Records
+        the results as citations of the current request. Only
+        successful results are cached; errors are returned uncached so a
+        transient Bedrock failure is retried on the next question.
+        """
+        tool_input = tool["input"]
+        try:
+            results = claim_speculative_results(tool_input)
+            if results is None:
+                results = self.results(tool_input)
+        except Exception as e:
+            return {
+                "toolUseId": tool["toolUseId"],
+                "status": "error",
+                "content": [{"text": f"Error during retrieval: {str(e)}"}],
+            }
+        record_citations(results)
+        return {
+            "toolUseId": tool["toolUseId"],
+            "status": "success",
+            "content": [{"text": format_output(results, tool_input)}],
+        }
+
+    def results(self, tool_input: dict) -> List[dict]:
+        """Retrieval results for tool_input, from cache when possible."""
+        if not self.enabled:
+            return fetch(tool_input)
+
+        key = self.make_key(tool_input)
+        results = self.backend.get(key)
+        if results is not None:
+            logger.debug("KB cache hit")
+            return results
+
+        results = fetch(tool_input)
+        self.backend.set(key, results)
+        return results
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current size."""
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            **self.backend.stats.to_dict(),
+        }
+
+
+def cached_retrieve_tool(cache: RetrieveCache) -> PythonAgentTool:
+    """The retrieve tool (same name and spec) answering from cache when possible."""
+    return PythonAgentTool("retrieve", retrieve_module.TOOL_SPEC, cache.retrieve)
+
+
+# Singleton instance
+kb_cache = RetrieveCache(
+    create_cache(
+        settings.kb_cache_backend,
+        max_entries=settings.kb_cache_max_entries,
+        ttl_seconds=settings.kb_cache_ttl_seconds,
+        path=settings.kb_cache_path,
+    ),
+    enabled=settings.kb_cache_enabled,
+)
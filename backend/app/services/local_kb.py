@@ -0,0 +1,214 @@
+"""
+Local offline knowledge base.
+
+Indexes a directory of markdown/text documents into heading-aware chunks
+with a BM25 index persisted on disk. Search results have the shape of
+Bedrock Knowledge Base retrieval results, so the retrieve tool output and
+citations look the same for both. KNOWLEDGE_BASE_BACKEND selects it:
+- bedrock: Bedrock Knowledge Base only (default)
+- local: this index only (development and load tests without network)
+- tiered: this index first, Bedrock when it has nothing above MIN_SCORE
+"""
+
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.utils.bm25 import BM25Index
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_SUFFIXES = (".md", ".markdown", ".txt")
+DATA_SOURCE_ID = "local"
+INDEX_VERSION = 1
+
+# BM25 scores are unbounded; score / (score + SCORE_MIDPOINT) maps them to
+# 0-1 like Bedrock relevance scores (a score of SCORE_MIDPOINT becomes 0.5)
+SCORE_MIDPOINT = 2.0
+
+
+def chunk_document(text: str, max_chars: int) -> List[Dict[str, str]]:
+    """
+    Split a document into chunks of at most about max_chars.
+
+    Chunks never span a markdown heading; long sections are split at
+    paragraph breaks and each chunk starts with its section heading.
+    """
+    sections: List[tuple] = []
+    heading, lines = "", []
+    for line in text.splitlines():
+        if line.startswith("#"):
+            if any(text_line.strip() for text_line in lines):
+                sections.append((heading, "\n".join(lines)))
+            heading, lines = line.lstrip("#").strip(), []
+        else:
+            lines.append(line)
+    if any(text_line.strip() for text_line in lines):
+        sections.append((heading, "\n".join(lines)))
+
+    chunks = []
+    for heading, body in sections:
+        current = ""
+        for paragraph in (p.strip() for p in body.split("\n\n")):
+            if not paragraph:
+                continue
+            if current and len(current) + len(paragraph) + 2 > max_chars:
+                chunks.append({"heading": heading, "text": current})
+                current = ""
+            current = f"{current}\n\n{paragraph}" if current else paragraph
+        if current:
+            chunks.append({"heading": heading, "text": current})
+
+    for chunk in chunks:
+        if chunk["heading"]:
+            chunk["text"] = f"{chunk['heading']}\n{chunk['text']}"
+    return chunks
+
+
+class LocalKnowledgeBase:
+    """BM25 index over a document directory, rebuilt only when the files change."""
+
+    def __init__(
+        self,
+        docs_dir: str,
+        index_path: Optional[str] = None,
+        chunk_chars: int = 1200,
+        rescan_seconds: float = 5.0
+    ):
+        """
+        Args:
+            docs_dir: Directory scanned recursively for DOCUMENT_SUFFIXES files
+            index_path: JSON file the index is saved to and loaded from (None keeps it in memory)
+            chunk_chars: Approximate maximum chunk size in characters
+            rescan_seconds: Minimum interval between checks of the directory for changes
+        """
+        self.docs_dir = Path(docs_dir)
+        self.index_path = Path(index_path) if index_path else None
+        self.chunk_chars = chunk_chars
+        self.rescan_seconds = rescan_seconds
+        self._chunks: List[dict] = []
+        self._index: Optional[BM25Index] = None
+        self._fingerprint: Optional[Dict[str, list]] = None
+        self._scanned_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def search(self, query: str, limit: int = 10, min_score: float = 0.0) -> List[Dict[str, Any]]:
+        """
+        Return the best chunks as Bedrock RetrievalResult-shaped dicts.
+
+        Args:
+            query: Search text
+            limit: Maximum number of results
+            min_score: Minimum normalized score (0-1)
+        """
+        self._ensure_index()
+        results = []
+        for chunk_id, raw in self._index.search(query, limit):
+            score = raw / (raw + SCORE_MIDPOINT)
+            if score < min_score:
+                break
+            chunk = self._chunks[chunk_id]
+            results.append({
+                "content": {"text": chunk["text"], "type": "TEXT"},
+                "location": {"type": "CUSTOM", "customDocumentLocation": {"id": chunk["id"]}},
+                "metadata": {
+                    "x-amz-bedrock-kb-source-uri": chunk["sourceUri"],
+                    "x-amz-bedrock-kb-chunk-id": chunk["id"],
+                    "x-amz-bedrock-kb-data-source-id": DATA_SOURCE_ID,
+                },
+                "score": score,
+            })
+        return results
+
+    def stats(self) -> dict:
+        self._ensure_index()
+        return {
+            "docs_dir": str(self.docs_dir),
+            "documents": len(self._fingerprint or {}),
+            "chunks": len(self._chunks),
+        }
+
+    def _ensure_index(self) -> None:
+        """Load or build the index if the document directory changed since it was built."""
+        now = time.monotonic()
+        if self._index is not None and now - self._scanned_at < self.rescan_seconds:
+            return
+        fingerprint = self._scan()
+        self._scanned_at = now
+        if self._index is not None and fingerprint == self._fingerprint:
+            return
+        with self._lock:
+            if self._index is not None and fingerprint == self._fingerprint:
+                return
+            if not self._load(fingerprint):
+                self._build(fingerprint)
+                self._save()
+
+    def _scan(self) -> Dict[str, list]:
+        """Relative path -> [mtime_ns, size] for every indexable file."""
+        if not self.docs_dir.is_dir():
+            return {}
+        return {
+            path.relative_to(self.docs_dir).as_posix(): [path.stat().st_mtime_ns, path.stat().st_size]
+            for path in sorted(self.docs_dir.rglob("*"))
+            if path.is_file() and path.suffix.lower() in DOCUMENT_SUFFIXES
+        }
+
+    def _build(self, fingerprint: Dict[str, list]) -> None:
+        chunks = []
+        for relative in fingerprint:
+            path = self.docs_dir / relative
+            text = path.read_text(encoding="utf-8", errors="replace")
+            for number, chunk in enumerate(chunk_document(text, self.chunk_chars)):
+                chunks.append({
+                    "id": f"{relative}#{number}",
+                    "sourceUri": path.resolve().as_uri(),
+                    "text": chunk["text"],
+                })
+        self._chunks = chunks
+        self._index = BM25Index(chunk["text"] for chunk in chunks)
+        self._fingerprint = fingerprint
+        logger.debug(f"Local KB indexed {len(fingerprint)} documents into {len(chunks)} chunks")
+
+    def _load(self, fingerprint: Dict[str, list]) -> bool:
+        """Use the saved index if it was built from the same files."""
+        if self.index_path is None or not self.index_path.exists():
+            return False
+        try:
+            saved = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        if (
+            saved.get("version") != INDEX_VERSION
+            or saved.get("chunkChars") != self.chunk_chars
+            or saved.get("fingerprint") != fingerprint
+        ):
+            return False
+        self._chunks = saved["chunks"]
+        self._index = BM25Index.from_dict(saved["index"])
+        self._fingerprint = fingerprint
+        return True
+
+    def _save(self) -> None:
+        if self.index_path is None:
+            return
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.index_path.write_text(json.dumps({
+            "version": INDEX_VERSION,
+            "chunkChars": self.chunk_chars,
+            "fingerprint": self._fingerprint,
+            "chunks": self._chunks,
+            "index": self._index.to_dict(),
+        }), encoding="utf-8")
+
+
+# Singleton instance
+local_kb = LocalKnowledgeBase(
+    settings.local_kb_docs_dir,
+    index_path=settings.local_kb_index_path,
+    chunk_chars=settings.local_kb_chunk_chars,
+)
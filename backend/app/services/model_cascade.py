@@ -0,0 +1,226 @@
+"""
+Model cascade: answer with the fast model, escalate to the strong one when needed.
+
+Each mode (chat, action) has a fast tier (Nova Lite) and a strong tier
+(Nova Pro). Requests run on the fast tier and are retried on the strong
+tier only on explicit triggers:
+- long_question: long or multi-entity questions start on the strong tier
+- parse_failure: empty output, an unclosed <response> tag or a truncated
+  (max_tokens) response
+- low_confidence: the model marked its answer <confidence>low</confidence>
+- tool_loop: the fast tier used up its turn limit without finishing
+
+A fast attempt whose tools had side effects (DO mode actions) is never
+repeated, so its result is kept even when a trigger fires. Such attempts are
+not turn-capped either: a cap could stop them halfway through their actions.
+"""
+
+import logging
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.config import settings
+from app.services.agent_stream import EventCallback
+from app.services.ticket_store import TICKET_ID_PATTERN
+from app.utils.prompt_format import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+TIERS = ("fast", "strong")
+TRIGGERS = ("long_question", "parse_failure", "low_confidence", "tool_loop")
+
+_CONFIDENCE = re.compile(r"\s*<confidence>\s*(\w+)\s*</confidence>\s*", re.IGNORECASE)
+LOW_CONFIDENCE = {"low"}
+
+# Stop reasons of a fast attempt that ran out of budget
+TRUNCATED_STOP_REASONS = {"max_tokens", "limit_output_tokens"}
+EXHAUSTED_STOP_REASONS = {"limit_turns", "limit_total_tokens"}
+
+
+def strip_confidence(text: str) -> Tuple[str, Optional[str]]:
+    """Remove the <confidence> tag from a reply and return (text, confidence or None)."""
+    match = _CONFIDENCE.search(text)
+    if match is None:
+        return text, None
+    return _CONFIDENCE.sub(" ", text).strip(), match.group(1).lower()
+
+
+def _used_tools(result: Any) -> bool:
+    metrics = getattr(result, "metrics", None)
+    return bool(getattr(metrics, "tool_metrics", None))
+
+
+class ModelCascade:
+    """Chooses the model tier for a request and records escalations and latency per tier."""
+
+    def __init__(
+        self,
+        mode: str,
+        fast_model: str,
+        strong_model: str,
+        default_tier: str = "fast",
+        enabled: bool = True,
+        max_turns: int = 6,
+        long_question_tokens: int = 150,
+        multi_entity_count: int = 3,
+        retry_after_tools: bool = True
+    ):
+        """
+        Args:
+            mode: Mode name used in logs and metrics ("chat", "action")
+            fast_model: Model ID of the fast tier
+            strong_model: Model ID of the strong tier
+            default_tier: Tier used for every request while the cascade is disabled
+            enabled: Disable to always use default_tier
+            max_turns: Agent loop turns the fast tier gets before escalating
+                (not applied when retry_after_tools is False)
+            long_question_tokens: Questions at least this long start on the strong tier
+            multi_entity_count: Questions naming at least this many tickets start on the strong tier
+            retry_after_tools: Whether a fast attempt that called tools may be repeated
+                (False when tools have side effects)
+        """
+        self.mode = mode
+        self.models = {"fast": fast_model, "strong": strong_model}
+        self.default_tier = default_tier
+        self.enabled = enabled
+        self.max_turns = max_turns
+        self.long_question_tokens = long_question_tokens
+        self.multi_entity_count = multi_entity_count
+        self.retry_after_tools = retry_after_tools
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._escalations: Dict[str, int] = {trigger: 0 for trigger in TRIGGERS}
+        self._calls: Dict[str, int] = {tier: 0 for tier in TIERS}
+        self._seconds: Dict[str, float] = {tier: 0.0 for tier in TIERS}
+
+    def start_tier(self, message: str) -> Tuple[str, Optional[str]]:
+        """Return (tier, trigger) for a new request; trigger is set when it starts escalated."""
+        if not self.enabled:
+            return self.default_tier, None
+        entities = set(TICKET_ID_PATTERN.findall(message.upper()))
+        if estimate_tokens(message) >= self.long_question_tokens or len(entities) >= self.multi_entity_count:
+            return "strong", "long_question"
+        return "fast", None
+
+    def limits(self, tier: str) -> Optional[dict]:
+        """
+        Strands invocation limits for a tier.
+
+        Only the fast tier is capped, and only when its attempts can be
+        repeated; an attempt with side effects always runs to completion.
+        """
+        if self.enabled and tier == "fast" and self.retry_after_tools:
+            return {"turns": self.max_turns}
+        return None
+
+    @staticmethod
+    def escalation_trigger(result: Any) -> Optional[str]:
+        """The trigger a fast attempt's result fires, if any."""
+        stop_reason = getattr(result, "stop_reason", None)
+        if stop_reason in EXHAUSTED_STOP_REASONS:
+            return "tool_loop"
+        text = str(result)
+        if stop_reason in TRUNCATED_STOP_REASONS or not text.strip():
+            return "parse_failure"
+        if "<response>" in text and "</response>" not in text:
+            return "parse_failure"
+        if strip_confidence(text)[1] in LOW_CONFIDENCE:
+            return "low_confidence"
+        return None
+
+    def run(
+        self,
+        message: str,
+        invoke: Callable[[str, Optional[dict]], Tuple[Any, Any]],
+        on_event: Optional[EventCallback] = None
+    ) -> Tuple[Any, Any]:
+        """
+        Run a request on the fast tier, escalating to the strong tier on a trigger.
+
+        Blocking; call it on the thread running the agent.
+
+        Args:
+            message: The user's question or command
+            invoke: Runs the request on a tier with the given limits and
+                returns (agent result, extra); called once per attempt
+            on_event: Receives {"event": "escalated", ...} before a retry, so
+                streamed text of the fast attempt can be discarded
+
+        Returns:
+            What invoke returned for the attempt that is used
+        """
+        tier, trigger = self.start_tier(message)
+        outcome = self._attempt(tier, invoke)
+        if tier == "fast" and self.enabled:
+            trigger = self.escalation_trigger(outcome[0])
+            if trigger is not None and not self.retry_after_tools and _used_tools(outcome[0]):
+                logger.debug(f"{self.mode} cascade: {trigger} after actions ran; keeping the fast answer")
+                trigger = None
+            if trigger is not None:
+                logger.debug(f"{self.mode} cascade: escalating to {self.models['strong']} ({trigger})")
+                if on_event is not None:
+                    on_event({"event": "escalated", "data": {"reason": trigger, "model": self.models["strong"]}})
+                outcome = self._attempt("strong", invoke)
+
+        with self._lock:
+            self._requests += 1
+            if trigger is not None:
+                self._escalations[trigger] += 1
+        return outcome
+
+    def _attempt(self, tier: str, invoke: Callable[[str, Optional[dict]], Tuple[Any, Any]]) -> Tuple[Any, Any]:
+        started = time.perf_counter()
+        try:
+            return invoke(tier, self.limits(tier))
+        finally:
+            with self._lock:
+                self._calls[tier] += 1
+                self._seconds[tier] += time.perf_counter() - started
+
+    def stats(self) -> dict:
+        """Escalation rate by trigger and call count and average latency per tier."""
+        with self._lock:
+            escalated = sum(self._escalations.values())
+            return {
+                "enabled": self.enabled,
+                "models": dict(self.models),
+                "requests": self._requests,
+                "escalations": escalated,
+                "escalations_by_trigger": dict(self._escalations),
+                "escalation_rate": round(escalated / self._requests, 4) if self._requests else 0.0,
+                "tiers": {
+                    tier: {
+                        "calls": self._calls[tier],
+                        "avg_latency_ms": round(1000 * self._seconds[tier] / self._calls[tier], 1)
+                        if self._calls[tier] else 0.0,
+                    }
+                    for tier in TIERS
+                },
+            }
+
+
+# Singleton instances (ASK: the chat model is the fast tier; DO: the action
+# model is the strong tier and actions are never repeated)
+chat_cascade = ModelCascade(
+    "chat",
+    fast_model=settings.bedrock_model_chat,
+    strong_model=settings.chat_cascade_strong_model,
+    default_tier="fast",
+    enabled=settings.chat_cascade_enabled,
+    max_turns=settings.chat_cascade_max_turns,
+    long_question_tokens=settings.cascade_long_question_tokens,
+    multi_entity_count=settings.cascade_multi_entity_count,
+    retry_after_tools=True,
+)
+action_cascade = ModelCascade(
+    "action",
+    fast_model=settings.action_cascade_fast_model,
+    strong_model=settings.bedrock_model_action,
+    default_tier="strong",
+    enabled=settings.action_cascade_enabled,
+    long_question_tokens=settings.cascade_long_question_tokens,
+    multi_entity_count=settings.cascade_multi_entity_count,
+    retry_after_tools=False,
+)
@@ -0,0 +1,237 @@
+"""
+Deterministic SLA and data-conflict analysis for morning briefings.
+
+SLA breaches and duplicate-ID conflicts are plain date arithmetic and grouping,
+so they are computed locally in a single pass over the dataset. The Night
+Watchman LLM only writes the narrative summary and insights on top of these
+findings.
+"""
+
+from collections import Counter
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from app.models.briefing import BriefingItem
+
+# Statuses that mean a ticket no longer counts against its SLA
+CLOSED_STATUSES = {"closed", "resolved", "done", "cancelled", "canceled", "completed"}
+
+PRIORITY_RANK = {"Low": 0, "Medium": 1, "High": 2, "Critical": 3}
+SEVERITY_RANK = {"LOW": 0, "MEDIUM": 1, "HIGH": 2, "CRITICAL": 3}
+
+# Fields compared across duplicate records of the same ticket ID
+CONFLICT_FIELDS = ("status", "priority", "dueDate", "assignee")
+
+
+def parse_ticket_date(value) -> Optional[date]:
+    """
+    Parse a ticket date field into a calendar date.
+
+    Accepts plain dates ("2026-01-19") and ISO 8601 timestamps
+    ("2026-01-21T10:00:00Z"). Returns None for missing or malformed values.
+    """
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).date()
+    except ValueError:
+        try:
+            return date.fromisoformat(value[:10])
+        except ValueError:
+            return None
+
+
+def is_closed(ticket: dict) -> bool:
+    """Return True if the ticket status means it is no longer active."""
+    return str(ticket.get("status", "")).strip().lower() in CLOSED_STATUSES
+
+
+def group_by_id(data: Iterable[dict]) -> Dict[str, List[dict]]:
+    """Group ticket records by ID, keeping every duplicate (insertion ordered)."""
+    groups: Dict[str, List[dict]] = {}
+    for ticket in data:
+        ticket_id = ticket.get("id")
+        if ticket_id is None:
+            continue
+        groups.setdefault(str(ticket_id), []).append(ticket)
+    return groups
+
+
+def _describe_sources(records: List[dict]) -> str:
+    return ", ".join(str(r.get("source", "Unknown")) for r in records)
+
+
+class SLAAnalyzer:
+    """Computes SLA breaches and duplicate-ID conflicts as typed briefing items."""
+
+    def __init__(self, approaching_days: int = 1):
+        # Open tickets due within this many days are flagged as at risk
+        self.approaching_days = approaching_days
+
+    def analyze(self, data: List[dict], now: Optional[datetime] = None) -> List[BriefingItem]:
+        """
+        Analyze tickets and return SLA breach and data conflict findings.
+
+        Args:
+            data: List of tickets from various systems
+            now: Reference time for SLA checks (defaults to current UTC time)
+
+        Returns:
+            Briefing items sorted by severity (most severe first)
+        """
+        today = (now or datetime.now(timezone.utc)).date()
+
+        items: List[BriefingItem] = []
+        for ticket_id, records in group_by_id(data).items():
+            sla_item = self._check_sla(ticket_id, records, today)
+            if sla_item:
+                items.append(sla_item)
+            if len(records) > 1:
+                items.append(self._check_conflict(ticket_id, records))
+
+        return sort_items(items)
+
+    def _check_sla(self, ticket_id: str, records: List[dict], today: date) -> Optional[BriefingItem]:
+        """Evaluate the SLA for one ticket ID using its earliest open due date."""
+        open_records = [
+            (due, r) for r in records
+            if not is_closed(r) and (due := parse_ticket_date(r.get("dueDate"))) is not None
+        ]
+        if not open_records:
+            return None
+
+        due, ticket = min(open_records, key=lambda pair: pair[0])
+        days_overdue = (today - due).days
+        priority = ticket.get("priority", "Medium")
+        customer = ticket.get("customer", "Unknown customer")
+        title = ticket.get("title", "")
+        assignee = ticket.get("assignee", "Unassigned")
+
+        if days_overdue > 0:
+            if priority == "Critical" or days_overdue >= 7:
+                severity = "CRITICAL"
+            elif priority == "High" or days_overdue >= 3:
+                severity = "HIGH"
+            else:
+                severity = "MEDIUM"
+            day_word = "day" if days_overdue == 1 else "days"
+            return BriefingItem(
+                id=f"sla-{ticket_id}",
+                type="SLA_BREACH",
+                title=f"{ticket_id} overdue by {days_overdue} {day_word}",
+                description=(
+                    f"{priority} priority ticket '{title}' for {customer} was due "
+                    f"{due.isoformat()} and is still {ticket.get('status', 'open')} "
+                    f"(assignee: {assignee})."
+                ),
+                severity=severity,
+                relatedTicketIds=[ticket_id],
+                suggestedAction=(
+                    "Assign an owner and escalate immediately." if assignee == "Unassigned"
+                    else f"Escalate with {assignee} and agree a recovery date."
+                ),
+            )
+
+        days_until_due = -days_overdue
+        if days_until_due <= self.approaching_days:
+            if days_until_due == 0:
+                when = "today"
+            else:
+                when = f"in {days_until_due} day{'s' if days_until_due > 1 else ''}"
+            return BriefingItem(
+                id=f"sla-{ticket_id}",
+                type="SLA_BREACH",
+                title=f"{ticket_id} due {when}",
+                description=(
+                    f"{priority} priority ticket '{title}' for {customer} is due "
+                    f"{due.isoformat()} and is still {ticket.get('status', 'open')}."
+                ),
+                severity="HIGH" if priority in ("Critical", "High") else "MEDIUM",
+                relatedTicketIds=[ticket_id],
+                suggestedAction="Confirm the ticket will close before the due date.",
+            )
+
+        return None
+
+    def _check_conflict(self, ticket_id: str, records: List[dict]) -> BriefingItem:
+        """Describe how duplicate records of one ticket ID disagree."""
+        differing = [
+            field for field in CONFLICT_FIELDS
+            if len({str(r.get(field)) for r in records}) > 1
+        ]
+        sources = _describe_sources(records)
+        top_priority = max(records, key=lambda r: PRIORITY_RANK.get(r.get("priority"), 0)).get("priority")
+
+        if not differing:
+            return BriefingItem(
+                id=f"conflict-{ticket_id}",
+                type="DATA_CONFLICT",
+                title=f"{ticket_id} duplicated across systems",
+                description=f"{ticket_id} appears {len(records)} times with identical details ({sources}).",
+                severity="LOW",
+                relatedTicketIds=[ticket_id],
+                suggestedAction="Merge the duplicate records.",
+            )
+
+        details = "; ".join(
+            f"{field}: " + ", ".join(f"{r.get('source', 'Unknown')}={r.get(field)}" for r in records)
+            for field in differing
+        )
+        closed_states = {is_closed(r) for r in records}
+        if "status" in differing and len(closed_states) > 1:
+            severity = "CRITICAL" if top_priority == "Critical" else "HIGH"
+        elif "status" in differing or "priority" in differing:
+            severity = "HIGH" if top_priority == "Critical" else "MEDIUM"
+        else:
+            severity = "LOW"
+
+        return BriefingItem(
+            id=f"conflict-{ticket_id}",
+            type="DATA_CONFLICT",
+            title=f"{ticket_id} {'/'.join(differing)} mismatch across {len(records)} systems",
+            description=f"Duplicate records of {ticket_id} disagree on {details}.",
+            severity=severity,
+            relatedTicketIds=[ticket_id],
+            suggestedAction=f"Reconcile {ticket_id} in {sources} and keep a single source of truth.",
+        )
+
+
+def sort_items(items: List[BriefingItem]) -> List[BriefingItem]:
+    """Sort briefing items by severity (descending), then type and ID."""
+    return sorted(items, key=lambda i: (-SEVERITY_RANK[i.severity], i.type, i.id))
+
+
+def dataset_profile(data: List[dict]) -> Dict[str, Dict[str, int]]:
+    """
+    Aggregate counts the LLM needs to spot patterns without reading every ticket.
+
+    Returns:
+        Dictionary of field name to value counts (open tickets only for
+        assignee and customer, where workload matters)
+    """
+    open_tickets = [t for t in data if not is_closed(t)]
+    return {
+        "status": dict(Counter(str(t.get("status")) for t in data)),
+        "priority": dict(Counter(str(t.get("priority")) for t in data)),
+        "source": dict(Counter(str(t.get("source")) for t in data)),
+        "openByAssignee": dict(Counter(str(t.get("assignee")) for t in open_tickets).most_common(10)),
+        "openByCustomer": dict(Counter(str(t.get("customer")) for t in open_tickets).most_common(10)),
+    }
+
+
+def summarize_findings(items: List[BriefingItem], ticket_count: int) -> str:
+    """Build a plain summary of precomputed findings (used when the LLM is unavailable)."""
+    if not items:
+        return f"Analyzed {ticket_count} tickets. No SLA breaches or data conflicts detected."
+
+    breaches = sum(1 for i in items if i.type == "SLA_BREACH")
+    conflicts = sum(1 for i in items if i.type == "DATA_CONFLICT")
+    critical = sum(1 for i in items if i.severity == "CRITICAL")
+    return (
+        f"Analyzed {ticket_count} tickets: {breaches} SLA issue(s) and "
+        f"{conflicts} data conflict(s), {critical} critical."
+    )
+
+
+# Singleton instance
+sla_analyzer = SLAAnalyzer()
@@ -0,0 +1,185 @@
+"""
+Speculative knowledge base retrieval for hybrid ASK questions.
+
+A hybrid question names tickets and asks how to handle them ("what's wrong
+with TKT-101 and how do I fix it?"). The model answers it with query_tickets
+and retrieve, so the Knowledge Base query cannot start before the first
+model call has finished. For these questions a retrieval is started before
+the agent runs, with ticket IDs replaced by the ticket titles, and runs in
+parallel with the first model call. A retrieve call of the same request
+whose query words mostly appear in the speculative query takes its results
+instead of querying again; otherwise the speculative results are dropped.
+"""
+
+import contextlib
+import contextvars
+import logging
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Callable, Iterator, List, Optional
+
+from app.config import settings
+from app.services.ticket_store import TICKET_ID_PATTERN, TicketStore
+from app.utils.bm25 import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Phrases asking for documentation rather than ticket data
+KNOWLEDGE_CUES = re.compile(
+    r"\b(how (do|can|should|to)|fix|resolve|troubleshoot|workaround|procedure|process|steps?|"
+    r"polic(y|ies)|escalat\w*|best practices?|guide)\b"
+)
+_TICKET_ID = re.compile(TICKET_ID_PATTERN.pattern, re.IGNORECASE)
+
+# Retrieve parameters a speculation can answer (the rest use tool defaults)
+SPECULATIVE_PARAMETERS = {"text", "enableMetadata"}
+
+
+def is_hybrid(message: str) -> bool:
+    """True if message names a ticket and asks for knowledge base content."""
+    return bool(_TICKET_ID.search(message)) and bool(KNOWLEDGE_CUES.search(message.lower()))
+
+
+def speculative_query(message: str, store: TicketStore) -> str:
+    """The message with ticket IDs replaced by their titles (unknown IDs are kept)."""
+    def title(match: re.Match) -> str:
+        records = store.get([match.group(0).upper()])
+        return str(records[0].get("title") or match.group(0)) if records else match.group(0)
+
+    return _TICKET_ID.sub(title, message)
+
+
+class Speculation:
+    """A retrieval started ahead of the model for one request."""
+
+    def __init__(self, query: str, future: Future, min_overlap: float, timeout_seconds: float):
+        self.query = query
+        self.future = future
+        self.min_overlap = min_overlap
+        self.timeout_seconds = timeout_seconds
+        self.words = set(tokenize(query))
+        self.used = False
+        self.wait_seconds = 0.0
+
+    def matches(self, tool_input: dict) -> bool:
+        """True if a retrieve call asks for what this speculation fetched."""
+        if set(tool_input) - SPECULATIVE_PARAMETERS:
+            return False
+        words = set(tokenize(tool_input.get("text", "")))
+        return bool(words) and len(words & self.words) / len(words) >= self.min_overlap
+
+    def claim(self, tool_input: dict) -> Optional[List[dict]]:
+        """
+        Return the speculative results for a matching retrieve call.
+
+        Returns:
+            The results (waiting for them if needed), or None if the call does
+            not match or the speculative retrieval failed
+        """
+        if not self.matches(tool_input):
+            return None
+        started = time.perf_counter()
+        try:
+            results = self.future.result(timeout=self.timeout_seconds)
+        except Exception as e:
+            logger.debug(f"Speculative retrieval not used: {e}")
+            return None
+        finally:
+            self.wait_seconds += time.perf_counter() - started
+        self.used = True
+        logger.debug("Retrieve answered by speculative retrieval")
+        return results
+
+
+# Speculation of the request being served; copied into the agent's tool threads
+_current: ContextVar[Optional[Speculation]] = ContextVar("speculation", default=None)
+
+
+def claim_speculative_results(tool_input: dict) -> Optional[List[dict]]:
+    """Results of the current request's speculation for a matching retrieve call, if any."""
+    speculation = _current.get()
+    return speculation.claim(tool_input) if speculation is not None else None
+
+
+class SpeculativeRetriever:
+    """Starts knowledge base retrievals for hybrid questions on a small thread pool."""
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        min_overlap: float = 0.6,
+        timeout_seconds: float = 10.0,
+        enabled: bool = True
+    ):
+        """
+        Args:
+            max_workers: Speculative retrievals that may run at the same time
+            min_overlap: Share of a retrieve query's words that must appear in
+                the speculative query for its results to be used (0-1)
+            timeout_seconds: How long a retrieve call waits for the speculation
+            enabled: Disable to never start speculative retrievals
+        """
+        self.min_overlap = min_overlap
+        self.timeout_seconds = timeout_seconds
+        self.enabled = enabled
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="kb-speculative")
+        self._lock = threading.Lock()
+        self._started = 0
+        self._used = 0
+        self._wait_seconds = 0.0
+
+    @contextlib.contextmanager
+    def speculate(
+        self,
+        message: str,
+        store: TicketStore,
+        fetch: Callable[[dict], List[dict]]
+    ) -> Iterator[Optional[Speculation]]:
+        """
+        Start a retrieval for message if it is hybrid, for the duration of a with block.
+
+        Args:
+            message: The user's question
+            store: Indexed dataset, for ticket titles
+            fetch: Runs a retrieve query and returns its results
+        """
+        if not self.enabled or not is_hybrid(message):
+            yield None
+            return
+
+        query = speculative_query(message, store)
+        future = self._executor.submit(contextvars.copy_context().run, fetch, {"text": query})
+        speculation = Speculation(query, future, self.min_overlap, self.timeout_seconds)
+        token = _current.set(speculation)
+        try:
+            yield speculation
+        finally:
+            _current.reset(token)
+            with self._lock:
+                self._started += 1
+                self._used += speculation.used
+                self._wait_seconds += speculation.wait_seconds
+
+    def stats(self) -> dict:
+        """Speculations started and used, and the average time retrieve calls waited for them."""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "started": self._started,
+                "used": self._used,
+                "unused": self._started - self._used,
+                "used_ratio": round(self._used / self._started, 4) if self._started else 0.0,
+                "avg_wait_ms": round(1000 * self._wait_seconds / self._used, 1) if self._used else 0.0,
+            }
+
+
+# Singleton instance
+speculative_retriever = SpeculativeRetriever(
+    max_workers=settings.speculative_retrieval_max_workers,
+    min_overlap=settings.speculative_retrieval_min_overlap,
+    timeout_seconds=settings.speculative_retrieval_timeout_seconds,
+    enabled=settings.speculative_retrieval_enabled,
+)
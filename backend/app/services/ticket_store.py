@@ -0,0 +1,302 @@
+"""
+Indexed in-memory ticket store backing the chat agent's ticket tools.
+
+Tickets are indexed once so tool calls never scan the whole dataset:
+- id: hash index keeping every duplicate record (conflicting sources)
+- status, priority, customer, source, assignee: case-insensitive hash indexes
+- dueDate: sorted index for range filters and due-date ordering
+- title, customer, assignee: BM25 index (built on first search) that ranks
+  tickets by relevance to a chat question
+"""
+
+import bisect
+import heapq
+import re
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.services.sla_analyzer import PRIORITY_RANK, dataset_profile, is_closed, parse_ticket_date
+from app.utils.bm25 import BM25Index, tokenize
+
+INDEXED_FIELDS = ("status", "priority", "customer", "source", "assignee")
+
+# Filters besides INDEXED_FIELDS accepted by find()
+RANGE_FILTERS = ("dueBefore", "dueAfter", "open", "overdue")
+
+TICKET_ID_PATTERN = re.compile(r"\b[A-Z][A-Z0-9]+-\d+\b")
+
+# Question words that select tickets by status or priority in search()
+STATUS_KEYWORDS = {
+    "closed": ["closed", "resolved", "done"],
+    "resolved": ["closed", "resolved", "done"],
+    "progress": ["in progress"],
+    "pending": ["pending", "pending vendor"],
+}
+PRIORITY_KEYWORDS = {
+    "critical": ["critical"],
+    "urgent": ["critical", "high"],
+    "high": ["high"],
+    "medium": ["medium"],
+    "low": ["low"],
+}
+OPEN_KEYWORDS = {"open", "active", "unresolved"}
+OVERDUE_KEYWORDS = {"overdue", "breach", "breached", "breaches", "late", "sla", "past"}
+DUE_SOON_KEYWORDS = {"soon", "today", "tomorrow", "approaching", "upcoming"}
+
+# search() scores: an explicit ID mention always wins; BM25 scores are
+# typically 1-10; every keyword filter a ticket satisfies adds KEYWORD_SCORE
+ID_MATCH_SCORE = 100.0
+KEYWORD_SCORE = 2.0
+
+
+def _norm(value: Any) -> str:
+    return str(value).strip().lower()
+
+
+class TicketStore:
+    """Read-only indexed view over one dataset."""
+
+    def __init__(self, tickets: Iterable[dict]):
+        self.tickets: List[dict] = list(tickets)
+        self._by_id: Dict[str, List[int]] = {}
+        self._by_field: Dict[str, Dict[str, List[int]]] = {field: {} for field in INDEXED_FIELDS}
+        self._open: List[int] = []
+        self._is_open: List[bool] = []
+        self._due_by_position: List[Optional[date]] = []
+        due: List[tuple] = []
+
+        for position, ticket in enumerate(self.tickets):
+            if ticket.get("id") is not None:
+                self._by_id.setdefault(str(ticket["id"]), []).append(position)
+            for field in INDEXED_FIELDS:
+                if ticket.get(field) is not None:
+                    self._by_field[field].setdefault(_norm(ticket[field]), []).append(position)
+            self._is_open.append(not is_closed(ticket))
+            if self._is_open[-1]:
+                self._open.append(position)
+            due_date = parse_ticket_date(ticket.get("dueDate"))
+            self._due_by_position.append(due_date)
+            if due_date is not None:
+                due.append((due_date, position))
+
+        due.sort()
+        self._due_dates: List[date] = [d for d, _ in due]
+        self._due_positions: List[int] = [p for _, p in due]
+
+        # Built on first use
+        self._text_index: Optional[BM25Index] = None
+        self._profile: Optional[dict] = None
+        self._overdue: Optional[List[int]] = None
+
+    def __len__(self) -> int:
+        return len(self.tickets)
+
+    def get(self, ticket_ids: Iterable[str]) -> List[dict]:
+        """Return every record for the given IDs (duplicates included), in dataset order."""
+        positions = set()
+        for ticket_id in ticket_ids:
+            positions.update(self._by_id.get(str(ticket_id), ()))
+        return [self.tickets[p] for p in sorted(positions)]
+
+    def find(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        sort: Optional[str] = None,
+        limit: int = 20
+    ) -> dict:
+        """
+        Filter, sort and truncate tickets using the indexes.
+
+        Args:
+            filters: Field -> value (or list of values, matched case-insensitively)
+                for INDEXED_FIELDS; dueBefore/dueAfter take inclusive ISO dates;
+                open=True keeps only tickets that still count against their SLA;
+                overdue=True keeps open tickets past their due date (needs the
+                daysOverdue annotation from time_context)
+            sort: "dueDate" or "priority", prefixed with "-" for descending;
+                None keeps dataset order
+            limit: Maximum number of tickets returned
+
+        Returns:
+            {"total": number of matches, "tickets": up to limit matching records}
+
+        Raises:
+            ValueError: For unknown filter or sort fields, or malformed dates
+        """
+        candidates = self._match(filters or {})
+        positions = range(len(self.tickets)) if candidates is None else candidates
+        total = len(positions)
+        limit = max(0, limit)
+
+        if sort:
+            key = self._sort_key(sort.lstrip("-"), descending=sort.startswith("-"))
+            selected = heapq.nsmallest(limit, positions, key=key)
+        else:
+            selected = sorted(positions)[:limit] if candidates is not None else list(positions[:limit])
+
+        return {"total": total, "tickets": [self.tickets[p] for p in selected]}
+
+    def search(self, query: str, limit: int = 15) -> Tuple[List[dict], bool]:
+        """
+        Rank tickets by relevance to a free-text question.
+
+        Combines exact ticket-ID mentions, BM25 over title, customer and
+        assignee, and status/priority/SLA keywords ("critical", "overdue",
+        "in progress"). Ties are broken by urgency.
+
+        Returns:
+            Tuple of (up to limit tickets, whether anything matched). With no
+            match, the most urgent open tickets are returned instead.
+        """
+        scores: Dict[int, float] = {}
+        for ticket_id in set(TICKET_ID_PATTERN.findall(query.upper())):
+            for p in self._by_id.get(ticket_id, ()):
+                scores[p] = scores.get(p, 0.0) + ID_MATCH_SCORE
+
+        if self._text_index is None:
+            self._text_index = BM25Index(
+                " ".join(str(t.get(field) or "") for field in ("title", "customer", "assignee"))
+                for t in self.tickets
+            )
+        for p, score in self._text_index.scores(query).items():
+            scores[p] = scores.get(p, 0.0) + score
+
+        for positions in self._keyword_matches(set(tokenize(query))):
+            for p in positions:
+                scores[p] = scores.get(p, 0.0) + KEYWORD_SCORE
+
+        matched = bool(scores)
+        candidates = scores if matched else self._open
+        selected = heapq.nsmallest(limit, candidates, key=lambda p: (-scores.get(p, 0.0), self._urgency(p)))
+        return [self.tickets[p] for p in selected], matched
+
+    def values(self, field: str) -> List[str]:
+        """Distinct lowercased values of an indexed field."""
+        return list(self._by_field[field])
+
+    def profile(self) -> dict:
+        """Value counts per field (see sla_analyzer.dataset_profile), computed once."""
+        if self._profile is None:
+            self._profile = dataset_profile(self.tickets)
+        return self._profile
+
+    def _keyword_matches(self, words: Set[str]) -> List[Set[int]]:
+        """Position sets for each keyword filter the question mentions."""
+        matches = []
+        statuses = {s for w in words & set(STATUS_KEYWORDS) for s in STATUS_KEYWORDS[w]}
+        if statuses:
+            matches.append(self._match({"status": sorted(statuses)}))
+        priorities = {p for w in words & set(PRIORITY_KEYWORDS) for p in PRIORITY_KEYWORDS[w]}
+        if priorities:
+            matches.append(self._match({"priority": sorted(priorities)}))
+        if words & OPEN_KEYWORDS:
+            matches.append(set(self._open))
+        # SLA fields come from time_context annotation; unannotated tickets never match
+        if words & OVERDUE_KEYWORDS:
+            matches.append(set(self._overdue_positions()))
+        if words & DUE_SOON_KEYWORDS:
+            matches.append({
+                p for p in self._open
+                if self.tickets[p].get("daysUntilDue") is not None
+                and not self.tickets[p].get("daysOverdue")
+                and self.tickets[p]["daysUntilDue"] <= 2
+            })
+        return matches
+
+    def _is_overdue(self, p: int) -> bool:
+        return self._is_open[p] and (self.tickets[p].get("daysOverdue") or 0) > 0
+
+    def _overdue_positions(self) -> List[int]:
+        if self._overdue is None:
+            self._overdue = [p for p in self._open if self._is_overdue(p)]
+        return self._overdue
+
+    def _urgency(self, p: int) -> tuple:
+        """Sort key: most overdue, then highest priority, then soonest due."""
+        ticket = self.tickets[p]
+        until_due = ticket.get("daysUntilDue")
+        return (
+            not self._is_open[p],
+            -(ticket.get("daysOverdue") or 0),
+            -PRIORITY_RANK.get(ticket.get("priority"), -1),
+            until_due if until_due is not None else float("inf"),
+            p,
+        )
+
+    def _match(self, filters: Dict[str, Any]) -> Optional[Set[int]]:
+        """Intersect index lookups for every filter; None means no filter applied."""
+        unknown = set(filters) - set(INDEXED_FIELDS) - set(RANGE_FILTERS)
+        if unknown:
+            raise ValueError(
+                f"Unknown filter(s) {sorted(unknown)}; use {list(INDEXED_FIELDS + RANGE_FILTERS)}"
+            )
+
+        # Each filter is (match count, lazy candidate positions, predicate). The
+        # most selective filter drives the scan and the rest are checked per
+        # candidate, so cost tracks the smallest match set, not the largest.
+        constraints: List[Tuple[int, Callable[[], Iterable[int]], Callable[[int], bool]]] = []
+        for field in INDEXED_FIELDS:
+            if field not in filters:
+                continue
+            raw = filters[field] if isinstance(filters[field], list) else [filters[field]]
+            values = {_norm(value) for value in raw}
+            postings = [self._by_field[field][v] for v in values if v in self._by_field[field]]
+            constraints.append((
+                sum(len(positions) for positions in postings),
+                lambda postings=postings: (p for positions in postings for p in positions),
+                self._field_predicate(field, values),
+            ))
+
+        if "dueBefore" in filters or "dueAfter" in filters:
+            low_date = self._parse_bound(filters, "dueAfter") if "dueAfter" in filters else date.min
+            high_date = self._parse_bound(filters, "dueBefore") if "dueBefore" in filters else date.max
+            low = bisect.bisect_left(self._due_dates, low_date)
+            high = bisect.bisect_right(self._due_dates, high_date)
+
+            def in_due_range(p: int) -> bool:
+                due = self._due_by_position[p]
+                return due is not None and low_date <= due <= high_date
+
+            constraints.append((high - low, lambda: self._due_positions[low:high], in_due_range))
+
+        if filters.get("open"):
+            constraints.append((len(self._open), lambda: self._open, lambda p: self._is_open[p]))
+
+        if filters.get("overdue"):
+            overdue = self._overdue_positions()
+            constraints.append((len(overdue), lambda: overdue, self._is_overdue))
+
+        if not constraints:
+            return None
+        constraints.sort(key=lambda c: c[0])
+        checks = [check for _, _, check in constraints[1:]]
+        return {p for p in constraints[0][1]() if all(check(p) for check in checks)}
+
+    def _field_predicate(self, field: str, values: Set[str]) -> Callable[[int], bool]:
+        def check(p: int) -> bool:
+            value = self.tickets[p].get(field)
+            return value is not None and _norm(value) in values
+        return check
+
+    @staticmethod
+    def _parse_bound(filters: Dict[str, Any], name: str) -> date:
+        bound = parse_ticket_date(filters[name])
+        if bound is None:
+            raise ValueError(f"{name} must be an ISO date, got {filters[name]!r}")
+        return bound
+
+    def _sort_key(self, field: str, descending: bool):
+        """Key for ascending selection; missing values sort last either way, ties keep dataset order."""
+        sign = -1 if descending else 1
+
+        if field == "dueDate":
+            def key(p):
+                due = self._due_by_position[p]
+                return (due is None, sign * due.toordinal() if due else 0, p)
+        elif field == "priority":
+            def key(p):
+                rank = PRIORITY_RANK.get(self.tickets[p].get("priority"))
+                return (rank is None, sign * rank if rank is not None else 0, p)
+        else:
+            raise ValueError(f"Unknown sort field {field!r}; use dueDate or priority")
+        return key
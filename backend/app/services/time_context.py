@@ -0,0 +1,83 @@
+"""
+Precomputed time context for agent prompts.
+
+Instead of having the model call the current_time tool before every SLA
+comparison (a full extra model turn), prompts carry a reference timestamp
+and each ticket carries daysOverdue / daysUntilDue computed once per
+dataset and reference date.
+"""
+
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from app.services.sla_analyzer import is_closed, parse_ticket_date
+from app.services.ticket_store import TicketStore
+from app.utils.cache import MemoryCache
+from app.utils.hashing import dataset_hash
+
+
+def annotate_tickets(data: List[dict], now: Optional[datetime] = None) -> List[dict]:
+    """
+    Return copies of tickets with SLA timing fields added.
+
+    Open tickets with a valid dueDate get daysOverdue (0 when not yet due)
+    and daysUntilDue (0 when due today or overdue). Closed tickets and
+    tickets without a parseable dueDate get None for both.
+    """
+    today = (now or datetime.now(timezone.utc)).date()
+    annotated = []
+    for ticket in data:
+        due = parse_ticket_date(ticket.get("dueDate"))
+        if due is None or is_closed(ticket):
+            days_overdue = days_until_due = None
+        else:
+            delta = (due - today).days
+            days_overdue, days_until_due = max(0, -delta), max(0, delta)
+        annotated.append({**ticket, "daysOverdue": days_overdue, "daysUntilDue": days_until_due})
+    return annotated
+
+
+def reference_time_line(now: datetime) -> str:
+    """Prompt line stating the reference time that SLA fields and findings use."""
+    return f"REFERENCE TIME: {now.strftime('%Y-%m-%dT%H:%M:%SZ')} ({now.strftime('%A')})"
+
+
+class TimeContext:
+    """Caches annotated datasets so timing fields are computed once per dataset and day."""
+
+    def __init__(self, max_datasets: int = 16):
+        self._annotated = MemoryCache(max_entries=max_datasets)
+        self._stores = MemoryCache(max_entries=max_datasets)
+
+    def annotate(self, data: List[dict], now: Optional[datetime] = None, data_hash: Optional[str] = None) -> List[dict]:
+        """
+        Return the annotated dataset, computing it on first use for the reference date.
+
+        Pass data_hash when the caller already has dataset_hash(data).
+        """
+        now = now or datetime.now(timezone.utc)
+        key = f"{data_hash or dataset_hash(data)}:{now.date().isoformat()}"
+        annotated = self._annotated.get(key)
+        if annotated is None:
+            annotated = annotate_tickets(data, now)
+            self._annotated.set(key, annotated)
+        return annotated
+
+    def store(self, data: List[dict], now: Optional[datetime] = None, data_hash: Optional[str] = None) -> TicketStore:
+        """
+        Return an indexed view of the annotated dataset, built once per dataset and day.
+
+        Pass data_hash when the caller already has dataset_hash(data).
+        """
+        now = now or datetime.now(timezone.utc)
+        data_hash = data_hash or dataset_hash(data)
+        key = f"{data_hash}:{now.date().isoformat()}"
+        store = self._stores.get(key)
+        if store is None:
+            store = TicketStore(self.annotate(data, now, data_hash))
+            self._stores.set(key, store)
+        return store
+
+
+# Singleton instance
+time_context = TimeContext()
@@ -0,0 +1,80 @@
+"""
+Minimal BM25 inverted index for local relevance ranking.
+
+Scoring only touches the posting lists of the query terms, so a search
+costs O(matching postings) regardless of corpus size.
+"""
+
+import math
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = {
+    "a", "an", "and", "any", "are", "as", "at", "be", "by", "can", "do", "does", "for",
+    "from", "has", "have", "how", "i", "in", "is", "it", "its", "me", "my", "of", "on",
+    "or", "show", "tell", "that", "the", "their", "there", "this", "to", "was", "we",
+    "what", "when", "where", "which", "who", "why", "with", "you", "your",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords."""
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed list of documents."""
+
+    def __init__(self, documents: Iterable[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        self._lengths: List[int] = []
+
+        for doc_id, text in enumerate(documents):
+            tokens = tokenize(text)
+            self._lengths.append(len(tokens))
+            counts: Dict[str, int] = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, count in counts.items():
+                self._postings.setdefault(token, []).append((doc_id, count))
+
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form of the index (see from_dict)."""
+        return {"k1": self.k1, "b": self.b, "lengths": self._lengths, "postings": self._postings}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BM25Index":
+        """Restore an index saved with to_dict without re-tokenizing the documents."""
+        index = cls([], k1=data["k1"], b=data["b"])
+        index._lengths = list(data["lengths"])
+        index._postings = {term: [tuple(p) for p in postings] for term, postings in data["postings"].items()}
+        index._avg_length = (sum(index._lengths) / len(index._lengths)) if index._lengths else 0.0
+        return index
+
+    def scores(self, query: str) -> Dict[int, float]:
+        """BM25 score of every document sharing at least one term with query."""
+        total = len(self._lengths)
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings:
+                norm = 1 - self.b + self.b * self._lengths[doc_id] / (self._avg_length or 1)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+        return scores
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Return (doc_id, score) pairs, best first."""
+        ranked = sorted(self.scores(query).items(), key=lambda pair: (-pair[1], pair[0]))
+        return ranked if limit is None else ranked[:limit]
@@ -0,0 +1,225 @@
+"""
+TTL + LRU caches with hit/miss counters.
+
+Two interchangeable backends:
+- MemoryCache: in-process OrderedDict, stores any Python object
+- SQLiteCache: on-disk, survives restarts, stores JSON-serializable values
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+_MISSING = object()
+
+
+class CacheStats:
+    """Hit/miss/eviction counters for a cache."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class MemoryCache:
+    """Thread-safe in-memory cache with TTL expiry and LRU eviction."""
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            max_entries: Maximum number of entries before LRU eviction
+            ttl_seconds: Entry lifetime in seconds (None or 0 disables expiry)
+            clock: Time source, overridable for tests
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds or None
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value for key, or default on miss/expiry."""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.stats.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= self._clock():
+                del self._entries[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store value under key, evicting the least recently used entries."""
+        expires_at = self._clock() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, key: str) -> None:
+        """Remove key if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """On-disk cache with TTL expiry and LRU eviction, backed by SQLite."""
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Args:
+            path: SQLite database file (parent directories are created)
+            max_entries: Maximum number of rows before LRU eviction
+            ttl_seconds: Entry lifetime in seconds (None or 0 disables expiry)
+            clock: Wall-clock time source (must survive restarts)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds or None
+        self.stats = CacheStats()
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL, last_access REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value for key, or default on miss/expiry."""
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return default
+
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                self._conn.commit()
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return default
+
+            self._conn.execute("UPDATE cache_entries SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.stats.hits += 1
+            return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value, evicting the least recently used rows."""
+        now = self._clock()
+        expires_at = now + self.ttl_seconds if self.ttl_seconds else None
+        payload = json.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, payload, expires_at, now)
+            )
+            overflow = len(self) - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM cache_entries WHERE key IN ("
+                    "SELECT key FROM cache_entries ORDER BY last_access ASC LIMIT ?)",
+                    (overflow,)
+                )
+                self.stats.evictions += overflow
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        """Remove key if present."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+
+def create_cache(
+    backend: str,
+    max_entries: int,
+    ttl_seconds: Optional[float] = None,
+    path: Optional[str] = None
+):
+    """
+    Build a cache for the configured backend.
+
+    Args:
+        backend: "memory" or "sqlite"
+        max_entries: Maximum number of entries before LRU eviction
+        ttl_seconds: Entry lifetime in seconds
+        path: Database file for the sqlite backend
+
+    Raises:
+        ValueError: If the backend name is unknown or sqlite has no path
+    """
+    if backend == "memory":
+        return MemoryCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+    if backend == "sqlite":
+        if not path:
+            raise ValueError("SQLite cache backend requires a path")
+        return SQLiteCache(path, max_entries=max_entries, ttl_seconds=ttl_seconds)
+    raise ValueError(f"Unknown cache backend: {backend}")
@@ -0,0 +1,26 @@
+"""
+Canonical content hashing for ticket datasets.
+"""
+
+import hashlib
+import json
+from typing import Any, List
+
+
+def canonical_json(value: Any) -> str:
+    """Serialize a value to JSON with sorted keys and no whitespace."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def dataset_hash(data: List[dict]) -> str:
+    """
+    Hash a ticket set independent of record order and key order.
+
+    Two payloads with the same tickets in a different order (or with keys
+    serialized differently) produce the same hash.
+    """
+    digest = hashlib.sha256()
+    for record in sorted(canonical_json(ticket) for ticket in data):
+        digest.update(record.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
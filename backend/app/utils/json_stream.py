@@ -0,0 +1,166 @@
+"""
+Incremental and error-tolerant JSON parsing for model output.
+
+The model streams a JSON object such as {"summary": "...", "insights": [...]}
+a few characters at a time. JsonItemStream yields each element of a named
+array as soon as its closing brace arrives, without waiting for (or
+re-scanning) the rest of the document. extract_json_object uses the same
+scanner to salvage every valid element from truncated or malformed output.
+"""
+
+import json
+import re
+from typing import Iterable, List, Optional
+
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+
+class JsonItemStream:
+    """Yields complete objects from a named JSON array as text is fed in."""
+
+    def __init__(self, array_key: str = "items"):
+        self._array_start = re.compile(r'"%s"\s*:\s*\[' % re.escape(array_key))
+        self._buffer = ""
+        self._pos = 0             # next unscanned character in the buffer
+        self._in_array = False
+        self._array_done = False
+        self._depth = 0           # object nesting depth inside the array
+        self._item_start = None   # buffer index of the current item's "{"
+        self._in_string = False
+        self._escaped = False
+
+    @property
+    def text(self) -> str:
+        """All text fed so far."""
+        return self._buffer
+
+    def feed(self, chunk: str) -> List[dict]:
+        """
+        Add a chunk of model output.
+
+        Returns:
+            Objects from the array that were completed by this chunk
+        """
+        self._buffer += chunk
+        completed: List[dict] = []
+
+        if not self._in_array and not self._array_done:
+            match = self._array_start.search(self._buffer)
+            if not match:
+                return completed
+            self._in_array = True
+            self._pos = match.end()
+
+        if not self._in_array:
+            return completed
+
+        buffer = self._buffer
+        for index in range(self._pos, len(buffer)):
+            char = buffer[index]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char == "{":
+                if self._depth == 0:
+                    self._item_start = index
+                self._depth += 1
+            elif char == "}" and self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0:
+                    item = self._decode(buffer[self._item_start:index + 1])
+                    if item is not None:
+                        completed.append(item)
+                    self._item_start = None
+            elif char == "]" and self._depth == 0:
+                self._in_array = False
+                self._array_done = True
+                self._pos = index + 1
+                return completed
+
+        self._pos = len(buffer)
+        return completed
+
+    @staticmethod
+    def _decode(fragment: str) -> Optional[dict]:
+        value = _loads_lenient(fragment)
+        return value if isinstance(value, dict) else None
+
+
+def _loads_lenient(text: str):
+    """json.loads, retrying once with trailing commas removed."""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    try:
+        return json.loads(_TRAILING_COMMA.sub(r"\1", text))
+    except json.JSONDecodeError:
+        return None
+
+
+def strip_wrappers(text: str) -> str:
+    """Remove <response> tags and markdown code fences around model output."""
+    response_match = re.search(r'<response>(.*?)</response>', text, re.DOTALL)
+    if response_match:
+        text = response_match.group(1).strip()
+
+    fence = re.search(r"```(?:json)?\s*(.*?)(?:```|$)", text, re.DOTALL)
+    if fence:
+        text = fence.group(1).strip()
+    return text
+
+
+def extract_string_field(text: str, key: str) -> Optional[str]:
+    """Return the value of a string field if it appears complete in text."""
+    match = re.search(r'"%s"\s*:\s*("(?:[^"\\]|\\.)*")' % re.escape(key), text)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group(1))
+    except json.JSONDecodeError:
+        return None
+
+
+def extract_json_object(
+    text: str,
+    array_key: Optional[str] = None,
+    string_keys: Iterable[str] = ()
+) -> dict:
+    """
+    Parse a JSON object from model output, salvaging what is valid.
+
+    Tries a strict parse of the outermost object first (after removing
+    <response> tags, code fences and trailing commas). If that fails, every
+    complete element of array_key and every complete string field in
+    string_keys is recovered individually, so one broken item or a
+    truncated response does not discard the rest.
+
+    Returns:
+        The parsed object, or a dict with only the salvaged fields (possibly empty)
+    """
+    cleaned = strip_wrappers(text)
+    start, end = cleaned.find("{"), cleaned.rfind("}")
+    if start != -1 and end > start:
+        value = _loads_lenient(cleaned[start:end + 1])
+        if isinstance(value, dict):
+            return value
+
+    salvaged = {}
+    for key in string_keys:
+        field = extract_string_field(cleaned, key)
+        if field is not None:
+            salvaged[key] = field
+    if array_key:
+        items = JsonItemStream(array_key=array_key).feed(cleaned)
+        if items:
+            salvaged[array_key] = items
+    return salvaged
+
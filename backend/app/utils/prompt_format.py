@@ -0,0 +1,139 @@
+"""
+Token-efficient serialization of datasets for agent prompts.
+
+Pretty-printed JSON repeats every key on every ticket, which roughly triples
+prompt tokens. Formats:
+- json: pretty-printed JSON (legacy behaviour)
+- minified: JSON without whitespace
+- table: pipe-delimited header row plus one row per record
+- dictionary: table where repeated values are replaced by short codes
+  defined once in a legend
+"""
+
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+from app.config import settings
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]|\n\s*")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate the model token count of text.
+
+    Counts word runs, individual punctuation marks and line breaks with
+    their indentation, which tracks BPE tokenizers closely enough to
+    compare serialization formats.
+    """
+    return len(_TOKEN_PATTERN.findall(text))
+
+
+def _columns(records: List[dict]) -> List[str]:
+    """Union of record keys in first-seen order."""
+    columns: Dict[str, None] = {}
+    for record in records:
+        for key in record:
+            columns.setdefault(key, None)
+    return list(columns)
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        value = ",".join(str(v) for v in value)
+    elif isinstance(value, dict):
+        value = json.dumps(value, separators=(",", ":"))
+    return str(value).replace("|", "/").replace("\n", " ")
+
+
+def to_json(records: List[dict]) -> str:
+    return json.dumps(records, indent=2)
+
+
+def to_minified(records: List[dict]) -> str:
+    return json.dumps(records, separators=(",", ":"))
+
+
+def to_table(records: List[dict]) -> str:
+    if not records:
+        return "(no records)"
+    columns = _columns(records)
+    lines = ["|".join(columns)]
+    lines.extend("|".join(_cell(record.get(column)) for column in columns) for record in records)
+    return "\n".join(lines)
+
+
+def to_dictionary(records: List[dict]) -> str:
+    if not records:
+        return "(no records)"
+    columns = _columns(records)
+
+    # Encode a column when its values repeat enough to pay for the legend
+    codes: Dict[str, Dict[str, str]] = {}
+    for column in columns:
+        values = [_cell(record.get(column)) for record in records]
+        distinct = list(dict.fromkeys(values))
+        if len(distinct) < len(values) / 2 and any(len(v) > 3 for v in distinct):
+            codes[column] = {value: str(index) for index, value in enumerate(distinct)}
+
+    lines = [
+        f"@{column}: " + "; ".join(f"{code}={value}" for value, code in mapping.items())
+        for column, mapping in codes.items()
+    ]
+    lines.append("|".join(f"@{c}" if c in codes else c for c in columns))
+    for record in records:
+        row = []
+        for column in columns:
+            value = _cell(record.get(column))
+            row.append(codes[column][value] if column in codes else value)
+        lines.append("|".join(row))
+    return "\n".join(lines)
+
+
+FORMATS: Dict[str, Callable[[List[dict]], str]] = {
+    "json": to_json,
+    "minified": to_minified,
+    "table": to_table,
+    "dictionary": to_dictionary,
+}
+
+FORMAT_HINTS = {
+    "json": "JSON array",
+    "minified": "JSON array",
+    "table": "pipe-delimited table, first row is the header",
+    "dictionary": (
+        "pipe-delimited table, first row after the legend is the header; "
+        "columns marked @ hold codes defined in the matching @column legend line"
+    ),
+}
+
+
+def serialize_records(records: List[dict], fmt: Optional[str] = None) -> str:
+    """
+    Serialize a list of records (tickets, briefing items) for a prompt.
+
+    Args:
+        records: Records to serialize
+        fmt: Format name; defaults to settings.prompt_data_format
+
+    Returns:
+        Serialized text prefixed with a one-line description of the format
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    fmt = fmt or settings.prompt_data_format
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown prompt data format: {fmt}")
+    return f"({len(records)} records, {FORMAT_HINTS[fmt]})\n{FORMATS[fmt](records)}"
+
+
+def serialize_briefing(briefing: Optional[dict], fmt: Optional[str] = None) -> str:
+    """Serialize a BriefingResponse-shaped dict (summary plus items)."""
+    if not briefing:
+        return "(no briefing)"
+    summary = briefing.get("summary", "")
+    return f"Summary: {summary}\nItems: {serialize_records(briefing.get('items', []), fmt)}"
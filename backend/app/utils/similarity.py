@@ -0,0 +1,28 @@
+"""
+Lightweight text normalization and similarity for cache lookups.
+"""
+
+import re
+from typing import FrozenSet, Set
+
+_EDGE_PUNCTUATION = re.compile(r"^[\s\W_]+|[\s\W_]+$")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, collapse whitespace and drop leading/trailing punctuation."""
+    return _EDGE_PUNCTUATION.sub("", " ".join(text.lower().split()))
+
+
+def shingles(text: str, size: int = 3) -> FrozenSet[str]:
+    """Character n-grams of normalized text (the whole text if shorter than size)."""
+    text = normalize_text(text)
+    if len(text) <= size:
+        return frozenset([text])
+    return frozenset(text[i:i + size] for i in range(len(text) - size + 1))
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    """Jaccard similarity of two sets (1.0 for two empty sets)."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
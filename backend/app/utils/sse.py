@@ -0,0 +1,11 @@
+"""
+Server-Sent Events formatting.
+"""
+
+import json
+from typing import Any
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Format one SSE frame with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
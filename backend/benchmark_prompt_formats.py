@@ -0,0 +1,59 @@
+"""
+Token-count benchmark for prompt dataset encodings.
+
+Serializes every test_data/scenario_*.json file in each prompt format and
+prints estimated input tokens, plus the saving relative to pretty JSON.
+
+Usage:
+    python benchmark_prompt_formats.py [--scale N]
+
+--scale repeats each scenario N times (with unique IDs) to approximate
+large production feeds.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.utils.prompt_format import FORMATS, estimate_tokens, serialize_records
+from test_data.loader import list_scenarios, load_test_scenario
+
+
+def scale_scenario(data, factor):
+    """Repeat a scenario with unique ticket IDs per copy."""
+    if factor <= 1:
+        return data
+    return [
+        {**ticket, "id": f"{ticket.get('id')}-{copy}"}
+        for copy in range(factor)
+        for ticket in data
+    ]
+
+
+def run_benchmark(scale: int = 1):
+    formats = list(FORMATS)
+    header = f"{'scenario':<12}{'tickets':>8}" + "".join(f"{fmt:>12}" for fmt in formats)
+    print(header)
+    print("-" * len(header))
+
+    totals = {fmt: 0 for fmt in formats}
+    for scenario in sorted(list_scenarios()):
+        data = scale_scenario(load_test_scenario(scenario), scale)
+        counts = {fmt: estimate_tokens(serialize_records(data, fmt)) for fmt in formats}
+        for fmt, count in counts.items():
+            totals[fmt] += count
+        print(f"{scenario:<12}{len(data):>8}" + "".join(f"{counts[fmt]:>12}" for fmt in formats))
+
+    print("-" * len(header))
+    print(f"{'total':<20}" + "".join(f"{totals[fmt]:>12}" for fmt in formats))
+    baseline = totals["json"] or 1
+    print(f"{'vs json':<20}" + "".join(f"{totals[fmt] / baseline:>11.0%} " for fmt in formats))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", type=int, default=1, help="Repeat each scenario N times")
+    args = parser.parse_args()
+    run_benchmark(args.scale)
@@ -0,0 +1,86 @@
+"""
+Shared fixtures for agent tests.
+
+Every test starts with the ASK mode shortcuts off (fast-path router, answer
+cache, speculative retrieval) and no chat sessions, so a question meant for
+the agent is never answered by a shortcut. Tests of a shortcut turn it back
+on with monkeypatch.setattr(<singleton>, "enabled", True).
+"""
+
+import importlib
+
+import pytest
+
+from app.agents.action_agent import action_agent
+from app.agents.chat_agent import chat_agent
+from app.services.agent_pool import AgentPool
+from app.services.answer_cache import answer_cache
+from app.services.chat_sessions import chat_sessions
+from app.services.intent_router import intent_router
+from app.services.speculative_retrieval import speculative_retriever
+
+# app.agents re-exports the instances under the modules' names
+chat_agent_module = importlib.import_module("app.agents.chat_agent")
+action_agent_module = importlib.import_module("app.agents.action_agent")
+
+
+@pytest.fixture(autouse=True)
+def agent_shortcuts_off(monkeypatch):
+    for shortcut in (intent_router, answer_cache, speculative_retriever):
+        monkeypatch.setattr(shortcut, "enabled", False)
+    answer_cache.clear()
+    chat_sessions.clear()
+    yield
+    answer_cache.clear()
+    chat_sessions.clear()
+
+
+@pytest.fixture
+def fake_agent(monkeypatch):
+    """
+    Install a fake in place of the Strands Agent class of a mode.
+
+    Returns install(agent_class, mode="chat", **pool_options), which gives
+    every model cascade tier of the mode a fresh pool building agent_class,
+    so no agent built by an earlier test is reused.
+    """
+    def install(agent_class, mode: str = "chat", **pool_options):
+        if mode == "chat":
+            monkeypatch.setattr(chat_agent_module, "Agent", agent_class)
+            monkeypatch.setattr(chat_agent, "pool", AgentPool(
+                "chat", lambda: chat_agent._new_agent(chat_agent.cascade.models["fast"]), **pool_options
+            ))
+            monkeypatch.setattr(chat_agent, "strong_pool", AgentPool(
+                "chat-strong", lambda: chat_agent._new_agent(chat_agent.cascade.models["strong"]), **pool_options
+            ))
+        else:
+            monkeypatch.setattr(action_agent_module, "Agent", agent_class)
+            monkeypatch.setattr(action_agent, "pool", AgentPool(
+                "action", lambda: action_agent._new_agent(action_agent.cascade.models["strong"]), **pool_options
+            ))
+            monkeypatch.setattr(action_agent, "fast_pool", AgentPool(
+                "action-fast", lambda: action_agent._new_agent(action_agent.cascade.models["fast"]), **pool_options
+            ))
+        return agent_class
+
+    return install
+
+
+class CountingAgent:
+    """Counts model calls and answers "answer <n>"."""
+
+    calls = 0
+
+    def __init__(self, *args, **kwargs):
+        self.messages = []
+
+    def __call__(self, prompt, **kwargs):
+        CountingAgent.calls += 1
+        return f"answer {CountingAgent.calls}"
+
+
+@pytest.fixture
+def counting_agent(fake_agent):
+    """CountingAgent installed as the chat model, with its count reset."""
+    CountingAgent.calls = 0
+    return fake_agent(CountingAgent)
@@ -0,0 +1,79 @@
+"""
+Unit tests for the bounded agent executor.
+"""
+
+import asyncio
+import contextvars
+import time
+import pytest
+
+from app.agents.chat_agent import chat_agent
+from app.services.agent_executor import AgentExecutor, AgentQueueFullError
+
+AGENT_LATENCY = 0.3
+
+
+class SlowAgent:
+    """Blocks like a real Bedrock call."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __call__(self, prompt, **kwargs):
+        time.sleep(AGENT_LATENCY)
+        return "ok"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_chats_take_max_not_sum_of_latencies(fake_agent):
+    """N concurrent chats finish in roughly one agent latency."""
+    fake_agent(SlowAgent)
+    concurrency = 5
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        chat_agent.chat(message=f"question {i}", history=[], context={"data": []})
+        for i in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+
+    assert all(result["response"] == "ok" for result in results)
+    assert elapsed < AGENT_LATENCY * concurrency / 2
+
+
+@pytest.mark.asyncio
+async def test_event_loop_stays_responsive_during_agent_call():
+    """Other coroutines keep running while an agent call blocks."""
+    executor = AgentExecutor(max_workers=1, max_queue=0)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        for _ in range(5):
+            await asyncio.sleep(0.02)
+            ticks += 1
+
+    await asyncio.gather(executor.run(time.sleep, 0.2), ticker())
+    assert ticks == 5
+
+
+@pytest.mark.asyncio
+async def test_queue_limit_rejects_excess_calls():
+    """Calls beyond workers + queue are rejected immediately."""
+    executor = AgentExecutor(max_workers=1, max_queue=1)
+    running = [asyncio.ensure_future(executor.run(time.sleep, 0.1)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(AgentQueueFullError):
+        await executor.run(time.sleep, 0.1)
+    await asyncio.gather(*running)
+    assert executor.stats()["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_context_variables_reach_worker_thread():
+    """Request-scoped context variables are visible inside the worker."""
+    request_id = contextvars.ContextVar("request_id")
+    request_id.set("req-42")
+
+    assert await AgentExecutor(max_workers=1).run(request_id.get) == "req-42"
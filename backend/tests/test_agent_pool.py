@@ -0,0 +1,99 @@
+"""
+Unit tests for the per-mode agent pool.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.agents.action_agent import action_agent
+from app.agents.chat_agent import chat_agent
+from app.main import app
+from app.services.agent_pool import AgentPool, AgentPoolExhaustedError
+
+
+class FakeAgent:
+    """Records prompts in its conversation like a real Strands agent."""
+
+    instances = 0
+
+    def __init__(self, *args, **kwargs):
+        FakeAgent.instances += 1
+        self.messages = []
+        self.seen_history = []
+
+    def __call__(self, prompt, **kwargs):
+        self.seen_history.append(len(self.messages))
+        self.messages.append({"role": "user", "content": [{"text": prompt}]})
+        time.sleep(0.05)
+        return "ok"
+
+
+def test_checkin_resets_conversation_and_reuses_agent():
+    """The same agent is handed out again with an empty conversation."""
+    pool = AgentPool("test", FakeAgent, max_size=2)
+
+    with pool.lease() as first:
+        first("hello")
+    with pool.lease() as second:
+        second("again")
+
+    assert first is second
+    assert second.seen_history == [0, 0]
+    stats = pool.stats()
+    assert (stats["created"], stats["checkouts"], stats["reuses"]) == (1, 2, 1)
+    assert stats["in_use"] == 0
+
+
+def test_pool_is_bounded_and_waits_for_checkin():
+    """Checkout blocks while the pool is full, then times out."""
+    pool = AgentPool("test", FakeAgent, max_size=1, checkout_timeout_seconds=0.05)
+    held = pool.checkout()
+
+    with pytest.raises(AgentPoolExhaustedError):
+        pool.checkout()
+
+    pool.checkout_timeout_seconds = 2
+    threading.Timer(0.05, pool.checkin, args=(held,)).start()
+    assert pool.checkout() is held
+    assert pool.stats()["waits"] == 1
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_failed_run_returns_clean_agent():
+    """An exception inside the lease still resets and returns the agent."""
+    pool = AgentPool("test", FakeAgent, max_size=1)
+
+    with pytest.raises(RuntimeError):
+        with pool.lease() as agent:
+            agent.messages.append({"role": "user", "content": []})
+            raise RuntimeError("throttled")
+
+    assert pool.checkout().messages == []
+
+
+@pytest.mark.asyncio
+async def test_concurrent_chats_share_pooled_agents(fake_agent):
+    """Concurrent requests build at most max_size agents, then reuse them."""
+    fake_agent(FakeAgent, max_size=3)
+    FakeAgent.instances = 0
+
+    for _ in range(3):
+        await asyncio.gather(*(
+            chat_agent.chat(message=f"q{i}", history=[], context={"data": []})
+            for i in range(6)
+        ))
+
+    stats = chat_agent.pool.stats()
+    assert FakeAgent.instances == stats["created"] <= 3
+    assert stats["checkouts"] == 18
+    assert stats["reuses"] == 18 - stats["created"]
+
+
+def test_health_reports_pool_metrics():
+    pools = TestClient(app).get("/api/v1/health").json()["agent_pools"]
+    assert set(pools) == {"chat", "action"}
+    assert pools["action"]["max_size"] == action_agent.pool.max_size
@@ -0,0 +1,108 @@
+"""
+Unit tests for the ASK mode semantic answer cache.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.agents.chat_agent import chat_agent
+from app.main import app
+from app.services.answer_cache import AnswerCache, answer_cache
+from app.services.chat_sessions import chat_sessions
+from test_data.loader import load_test_scenario
+
+NOW = datetime(2026, 1, 24, 9, 0, tzinfo=timezone.utc)
+CITATIONS = [{"score": 0.9, "documentId": "doc-1", "sourceUri": "s3://kb/sla.md"}]
+
+
+@pytest.fixture
+def fake_model(counting_agent, monkeypatch):
+    monkeypatch.setattr(answer_cache, "enabled", True)
+    return counting_agent
+
+
+def _cache_with(question, scope="s"):
+    cache = AnswerCache()
+    cache.set(scope, question, {"response": "stored", "citations": CITATIONS})
+    return cache
+
+
+def test_rephrased_question_hits():
+    cache = _cache_with("Which tickets are critical?")
+
+    assert cache.get("s", "what tickets are critical") == {"response": "stored", "citations": CITATIONS}
+    assert cache.get("s", "show me all the critical tickets right now")["citations"] == CITATIONS
+    assert cache.stats()["similar_hits"] == 2
+
+
+@pytest.mark.parametrize("question", [
+    "status of TKT-105",        # different ticket
+    "which tickets are high priority",
+    "top 10 tickets",           # different number (stored: top 5)
+])
+def test_different_questions_miss(question):
+    cache = _cache_with("status of TKT-101")
+    cache.set("s", "top 5 tickets", {"response": "stored", "citations": None})
+
+    assert cache.get("s", question) is None
+
+
+def test_negation_and_question_word_must_match():
+    cache = _cache_with("which tickets are critical")
+    cache.set("s", "why was TKT-101 closed", {"response": "stored", "citations": None})
+
+    assert cache.get("s", "which tickets are not critical") is None
+    assert cache.get("s", "when was TKT-101 closed") is None
+
+
+def test_scope_covers_dataset_briefing_date_and_history():
+    data = load_test_scenario("chaotic")
+    base = AnswerCache.scope("hash-a", None, NOW, [])
+
+    assert AnswerCache.scope("hash-b", None, NOW, []) != base
+    assert AnswerCache.scope("hash-a", {"summary": "x"}, NOW, []) != base
+    assert AnswerCache.scope("hash-a", None, NOW.replace(day=25), []) != base
+    assert AnswerCache.scope("hash-a", None, NOW, [{"role": "user", "content": data[0]["id"]}]) != base
+
+
+@pytest.mark.asyncio
+async def test_repeated_question_skips_the_model(fake_model):
+    context = {"data": load_test_scenario("chaotic")}
+
+    first = await chat_agent.chat("Which tickets are critical?", [], context)
+    second = await chat_agent.chat("what tickets are critical", [], context)
+
+    assert fake_model.calls == 1
+    assert second == first
+
+
+@pytest.mark.asyncio
+async def test_changed_dataset_is_not_served_stale_answers(fake_model):
+    data = load_test_scenario("chaotic")
+
+    await chat_agent.chat("Which tickets are critical?", [], {"data": data})
+    await chat_agent.chat("Which tickets are critical?", [], {"data": data[1:]})
+
+    assert fake_model.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_answer_is_recorded_in_session(fake_model):
+    context = {"data": load_test_scenario("chaotic")}
+    await chat_agent.chat("Which tickets are critical?", [], context)
+
+    session = chat_sessions.get_or_create("cached")
+    result = await chat_agent.chat("which tickets are critical", [], context, session=session)
+
+    assert fake_model.calls == 1
+    assert session.turns == 1
+    assert session.recent[-1] == {"role": "model", "content": result["response"]}
+
+
+def test_answer_cache_stats_endpoint():
+    response = TestClient(app).get("/api/v1/chat/answer-cache/stats")
+
+    assert response.status_code == 200
+    assert {"enabled", "scopes", "hits", "misses", "similar_hits", "hit_rate"} <= set(response.json())
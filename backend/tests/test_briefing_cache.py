@@ -0,0 +1,96 @@
+"""
+Unit tests for the TTL/LRU caches and the briefing result cache.
+"""
+
+from fastapi.testclient import TestClient
+
+from app.agents.briefing_agent import briefing_agent
+from app.main import app
+from app.services.briefing_cache import briefing_cache
+from app.utils.cache import MemoryCache, SQLiteCache
+from app.utils.hashing import dataset_hash
+from test_data.loader import load_test_scenario
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_memory_cache_lru_eviction():
+    """Least recently used entry is evicted first."""
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats.evictions == 1
+
+
+def test_memory_cache_ttl_expiry():
+    """Entries expire after the TTL and count as misses."""
+    clock = FakeClock()
+    cache = MemoryCache(max_entries=10, ttl_seconds=60, clock=clock)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    clock.now += 61
+    assert cache.get("a") is None
+    assert cache.stats.to_dict()["expirations"] == 1
+    assert cache.stats.hit_rate == 0.5
+
+
+def test_sqlite_cache_persists_and_evicts(tmp_path):
+    """SQLite backend survives reopen and applies LRU eviction."""
+    path = str(tmp_path / "cache.sqlite3")
+    clock = FakeClock()
+    cache = SQLiteCache(path, max_entries=2, clock=clock)
+    cache.set("a", {"summary": "x"})
+    clock.now += 1
+    cache.set("b", {"summary": "y"})
+    clock.now += 1
+    cache.get("a")
+    clock.now += 1
+    cache.set("c", {"summary": "z"})
+
+    reopened = SQLiteCache(path, max_entries=2, clock=clock)
+    assert reopened.get("a") == {"summary": "x"}
+    assert reopened.get("b") is None
+    assert len(reopened) == 2
+
+
+def test_dataset_hash_is_order_independent():
+    """Same tickets in a different order hash identically."""
+    data = load_test_scenario("chaotic")
+    shuffled = [dict(reversed(list(t.items()))) for t in reversed(data)]
+
+    assert dataset_hash(data) == dataset_hash(shuffled)
+    assert dataset_hash(data) != dataset_hash(data[1:])
+
+
+def test_briefing_endpoint_serves_repeat_requests_from_cache(monkeypatch):
+    """Second identical POST does not call the model."""
+    calls = []
+
+    def fake_agent(prompt, **kwargs):
+        calls.append(prompt)
+        return '{"summary": "All good.", "insights": []}'
+
+    monkeypatch.setattr(briefing_agent, "_new_agent", lambda: fake_agent)
+    briefing_cache.backend.clear()
+    briefing_agent.snapshots.clear()
+    client = TestClient(app)
+    payload = {"data": load_test_scenario("chaotic")}
+
+    first = client.post("/api/v1/briefing", json=payload).json()
+    second = client.post("/api/v1/briefing", json={"data": list(reversed(payload["data"]))}).json()
+
+    assert len(calls) == 1
+    assert first == second
+    assert client.get("/api/v1/briefing/cache/stats").json()["hits"] >= 1
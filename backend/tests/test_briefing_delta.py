@@ -0,0 +1,117 @@
+"""
+Unit tests for incremental (delta) briefing recomputation.
+"""
+
+import copy
+import json
+import pytest
+
+from app.agents.briefing_agent import briefing_agent
+from app.models.briefing import BriefingItem
+from app.services.briefing_delta import changed_ticket_ids, fingerprint_tickets, unaffected
+from test_data.loader import load_test_scenario
+
+
+class RecordingAgent:
+    """Stands in for the Strands agent and records prompts."""
+
+    def __init__(self):
+        self.prompts = []
+
+    def __call__(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return json.dumps({
+            "summary": f"Briefing {len(self.prompts)}",
+            "insights": [{
+                "id": f"insight-{len(self.prompts)}",
+                "type": "INSIGHT",
+                "title": "Acme at risk",
+                "description": "Acme has an overdue critical ticket.",
+                "severity": "HIGH",
+                "relatedTicketIds": ["TKT-99"]
+            }]
+        })
+
+
+@pytest.fixture
+def recording_agent(monkeypatch):
+    agent = RecordingAgent()
+    monkeypatch.setattr(briefing_agent, "_new_agent", lambda: agent)
+    briefing_agent.snapshots.clear()
+    yield agent
+    briefing_agent.snapshots.clear()
+
+
+def test_changed_ticket_ids_detects_add_remove_modify():
+    """Diff reports added, removed and modified ticket IDs only."""
+    data = load_test_scenario("chaotic")
+    modified = copy.deepcopy(data)
+    modified[0]["status"] = "Closed"  # TKT-99
+    modified = [t for t in modified if t["id"] != "TKT-105"]
+    modified.append({**data[0], "id": "TKT-200"})
+
+    changed = changed_ticket_ids(fingerprint_tickets(data), fingerprint_tickets(modified))
+    assert changed == {"TKT-99", "TKT-105", "TKT-200"}
+
+
+@pytest.mark.asyncio
+async def test_unchanged_snapshot_skips_model(recording_agent):
+    """Reposting an identical dataset reuses the stored briefing."""
+    data = load_test_scenario("chaotic")
+    first = await briefing_agent.analyze_data(data, dataset_id="ops")
+    second = await briefing_agent.analyze_data(list(reversed(data)), dataset_id="ops")
+
+    assert len(recording_agent.prompts) == 1
+    assert first == second
+
+
+@pytest.mark.asyncio
+async def test_delta_rederives_only_touched_items(recording_agent):
+    """Closing TKT-99 drops its breach and insight; other items are kept."""
+    data = load_test_scenario("chaotic")
+    first = await briefing_agent.analyze_data(data, dataset_id="ops")
+    first_ids = {item["id"] for item in first["items"]}
+    assert {"sla-TKT-99", "insight-1", "conflict-TKT-101"} <= first_ids
+
+    updated = copy.deepcopy(data)
+    updated[0]["status"] = "Resolved"
+    second = await briefing_agent.analyze_data(updated, dataset_id="ops")
+    second_ids = {item["id"] for item in second["items"]}
+
+    assert "sla-TKT-99" not in second_ids
+    assert "insight-1" not in second_ids
+    assert "conflict-TKT-101" in second_ids
+    assert 'CHANGED TICKET IDS SINCE LAST BRIEFING:\n["TKT-99"]' in recording_agent.prompts[-1]
+
+
+@pytest.mark.asyncio
+async def test_datasets_are_tracked_separately(recording_agent):
+    """Snapshots are per dataset ID."""
+    data = load_test_scenario("chaotic")
+    await briefing_agent.analyze_data(data, dataset_id="a")
+    await briefing_agent.analyze_data(data, dataset_id="b")
+
+    assert len(recording_agent.prompts) == 2
+    assert "CHANGED TICKET IDS" not in recording_agent.prompts[1]
+
+
+@pytest.mark.asyncio
+async def test_requests_without_dataset_id_never_reuse_a_snapshot(recording_agent):
+    """Anonymous requests get a full briefing; they could come from different clients."""
+    data = load_test_scenario("chaotic")
+    await briefing_agent.analyze_data(data)
+    await briefing_agent.analyze_data(data)
+
+    assert len(recording_agent.prompts) == 2
+    assert "CHANGED TICKET IDS" not in recording_agent.prompts[1]
+
+
+def test_dataset_wide_items_are_rederived_on_any_change():
+    """Items without related tickets are dropped once any ticket changed."""
+    wide = BriefingItem(id="i1", type="INSIGHT", title="Backlog growing", description="d",
+                        severity="MEDIUM", relatedTicketIds=[])
+    scoped = BriefingItem(id="i2", type="INSIGHT", title="Acme at risk", description="d",
+                          severity="HIGH", relatedTicketIds=["TKT-101"])
+
+    assert unaffected([wide, scoped], {"TKT-99"}) == [scoped]
+    assert unaffected([wide, scoped], set()) == [wide, scoped]
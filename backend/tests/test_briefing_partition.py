@@ -0,0 +1,112 @@
+"""
+Unit tests for map-reduce (partitioned) briefings.
+"""
+
+import json
+import threading
+import time
+import pytest
+
+from app.agents.briefing_agent import briefing_agent
+from app.config import settings
+from app.models.briefing import BriefingItem
+from app.services.briefing_partition import merge_items, partition_tickets
+from test_data.loader import load_test_scenario
+
+
+def _synthetic_tickets(count: int) -> list:
+    customers = ["Acme Corp", "Globex Inc", "Initech", "Umbrella"]
+    return [
+        {
+            "id": f"TKT-{i}",
+            "customer": customers[i % len(customers)],
+            "title": f"Ticket {i}",
+            "status": "Open",
+            "priority": "High",
+            "createdDate": "2026-01-01",
+            "dueDate": "2026-01-10",
+            "source": "Jira",
+            "assignee": "Unassigned",
+        }
+        for i in range(count)
+    ]
+
+
+def _item(item_id, severity="MEDIUM", related=("TKT-1",)):
+    return BriefingItem(
+        id=item_id, type="INSIGHT", title=item_id, description="d",
+        severity=severity, relatedTicketIds=list(related)
+    )
+
+
+def test_partition_keeps_duplicate_ids_together():
+    """Every record of a ticket ID lands in the same shard."""
+    data = load_test_scenario("extreme") + load_test_scenario("chaotic")
+    shards = partition_tickets(data, key="source", max_shard_size=3)
+
+    shard_of = {}
+    for index, shard in enumerate(shards):
+        for ticket in shard:
+            assert shard_of.setdefault(ticket["id"], index) == index
+    assert sum(len(shard) for shard in shards) == len(data)
+
+
+def test_partition_respects_shard_size():
+    """Shards stay within the size limit when no ID group exceeds it."""
+    shards = partition_tickets(_synthetic_tickets(50), key="customer", max_shard_size=10)
+    assert all(len(shard) <= 10 for shard in shards)
+    assert len(shards) == 5
+
+
+def test_merge_items_deduplicates_and_keeps_most_severe():
+    """Same type and related tickets collapse to the most severe copy."""
+    merged = merge_items([
+        [_item("a", "LOW")],
+        [_item("b", "CRITICAL"), _item("a", "HIGH", related=("TKT-2",))],
+    ])
+
+    assert len(merged) == 2
+    assert merged[0].severity == "CRITICAL"
+    assert len({item.id for item in merged}) == 2
+
+
+@pytest.mark.asyncio
+async def test_partitioned_briefing_bounds_concurrency(monkeypatch):
+    """Shards run concurrently but never above the configured limit."""
+    active = 0
+    reduce_prompts = []
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_agent(prompt, **kwargs):
+        nonlocal active, peak
+        if "partial briefings" in prompt:
+            reduce_prompts.append(prompt)
+            return '{"summary": "Overall: backlog growing."}'
+
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return json.dumps({"summary": "shard ok", "insights": [{
+            "id": "insight-1", "type": "INSIGHT", "title": "Backlog",
+            "description": "Unassigned backlog", "severity": "HIGH",
+            "relatedTicketIds": ["TKT-1"]
+        }]})
+
+    monkeypatch.setattr(settings, "briefing_partition_threshold", 20)
+    monkeypatch.setattr(settings, "briefing_shard_max_tickets", 10)
+    monkeypatch.setattr(settings, "briefing_max_concurrency", 2)
+    monkeypatch.setattr(briefing_agent, "_new_agent", lambda: fake_agent)
+    briefing_agent.snapshots.clear()
+
+    result = await briefing_agent.analyze_data(_synthetic_tickets(60), dataset_id="partitioned")
+    briefing_agent.snapshots.clear()
+
+    insights = [item for item in result["items"] if item["type"] == "INSIGHT"]
+    assert result["summary"] == "Overall: backlog growing."
+    assert peak == 2
+    assert len(insights) == 1
+    assert "6 partial briefings" in reduce_prompts[0]
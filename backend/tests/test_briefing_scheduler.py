@@ -0,0 +1,119 @@
+"""
+Unit tests for the Night Watchman background briefing scheduler.
+"""
+
+import asyncio
+import copy
+import pytest
+from fastapi.testclient import TestClient
+
+from app.agents.briefing_agent import briefing_agent
+from app.main import app
+from app.services.briefing_scheduler import BriefingScheduler, briefing_scheduler
+from test_data.loader import load_test_scenario
+
+
+def fake_agent(prompt, **kwargs):
+    return '{"summary": "Overnight: all systems watched.", "insights": []}'
+
+
+@pytest.fixture(autouse=True)
+def offline_model(monkeypatch):
+    monkeypatch.setattr(briefing_agent, "_new_agent", lambda: fake_agent)
+    briefing_agent.snapshots.clear()
+    yield
+    briefing_agent.snapshots.clear()
+
+
+@pytest.mark.asyncio
+async def test_run_once_versions_only_changed_briefings():
+    """Version increments when the dataset changes, not on every run."""
+    data = load_test_scenario("chaotic")
+    scheduler = BriefingScheduler()
+    scheduler.register_source("night", lambda: data)
+
+    assert await scheduler.run_once() == 1
+    first = scheduler.latest("night")
+    assert first.version == 1
+
+    await scheduler.run_once()
+    assert scheduler.latest("night").version == 1
+    assert scheduler.latest("night").checked_at >= first.generated_at
+
+    data = copy.deepcopy(data)
+    data[0]["status"] = "Closed"
+    await scheduler.run_once()
+    assert scheduler.latest("night").version == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_model_keeps_previous_briefing(monkeypatch):
+    """A fallback result is not stored over a good briefing."""
+    scheduler = BriefingScheduler()
+    data = load_test_scenario("chaotic")
+    scheduler.register_source("night", lambda: data)
+    await scheduler.run_once()
+
+    def failing_agent(prompt, **kwargs):
+        raise RuntimeError("Bedrock unavailable")
+
+    monkeypatch.setattr(briefing_agent, "_new_agent", lambda: failing_agent)
+    briefing_agent.snapshots.clear()
+    assert await scheduler.run_once() == 0
+    assert scheduler.latest("night").briefing["summary"] == "Overnight: all systems watched."
+
+
+@pytest.mark.asyncio
+async def test_background_loop_runs_and_stops():
+    """start() briefs on the interval; stop() cancels the task."""
+    scheduler = BriefingScheduler(interval_seconds=0.01)
+    scheduler.register_source("loop", lambda: load_test_scenario("healthy"))
+
+    scheduler.start()
+    await asyncio.sleep(0.1)
+    await scheduler.stop()
+
+    assert scheduler.latest("loop") is not None
+    assert scheduler._task is None
+
+
+def test_latest_endpoint_serves_stored_briefing():
+    """GET /briefing/latest returns 404 until a briefing exists."""
+    client = TestClient(app)
+    assert client.get("/api/v1/briefing/latest", params={"datasetId": "unknown"}).status_code == 404
+
+    data = load_test_scenario("healthy")
+    briefing_scheduler.record("morning", data, {"summary": "Quiet night.", "items": []})
+    body = client.get("/api/v1/briefing/latest", params={"datasetId": "morning"}).json()
+
+    assert body["summary"] == "Quiet night."
+    assert body["version"] == 1
+    assert body["generatedAt"]
+
+
+def test_inline_briefings_are_stored_but_not_watched(monkeypatch):
+    """Inline data can never change, so the scheduler does not re-brief it."""
+    monkeypatch.setattr(briefing_scheduler, "_sources", {})
+    data = copy.deepcopy(load_test_scenario("healthy"))
+    data[0]["notes"] = "inline-only"
+
+    response = TestClient(app).post("/api/v1/briefing", json={"data": data, "datasetId": "inline"})
+
+    assert response.status_code == 200
+    assert briefing_scheduler.latest("inline") is not None
+    assert briefing_scheduler._sources == {}
+
+
+def test_latest_briefings_are_bounded_and_unwatched_default_is_not_overwritten():
+    scheduler = BriefingScheduler(max_datasets=2)
+    data = load_test_scenario("healthy")
+    briefing = {"summary": "Quiet night.", "items": []}
+    for dataset_id in ("a", "b", "c"):
+        scheduler.record(dataset_id, data, briefing)
+
+    assert scheduler.latest("a") is None and scheduler.latest("c") is not None
+    assert scheduler.record(None, data, briefing) is None
+
+    scheduler.register_source("default", lambda: data)
+    assert scheduler.record(None, load_test_scenario("chaotic"), briefing) is None
+    assert scheduler.record(None, data, briefing).dataset_id == "default"
@@ -0,0 +1,75 @@
+"""
+Unit tests for the streaming briefing endpoint and incremental JSON parser.
+"""
+
+import json
+
+from fastapi.testclient import TestClient
+
+from app.agents.briefing_agent import briefing_agent
+from app.main import app
+from app.services.briefing_cache import briefing_cache
+from app.utils.json_stream import JsonItemStream
+from test_data.loader import load_test_scenario
+
+MODEL_OUTPUT = json.dumps({
+    "summary": "Two systems disagree on {TKT-101}.",
+    "insights": [
+        {"id": "i1", "type": "INSIGHT", "title": "Sync gap", "description": "Brace } in text",
+         "severity": "HIGH", "relatedTicketIds": ["TKT-101"]},
+        {"id": "i2", "type": "INSIGHT", "title": "Backlog", "description": "Unassigned",
+         "severity": "MEDIUM", "relatedTicketIds": ["TKT-99"]},
+    ]
+})
+
+
+class StreamingFakeAgent:
+    """Streams MODEL_OUTPUT in small chunks like Strands stream_async."""
+
+    async def stream_async(self, prompt):
+        for start in range(0, len(MODEL_OUTPUT), 7):
+            yield {"data": MODEL_OUTPUT[start:start + 7]}
+        yield {"result": "done"}
+
+
+def _parse_sse(body: str):
+    events = []
+    for frame in body.strip().split("\n\n"):
+        lines = frame.split("\n")
+        events.append((lines[0][len("event: "):], json.loads(lines[1][len("data: "):])))
+    return events
+
+
+def test_json_item_stream_yields_items_as_they_complete():
+    """Each array element is returned by the chunk that closes it."""
+    parser = JsonItemStream(array_key="insights")
+    completed = []
+    for char in MODEL_OUTPUT:
+        completed.extend((len(parser.text), item["id"]) for item in parser.feed(char))
+
+    assert [item_id for _, item_id in completed] == ["i1", "i2"]
+    assert completed[0][0] < len(MODEL_OUTPUT) - 100
+    assert json.loads(parser.text)["summary"] == "Two systems disagree on {TKT-101}."
+
+
+def test_briefing_stream_emits_findings_insights_summary_done(monkeypatch):
+    """Findings come first, then streamed insights, summary and done."""
+    monkeypatch.setattr(briefing_agent, "_new_agent", lambda: StreamingFakeAgent())
+    briefing_cache.backend.clear()
+    briefing_agent.snapshots.clear()
+    client = TestClient(app)
+
+    response = client.post("/api/v1/briefing/stream", json={"data": load_test_scenario("chaotic")})
+    events = _parse_sse(response.text)
+    names = [name for name, _ in events]
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert names[-2:] == ["summary", "done"]
+    assert events[0][1]["type"] in ("SLA_BREACH", "DATA_CONFLICT")
+    assert [data["id"] for name, data in events if name == "item"][-2:] == ["i1", "i2"]
+    assert events[-1][1] == {"itemCount": names.count("item"), "cached": False}
+
+    # The completed stream is cached for both endpoints
+    again = _parse_sse(client.post("/api/v1/briefing/stream", json={"data": load_test_scenario("chaotic")}).text)
+    assert again[-1][1]["cached"] is True
+    briefing_agent.snapshots.clear()
@@ -0,0 +1,106 @@
+"""
+Unit tests for token-budgeted ASK mode history compaction.
+"""
+
+import importlib
+
+import pytest
+
+from app.agents.chat_agent import chat_agent
+from app.services.chat_history import HistoryManager, RunningSummary, format_history
+from app.services.chat_sessions import chat_sessions
+from app.utils.prompt_format import estimate_tokens
+
+chat_agent_module = importlib.import_module("app.agents.chat_agent")
+
+TURNS = 250
+
+
+def make_history(turns):
+    history = []
+    for i in range(turns):
+        history.append({"role": "user", "content": f"What is the status of TKT-{i} for customer {i % 7}?"})
+        history.append({
+            "role": "model",
+            "content": f"TKT-{i} is In Progress and assigned to Agent {i % 5}. "
+                       "It is due tomorrow, so keep an eye on it and escalate if it slips.",
+        })
+    return history
+
+
+def test_short_history_is_rendered_verbatim():
+    manager = HistoryManager(token_budget=1500, keep_turns=4)
+    history = make_history(3)
+    assert manager.render(history) == format_history(history)
+
+
+def test_split_keeps_last_user_turns_verbatim():
+    manager = HistoryManager(keep_turns=2)
+    older, recent = manager.split(make_history(5))
+    assert len(older) == 6 and len(recent) == 4
+    assert recent[0]["content"].startswith("What is the status of TKT-3")
+
+
+def test_stateless_prompt_stays_bounded_and_summary_is_incremental(monkeypatch):
+    """Resending a growing history never exceeds the budget, and each message is summarized once."""
+    folded = []
+    original = RunningSummary.folded_with
+
+    def counting(self, messages, max_tokens):
+        folded.append(len(messages))
+        return original(self, messages, max_tokens)
+
+    monkeypatch.setattr(RunningSummary, "folded_with", counting)
+    manager = HistoryManager(token_budget=800, keep_turns=3)
+    history = make_history(TURNS)
+
+    sizes = [estimate_tokens(manager.render(history[:2 * turn])) for turn in range(1, TURNS + 1)]
+
+    assert max(sizes) <= 800
+    assert max(sizes[-50:]) - min(sizes[-50:]) < 200
+    # Linear, not quadratic: every rolled-off message folded exactly once
+    assert sum(folded) == 2 * (TURNS - 3)
+
+    rendered = manager.render(history)
+    assert "TKT-249" in rendered and f"TKT-{TURNS - 10}" in rendered
+    assert "summary of" in rendered
+
+
+def test_oversized_single_message_is_clipped():
+    manager = HistoryManager(token_budget=300, keep_turns=2)
+    history = [{"role": "user", "content": "word " * 5000}]
+    assert estimate_tokens(manager.render(history)) < 400
+
+
+class EchoAgent:
+    """Conversation-keeping fake agent that records the input size per turn."""
+
+    inputs = []
+
+    def __init__(self, *args, **kwargs):
+        self.messages = []
+
+    def __call__(self, prompt, **kwargs):
+        self.messages.append({"role": "user", "content": [{"text": prompt}]})
+        EchoAgent.inputs.append(sum(estimate_tokens(m["content"][0]["text"]) for m in self.messages))
+        reply = "TKT-1 is overdue by 3 days; escalate to the on-call lead."
+        self.messages.append({"role": "assistant", "content": [{"text": reply}]})
+        return reply
+
+
+@pytest.mark.asyncio
+async def test_session_input_stays_bounded_over_many_turns(fake_agent, monkeypatch):
+    """A 220-turn session compacts its message list instead of growing forever."""
+    fake_agent(EchoAgent)
+    monkeypatch.setattr(chat_agent_module, "history_manager", HistoryManager(token_budget=600, keep_turns=3))
+    EchoAgent.inputs = []
+    session = chat_sessions.get_or_create("long")
+    context = {"data": [{"id": "TKT-1", "status": "Open", "dueDate": "2026-01-01"}]}
+
+    for turn in range(220):
+        await chat_agent.chat(f"Question {turn} about TKT-{turn}?", [], context, session=session)
+
+    assert session.turns == 220
+    assert max(EchoAgent.inputs[-100:]) <= max(EchoAgent.inputs[:100]) * 1.5
+    assert len(session.recent) < 40
+    assert session.summary.folded > 300
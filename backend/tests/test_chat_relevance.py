@@ -0,0 +1,126 @@
+"""
+Unit tests for relevance-based ticket and briefing selection in ASK mode prompts.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.agents.chat_agent import chat_agent
+from app.services.chat_relevance import select_briefing_items
+from app.services.chat_sessions import chat_sessions
+from app.services.ticket_store import TicketStore
+from app.services.time_context import annotate_tickets
+from app.utils.prompt_format import estimate_tokens
+from test_data.loader import load_test_scenario
+
+NOW = datetime(2026, 1, 24, 9, 0, tzinfo=timezone.utc)
+
+
+class PromptRecorder:
+    """Records prompts in place of a Strands agent."""
+
+    prompts = []
+
+    def __init__(self, *args, **kwargs):
+        self.messages = []
+
+    def __call__(self, prompt, **kwargs):
+        PromptRecorder.prompts.append(prompt)
+        self.messages.append({"role": "user", "content": [{"text": prompt}]})
+        self.messages.append({"role": "assistant", "content": [{"text": "ok"}]})
+        return "ok"
+
+
+@pytest.fixture
+def recorder(fake_agent):
+    fake_agent(PromptRecorder)
+    PromptRecorder.prompts = []
+    return PromptRecorder.prompts
+
+
+def _store():
+    return TicketStore(annotate_tickets(load_test_scenario("chaotic"), NOW))
+
+
+def _ids(tickets):
+    return [t["id"] for t in tickets]
+
+
+def _synthetic(count):
+    customers = ["Acme Corp", "Globex Inc", "Initech", "Umbrella", "Hooli"]
+    titles = ["Printer jam", "VPN down", "Disk full", "Login failure", "Slow network"]
+    return [
+        {
+            "id": f"TKT-{n}",
+            "customer": customers[n % 5],
+            "title": f"{titles[n % 5]} #{n}",
+            "status": "Closed" if n % 3 == 0 else "Open",
+            "priority": ["Low", "Medium", "High", "Critical"][n % 4],
+            "dueDate": f"2026-01-{n % 28 + 1:02d}",
+            "source": "Jira",
+            "assignee": f"Agent {n % 40}",
+        }
+        for n in range(count)
+    ]
+
+
+def test_search_puts_mentioned_ids_first():
+    tickets, matched = _store().search("what happened with tkt-112 and the outage?", limit=3)
+
+    assert matched
+    assert tickets[0]["id"] == "TKT-112"
+    assert "TKT-99" in _ids(tickets)
+
+
+def test_search_ranks_text_and_keyword_matches():
+    store = _store()
+
+    tickets, _ = store.search("Anything for Globex?", limit=5)
+    assert set(_ids(tickets)) == {"TKT-101"}
+
+    tickets, _ = store.search("critical overdue tickets", limit=2)
+    assert _ids(tickets) == ["TKT-99", "TKT-108"]
+
+
+def test_search_falls_back_to_most_urgent_open_tickets():
+    tickets, matched = _store().search("hello there", limit=2)
+
+    assert not matched
+    assert _ids(tickets) == ["TKT-99", "TKT-108"]
+
+
+def test_briefing_items_follow_selected_tickets():
+    items = [
+        {"id": "1", "title": "Printer errors", "description": "", "severity": "LOW", "relatedTicketIds": ["TKT-112"]},
+        {"id": "2", "title": "Outage", "description": "", "severity": "CRITICAL", "relatedTicketIds": ["TKT-99"]},
+        {"id": "3", "title": "Latency", "description": "", "severity": "HIGH", "relatedTicketIds": ["TKT-108"]},
+    ]
+
+    assert [i["id"] for i in select_briefing_items(items, "printer?", {"TKT-112"}, 1)] == ["1"]
+    assert [i["id"] for i in select_briefing_items(items, "hi", set(), 2)] == ["2", "3"]
+
+
+@pytest.mark.asyncio
+async def test_prompt_size_does_not_grow_with_dataset(recorder):
+    """A 100-ticket and a 10,000-ticket dataset produce prompts of similar size."""
+    for count in (100, 10_000):
+        await chat_agent.chat("Which Acme Corp tickets are critical?", [], {"data": _synthetic(count)})
+
+    small, large = (estimate_tokens(p) for p in recorder)
+    assert large < small * 1.5
+    assert "RELEVANT TICKETS (15 of 10000" in recorder[1]
+
+
+@pytest.mark.asyncio
+async def test_session_turn_carries_only_the_tickets_it_mentions(recorder):
+    context = {"data": load_test_scenario("chaotic")}
+    session = chat_sessions.get_or_create("relevance")
+
+    await chat_agent.chat("Summarize the day", [], context, session=session)
+    await chat_agent.chat("Who owns TKT-105?", [], context, session=session)
+    await chat_agent.chat("Thanks", [], context, session=session)
+
+    assert recorder[1].startswith("RELEVANT TICKETS") and "TKT-105" in recorder[1]
+    assert recorder[1].endswith("USER: Who owns TKT-105?")
+    assert recorder[2] == "Thanks"
@@ -0,0 +1,149 @@
+"""
+Unit tests for server-side ASK mode chat sessions.
+"""
+
+import importlib
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from strands.agent.conversation_manager import NullConversationManager
+
+from app.agents.chat_agent import chat_agent
+from app.main import app
+from app.services.chat_sessions import ChatSessionStore, chat_sessions
+from test_data.loader import load_test_scenario
+
+chat_agent_module = importlib.import_module("app.agents.chat_agent")
+
+
+class ConversationAgent:
+    """Appends turns to its message list like a Strands agent."""
+
+    calls = []
+
+    def __init__(self, *args, **kwargs):
+        self.messages = []
+
+    def __call__(self, prompt, **kwargs):
+        ConversationAgent.calls.append({"prompt": prompt, "prior": len(self.messages)})
+        if prompt == "fail":
+            raise RuntimeError("Bedrock unavailable")
+        self.messages.append({"role": "user", "content": [{"text": prompt}]})
+        reply = f"answer {len(ConversationAgent.calls)}"
+        self.messages.append({"role": "assistant", "content": [{"text": reply}]})
+        return reply
+
+
+@pytest.fixture(autouse=True)
+def fake_chat_model(fake_agent):
+    fake_agent(ConversationAgent)
+    ConversationAgent.calls = []
+
+
+@pytest.mark.asyncio
+async def test_later_turns_send_only_the_new_message():
+    """Context goes out once; each later turn appends just the message."""
+    context = {"data": load_test_scenario("chaotic")}
+    session = chat_sessions.get_or_create("s1")
+
+    await chat_agent.chat("What is overdue?", [], context, session=session)
+    await chat_agent.chat("And who owns it?", [], context, session=session)
+    await chat_agent.chat("Thanks", [], context, session=session)
+
+    first, second, third = ConversationAgent.calls
+    assert "DATASET OVERVIEW" in first["prompt"] and first["prior"] == 0
+    assert second["prompt"] == "And who owns it?" and second["prior"] == 2
+    assert third["prompt"] == "Thanks" and third["prior"] == 4
+    assert session.turns == 3 and len(session.messages) == 6
+
+
+@pytest.mark.asyncio
+async def test_changed_context_is_resent_once():
+    session = chat_sessions.get_or_create("s2")
+    data = load_test_scenario("chaotic")
+
+    await chat_agent.chat("hi", [], {"data": data}, session=session)
+    await chat_agent.chat("now?", [], {"data": data[1:]}, session=session)
+    await chat_agent.chat("and now?", [], {"data": data[1:]}, session=session)
+
+    assert ConversationAgent.calls[1]["prompt"].startswith("CONTEXT UPDATED")
+    assert ConversationAgent.calls[2]["prompt"] == "and now?"
+
+
+@pytest.mark.asyncio
+async def test_new_session_is_seeded_from_history_and_failures_keep_state():
+    session = chat_sessions.get_or_create("s3")
+    history = [{"role": "user", "content": "Earlier question", "timestamp": 1}]
+
+    await chat_agent.chat("Follow-up", history, {"data": []}, session=session)
+    assert "Earlier question" in ConversationAgent.calls[0]["prompt"]
+
+    result = await chat_agent.chat("fail", [], {"data": []}, session=session)
+    assert "trouble connecting" in result["response"]
+    assert session.turns == 1 and len(session.messages) == 2
+
+
+def test_idle_sessions_expire():
+    store = ChatSessionStore(ttl_seconds=0.05)
+    session = store.get_or_create("idle")
+    assert store.get_or_create("idle") is session
+
+    time.sleep(0.1)
+    assert store.get_or_create("idle") is not session
+
+
+def test_session_api():
+    client = TestClient(app)
+    payload = {"message": "What is overdue?", "mode": "ASK", "sessionId": "ops-1",
+               "context": {"data": load_test_scenario("chaotic")}}
+
+    first = client.post("/api/v1/chat", json=payload).json()
+    second = client.post("/api/v1/chat", json={**payload, "message": "Why?"}).json()
+
+    assert first["sessionId"] == second["sessionId"] == "ops-1"
+    assert ConversationAgent.calls[1] == {"prompt": "Why?", "prior": 2}
+
+    assert client.delete("/api/v1/chat/sessions/ops-1").status_code == 204
+    client.post("/api/v1/chat", json={**payload, "message": "Again"})
+    assert ConversationAgent.calls[2]["prior"] == 0
+
+
+class ToolCallingAgent(ConversationAgent):
+    """Each turn makes a tool call: four messages for a few words of conversation."""
+
+    def __call__(self, prompt, **kwargs):
+        ConversationAgent.calls.append({"prompt": prompt, "prior": len(self.messages)})
+        self.messages.extend([
+            {"role": "user", "content": [{"text": prompt}]},
+            {"role": "assistant", "content": [{"toolUse": {"toolUseId": "t", "name": "find_tickets", "input": {}}}]},
+            {"role": "user", "content": [{"toolResult": {"toolUseId": "t", "status": "success", "content": []}}]},
+            {"role": "assistant", "content": [{"text": "ok"}]},
+        ])
+        return "ok"
+
+
+@pytest.mark.asyncio
+async def test_long_sessions_compact_before_the_message_list_outgrows_the_limit(fake_agent, monkeypatch):
+    """The context block is resent instead of being trimmed out of a long message list."""
+    fake_agent(ToolCallingAgent)
+    monkeypatch.setattr(chat_agent_module.settings, "chat_session_max_messages", 10)
+    session = chat_sessions.get_or_create("long")
+    context = {"data": load_test_scenario("chaotic")}
+
+    for i in range(4):
+        await chat_agent.chat(f"q{i}", [], context, session=session)
+
+    assert len(session.messages) <= 10
+    prompts = [call["prompt"] for call in ConversationAgent.calls]
+    assert "DATASET OVERVIEW" in prompts[0] and "DATASET OVERVIEW" in prompts[3]
+    assert prompts[1:3] == ["q1", "q2"]
+
+
+def test_chat_agents_do_not_trim_their_conversation(monkeypatch):
+    options = {}
+    monkeypatch.setattr(chat_agent_module, "Agent", lambda **kwargs: options.update(kwargs))
+
+    chat_agent._new_agent()
+
+    assert isinstance(options["conversation_manager"], NullConversationManager)
@@ -0,0 +1,133 @@
+"""
+Unit tests for streamed chat responses over SSE and WebSocket.
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.agent_stream import AgentEventRelay, VisibleText
+from app.services.intent_router import intent_router
+
+TICKETS = [{"id": "TKT-1", "title": "Login outage", "customer": "Acme", "status": "Open",
+            "priority": "High", "dueDate": "2026-01-01"}]
+TOOL_USE = {"toolUseId": "t1", "name": "query_tickets", "input": {"ticket_ids": ["TKT-1"]}}
+
+
+class StreamingAgent:
+    """Drives its callback handler like a Strands agent run."""
+
+    def __init__(self, *args, **kwargs):
+        self.messages = []
+        self.callback_handler = None
+
+    def __call__(self, prompt, **kwargs):
+        emit = self.callback_handler or (lambda **event: None)
+        emit(data="<thinking>Look up the")
+        emit(data=" ticket</thin")
+        emit(data="king>")
+        emit(message={"role": "assistant", "content": [{"toolUse": TOOL_USE}]})
+        emit(message={"role": "user", "content": [{"toolResult": {"toolUseId": "t1", "status": "success"}}]})
+        for chunk in ["<response>TKT-1 is ", "overdue.</resp", "onse>"]:
+            emit(data=chunk)
+        return "<response>TKT-1 is overdue.</response>"
+
+
+@pytest.fixture
+def fake_model(fake_agent):
+    fake_agent(StreamingAgent)
+
+
+def _parse_sse(body: str):
+    events = []
+    for frame in body.strip().split("\n\n"):
+        lines = frame.split("\n")
+        events.append((lines[0][len("event: "):], json.loads(lines[1][len("data: "):])))
+    return events
+
+
+def _chat(message="Why is TKT-1 overdue?", mode="ASK"):
+    return {"message": message, "mode": mode, "history": [], "context": {"data": TICKETS}}
+
+
+@pytest.mark.parametrize("chunks, expected", [
+    (["<thinking>plan</thinking>Answer"], "Answer"),
+    (["<think", "ing>plan</th", "inking>Ans", "wer"], "Answer"),
+    (["<response>Done</response>"], "Done"),
+    (["a < b and c > d"], "a < b and c > d"),
+    (["Use <b>bold</b>"], "Use <b>bold</b>"),
+    (["3 <", " 4"], "3 < 4"),
+])
+def test_visible_text_hides_thinking_and_response_tags(chunks, expected):
+    text = VisibleText()
+
+    assert "".join(text.feed(chunk) for chunk in chunks) + text.flush() == expected
+
+
+def test_relay_turns_messages_into_tool_events():
+    events = []
+    relay = AgentEventRelay(events.append)
+
+    relay(message={"role": "assistant", "content": [{"text": "Checking"}, {"toolUse": TOOL_USE}]})
+    relay(message={"role": "user", "content": [{"toolResult": {"toolUseId": "t1", "status": "error"}}]})
+
+    assert events == [
+        {"event": "tool_start", "data": TOOL_USE},
+        {"event": "tool_end", "data": {"toolUseId": "t1", "name": "query_tickets", "status": "error"}},
+    ]
+
+
+def test_sse_stream_forwards_deltas_tool_events_and_final_response(fake_model):
+    response = TestClient(app).post("/api/v1/chat/stream", json=_chat())
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _parse_sse(response.text)
+    names = [name for name, _ in events]
+    assert names[:2] == ["tool_start", "tool_end"]
+    assert names[-2:] == ["citations", "response"]
+    assert "".join(data["text"] for name, data in events if name == "delta") == "TKT-1 is overdue."
+    assert events[0][1]["input"] == {"ticket_ids": ["TKT-1"]}
+    assert events[-2][1] == {"citations": []}
+    assert events[-1][1]["response"] == "TKT-1 is overdue."
+
+
+def test_sse_stream_sends_answers_that_skip_the_model_as_one_delta(fake_model, monkeypatch):
+    monkeypatch.setattr(intent_router, "enabled", True)
+
+    events = _parse_sse(TestClient(app).post("/api/v1/chat/stream", json=_chat("Show TKT-1")).text)
+
+    assert [name for name, _ in events] == ["delta", "citations", "response"]
+    assert events[0][1]["text"] == events[-1][1]["response"]
+    assert events[0][1]["text"].startswith("TKT-1: Login outage")
+
+
+def test_sse_stream_do_mode(fake_agent):
+    fake_agent(StreamingAgent, mode="action")
+
+    events = _parse_sse(TestClient(app).post("/api/v1/chat/stream", json=_chat("Close TKT-1", "DO")).text)
+
+    assert "citations" not in [name for name, _ in events]
+    assert events[-1][0] == "response"
+    assert events[-1][1]["response"] == "TKT-1 is overdue."
+
+
+def test_sse_stream_unknown_dataset_is_404():
+    response = TestClient(app).post("/api/v1/chat/stream", json={**_chat(), "datasetId": "missing"})
+
+    assert response.status_code == 404
+
+
+def test_websocket_streams_each_request_and_reports_invalid_ones(fake_model):
+    with TestClient(app).websocket_connect("/api/v1/chat/ws") as websocket:
+        websocket.send_text("not json")
+        assert websocket.receive_json()["event"] == "error"
+
+        websocket.send_text(json.dumps(_chat()))
+        frames = []
+        while not frames or frames[-1]["event"] != "response":
+            frames.append(websocket.receive_json())
+
+    assert frames[0] == {"event": "tool_start", "data": TOOL_USE}
+    assert frames[-1]["data"]["response"] == "TKT-1 is overdue."
@@ -0,0 +1,153 @@
+"""
+Unit tests for the server-side dataset registry and datasetId requests.
+"""
+
+import copy
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.agents.briefing_agent import briefing_agent
+from app.agents.chat_agent import chat_agent
+from app.main import app
+from app.services.briefing_cache import briefing_cache
+from app.services.briefing_scheduler import BriefingScheduler
+from app.services.dataset_registry import DatasetNotFoundError, DatasetRegistry, dataset_registry
+from test_data.loader import load_test_scenario
+
+REFERENCE_TIME = datetime(2026, 1, 24, 9, 0, tzinfo=timezone.utc)
+
+
+def fake_briefing_agent(prompt, **kwargs):
+    return '{"summary": "Registry briefing.", "insights": []}'
+
+
+@pytest.fixture(autouse=True)
+def clean_state(monkeypatch):
+    monkeypatch.setattr(briefing_agent, "_new_agent", lambda: fake_briefing_agent)
+    briefing_agent.snapshots.clear()
+    briefing_cache.backend.clear()
+    dataset_registry.clear()
+    yield
+    briefing_agent.snapshots.clear()
+    dataset_registry.clear()
+
+
+def test_identical_uploads_share_one_dataset():
+    registry = DatasetRegistry()
+    data = load_test_scenario("chaotic")
+
+    first = registry.register(data)
+    second = registry.register(list(reversed(data)))
+
+    assert first is second
+    assert first.dataset_id == f"ds-{first.content_hash[:16]}"
+
+
+def test_lru_eviction_and_replacement():
+    registry = DatasetRegistry(max_datasets=2)
+    registry.register([{"id": "A"}], dataset_id="a")
+    registry.register([{"id": "B"}], dataset_id="b")
+    registry.get("a")
+    registry.register([{"id": "C"}], dataset_id="c")
+
+    with pytest.raises(DatasetNotFoundError):
+        registry.get("b")
+
+    replaced = registry.register([{"id": "A2"}], dataset_id="a")
+    assert registry.get("a") is replaced and replaced.tickets == [{"id": "A2"}]
+
+
+def test_views_are_built_once_per_day():
+    """The indexed, annotated view and its prompt encoding are reused across messages."""
+    dataset = DatasetRegistry().register(load_test_scenario("chaotic"))
+
+    store = dataset.store(REFERENCE_TIME)
+    assert dataset.store(REFERENCE_TIME.replace(hour=18)) is store
+    assert dataset.serialized(REFERENCE_TIME) is dataset.serialized(REFERENCE_TIME)
+    assert dataset.store(datetime(2026, 1, 25, tzinfo=timezone.utc)) is not store
+    assert "daysOverdue" in store.tickets[0]
+
+
+def test_briefing_by_dataset_id():
+    """Briefing requests can carry only the datasetId."""
+    client = TestClient(app)
+    uploaded = client.post("/api/v1/datasets", json={"data": load_test_scenario("chaotic")}).json()
+
+    assert uploaded["ticketCount"] == len(load_test_scenario("chaotic"))
+    assert client.get(f"/api/v1/datasets/{uploaded['datasetId']}").json() == uploaded
+
+    response = client.post("/api/v1/briefing", json={"datasetId": uploaded["datasetId"]})
+    assert response.status_code == 200
+    assert response.json()["summary"] == "Registry briefing."
+
+    # Inline data with the same content hits the same cache entry
+    inline = client.post("/api/v1/briefing", json={"data": load_test_scenario("chaotic")}).json()
+    assert inline == response.json()
+    assert client.get("/api/v1/briefing/cache/stats").json()["hits"] >= 1
+
+
+def test_unknown_or_missing_dataset_is_rejected():
+    client = TestClient(app)
+    assert client.post("/api/v1/briefing", json={"datasetId": "ds-missing"}).status_code == 404
+    assert client.post("/api/v1/briefing", json={}).status_code == 422
+    assert client.get("/api/v1/datasets/ds-missing").status_code == 404
+    chat = client.post(
+        "/api/v1/chat",
+        json={"message": "hi", "history": [], "mode": "ASK", "datasetId": "ds-missing"}
+    )
+    assert chat.status_code == 404
+
+
+def test_chat_uses_uploaded_dataset(fake_agent):
+    """Chat by datasetId sees the stored tickets through the prompt and tools."""
+    seen = {}
+
+    class FakeAgent:
+        def __init__(self, *args, **kwargs):
+            self.messages = []
+
+        def __call__(self, prompt, **kwargs):
+            seen["prompt"] = prompt
+            seen["rows"] = chat_agent.query_tickets(ticket_ids=["TKT-99"])
+            return "TKT-99 is overdue."
+
+    fake_agent(FakeAgent)
+    client = TestClient(app)
+    dataset_id = client.post(
+        "/api/v1/datasets", json={"data": load_test_scenario("chaotic"), "datasetId": "ops"}
+    ).json()["datasetId"]
+
+    response = client.post(
+        "/api/v1/chat",
+        json={"message": "Is TKT-99 overdue?", "history": [], "mode": "ASK", "datasetId": dataset_id}
+    )
+
+    assert response.json()["response"] == "TKT-99 is overdue."
+    assert "Server Outage - Production" in seen["prompt"]
+    assert seen["rows"] and seen["rows"][0]["id"] == "TKT-99"
+
+
+@pytest.mark.asyncio
+async def test_scheduler_pulls_from_registry():
+    """Scheduled runs read the current upload and stop watching evicted datasets."""
+    registry = DatasetRegistry(max_datasets=1)
+    data = load_test_scenario("chaotic")
+    registry.register(data, dataset_id="ops")
+    scheduler = BriefingScheduler()
+    scheduler.register_source("ops", registry.loader("ops"))
+
+    await scheduler.run_once()
+    assert scheduler.latest("ops").version == 1
+
+    changed = copy.deepcopy(data)
+    changed[0]["status"] = "Closed"
+    registry.register(changed, dataset_id="ops")
+    await scheduler.run_once()
+    assert scheduler.latest("ops").version == 2
+
+    registry.register([{"id": "X"}], dataset_id="other")
+    assert await scheduler.run_once() == 0
+    assert await scheduler.run_once() == 0
+    assert "ops" not in scheduler._sources
@@ -0,0 +1,156 @@
+"""
+Unit tests for the rules-based ASK mode fast path.
+"""
+
+import importlib
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.agents.chat_agent import chat_agent
+from app.main import app
+from app.services.chat_sessions import chat_sessions
+from app.services.intent_router import IntentRouter
+from app.services.time_context import annotate_tickets
+from app.services.ticket_store import TicketStore
+
+chat_agent_module = importlib.import_module("app.agents.chat_agent")
+
+NOW = datetime(2026, 1, 24, 9, 0, tzinfo=timezone.utc)
+
+TICKETS = [
+    {"id": "TKT-1", "title": "Login outage", "customer": "Acme Corp", "status": "Open",
+     "priority": "Critical", "assignee": "sam", "dueDate": "2026-01-20", "source": "jira"},
+    {"id": "TKT-1", "title": "Login outage", "customer": "Acme Corp", "status": "Resolved",
+     "priority": "Critical", "assignee": "sam", "dueDate": "2026-01-20", "source": "zendesk"},
+    {"id": "TKT-2", "title": "Slow reports", "customer": "Globex", "status": "In Progress",
+     "priority": "High", "assignee": None, "dueDate": "2026-01-22", "source": "jira"},
+    {"id": "TKT-3", "title": "Export fails", "customer": "Acme Corp", "status": "Open",
+     "priority": "Critical", "assignee": "kim", "dueDate": "2026-01-30", "source": "jira"},
+    {"id": "TKT-4", "title": "Typo on invoice", "customer": "Globex", "status": "Closed",
+     "priority": "Low", "assignee": "kim", "dueDate": "2026-01-10", "source": "jira"},
+]
+
+
+@pytest.fixture
+def store():
+    return TicketStore(annotate_tickets(TICKETS, NOW))
+
+
+def test_lookup_by_id(store):
+    answer = IntentRouter().route("Show TKT-3", store)
+
+    assert answer.intent == "lookup"
+    assert answer.response.startswith("TKT-3: Export fails (Acme Corp) - Open, Critical priority")
+    assert "assignee kim" in answer.response
+
+
+def test_lookup_lists_conflicting_records_and_missing_ids(store):
+    response = IntentRouter().route("status of TKT-1 and TKT-9?", store).response
+
+    assert "TKT-1 has 2 conflicting records:" in response
+    assert "[source jira]" in response and "[source zendesk]" in response
+    assert "TKT-9 was not found in the current dataset." in response
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("How many tickets are open?", "There are 3 open tickets."),
+    ("how many critical tickets are open for acme corp?", "There are 2 open critical-priority tickets for Acme Corp."),
+    ("Number of low priority tickets", "There is 1 low-priority ticket."),
+    ("how many urgent tickets are open?", "There are 3 open critical- or high-priority tickets."),
+    ("How many tickets are past due?", "There are 2 overdue tickets."),
+    ("how many pending tickets?", "There are no pending tickets."),
+])
+def test_counts_with_filters(store, question, expected):
+    answer = IntentRouter().route(question, store)
+
+    assert answer.intent == "count"
+    assert answer.response == expected
+
+
+def test_count_notes_duplicate_records(store):
+    response = IntentRouter().route("How many critical tickets?", store).response
+
+    assert response == (
+        "There are 2 critical-priority tickets (3 records; some tickets have conflicting records across systems)."
+    )
+
+
+def test_overdue_list_most_overdue_first(store):
+    answer = IntentRouter(list_limit=1).route("Which tickets are overdue?", store)
+
+    assert answer.intent == "overdue"
+    lines = answer.response.splitlines()
+    assert lines[0] == "2 overdue tickets, most overdue first:"
+    assert lines[1].startswith("- TKT-1: Login outage") and "4 days overdue" in lines[1]
+    assert lines[2] == "...and 1 more."
+
+
+def test_overdue_list_counts_and_lists_each_ticket_once():
+    tickets = [dict(TICKETS[0], source="zendesk", dueDate="2026-01-21"), *TICKETS]
+    store = TicketStore(annotate_tickets(tickets, NOW))
+
+    lines = IntentRouter().route("Which tickets are overdue?", store).response.splitlines()
+
+    assert lines[0] == (
+        "2 overdue tickets (3 records; some tickets have conflicting records across systems), most overdue first:"
+    )
+    assert [line.split(":")[0] for line in lines[1:]] == ["- TKT-1", "- TKT-2"]
+    assert "4 days overdue" in lines[1]
+
+
+@pytest.mark.parametrize("question", [
+    "What's wrong with TKT-1 and how do I fix it?",
+    "Which tickets are critical?",
+    "Why is TKT-2 late?",
+    "Summarize the overdue tickets for Globex",
+    "How many tickets mention TKT-1?",
+])
+def test_anything_else_falls_through(store, question):
+    router = IntentRouter()
+
+    assert router.route(question, store) is None
+    assert router.stats()["fallthrough"] == 1
+
+
+def test_disabled_router_answers_nothing(store):
+    assert IntentRouter(enabled=False).route("Show TKT-3", store) is None
+
+
+@pytest.mark.asyncio
+async def test_routed_question_skips_the_model(counting_agent, monkeypatch):
+    router = IntentRouter()
+    monkeypatch.setattr(chat_agent_module, "intent_router", router)
+    context = {"data": TICKETS}
+
+    routed = await chat_agent.chat("Show TKT-3", [], context)
+    await chat_agent.chat("What's wrong with TKT-3 and how do I fix it?", [], context)
+
+    assert routed["response"].startswith("TKT-3: Export fails")
+    assert routed["citations"] is None
+    assert counting_agent.calls == 1
+    stats = router.stats()
+    assert stats["routed_by_intent"]["lookup"] == 1
+    assert stats["fallthrough"] == 1
+    assert stats["routed_ratio"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_routed_answer_is_recorded_in_session(counting_agent, monkeypatch):
+    monkeypatch.setattr(chat_agent_module, "intent_router", IntentRouter())
+    session = chat_sessions.get_or_create("routed")
+
+    result = await chat_agent.chat("How many tickets are open?", [], {"data": TICKETS}, session=session)
+
+    assert counting_agent.calls == 0
+    assert session.recent[-1] == {"role": "model", "content": result["response"]}
+
+
+def test_router_stats_endpoint():
+    response = TestClient(app).get("/api/v1/chat/router/stats")
+
+    assert response.status_code == 200
+    assert {"routed", "routed_by_intent", "fallthrough", "routed_ratio", "avg_routed_ms", "avg_agent_ms"} <= set(
+        response.json()
+    )
@@ -0,0 +1,203 @@
+"""
+Unit tests for the knowledge base retrieve cache.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from strands.tools import PythonAgentTool
+
+from app.agents.chat_agent import chat_agent
+from app.main import app
+from app.services import kb_cache as kb_cache_module
+from app.services.citations import CitationCollector, collect_citations
+from app.services.kb_cache import RetrieveCache
+from app.utils.similarity import normalize_text
+from app.utils.cache import MemoryCache, SQLiteCache
+
+
+def _result(document_id, score, chunk_id=None):
+    return {
+        "content": {"text": f"Content of {document_id}", "type": "TEXT"},
+        "location": {"type": "S3", "s3Location": {"uri": document_id}},
+        "metadata": {
+            "x-amz-bedrock-kb-source-uri": document_id,
+            "x-amz-bedrock-kb-chunk-id": chunk_id or f"{document_id}-chunk",
+            "x-amz-bedrock-kb-data-source-id": "ds-1",
+        },
+        "score": score,
+    }
+
+
+RESULTS = [_result("s3://kb/mps-escalation.md", 0.8123)]
+
+
+class FakeBedrockSearch:
+    """Counts calls in place of the Bedrock Knowledge Base query."""
+
+    def __init__(self, results=RESULTS, error=None):
+        self.calls = 0
+        self.results = results
+        self.error = error
+
+    def __call__(self, tool_input):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return self.results
+
+
+def _tool(text, use_id="t1", **extra):
+    return {"toolUseId": use_id, "input": {"text": text, **extra}}
+
+
+def test_normalize_text():
+    assert normalize_text("  How do I   escalate an MPS SLA breach?? ") == "how do i escalate an mps sla breach"
+
+
+def test_repeated_question_is_served_from_cache_with_identical_citations(monkeypatch):
+    fake = FakeBedrockSearch()
+    monkeypatch.setattr(kb_cache_module, "search_bedrock", fake)
+    cache = RetrieveCache(MemoryCache())
+
+    with collect_citations() as first_citations:
+        first = cache.retrieve(_tool("How do I escalate an MPS SLA breach?", enableMetadata=True))
+    with collect_citations() as second_citations:
+        second = cache.retrieve(_tool("how do i escalate an MPS SLA breach", use_id="t2", enableMetadata=True))
+
+    assert fake.calls == 1
+    assert second["toolUseId"] == "t2"
+    assert second["content"] == first["content"]
+    assert "Score: 0.8123\nDocument ID: s3://kb/mps-escalation.md" in second["content"][0]["text"]
+    assert second_citations.citations() == first_citations.citations() == [{
+        "score": 0.8123,
+        "documentId": "s3://kb/mps-escalation.md",
+        "sourceUri": "s3://kb/mps-escalation.md",
+        "chunkId": "s3://kb/mps-escalation.md-chunk",
+        "dataSourceId": "ds-1",
+    }]
+    assert cache.stats()["hits"] == 1
+
+
+def test_key_covers_retrieval_settings(monkeypatch):
+    fake = FakeBedrockSearch()
+    monkeypatch.setattr(kb_cache_module, "search_bedrock", fake)
+    cache = RetrieveCache(MemoryCache())
+
+    cache.retrieve(_tool("escalation"))
+    cache.retrieve(_tool("escalation", score=0.7))
+    cache.retrieve(_tool("escalation", numberOfResults=3))
+    cache.retrieve(_tool("escalation", knowledgeBaseId="other-kb"))
+    cache.retrieve(_tool("escalation", profile_name="support"))
+    cache.retrieve(_tool("escalation", enableMetadata=False))
+
+    assert fake.calls == 5
+
+
+def test_bedrock_search_uses_the_requested_aws_profile(monkeypatch):
+    sessions = []
+
+    class FakeSession:
+        def __init__(self, profile_name=None):
+            sessions.append(profile_name)
+
+        def client(self, service, **kwargs):
+            return type("Client", (), {"retrieve": lambda self, **kw: {"retrievalResults": RESULTS}})()
+
+    monkeypatch.setattr(kb_cache_module.boto3, "Session", FakeSession)
+    kb_cache_module._agent_runtime_client.cache_clear()
+    try:
+        results = kb_cache_module.search_bedrock({"text": "escalation", "region": "us-east-1", "profile_name": "support"})
+        kb_cache_module.search_bedrock({"text": "escalation", "region": "us-east-1", "profile_name": "support"})
+    finally:
+        kb_cache_module._agent_runtime_client.cache_clear()
+
+    assert results == RESULTS
+    assert sessions == ["support"]
+
+
+def test_malformed_filter_is_rejected_before_bedrock_is_called(monkeypatch):
+    monkeypatch.setattr(kb_cache_module, "_agent_runtime_client", lambda *args: pytest.fail("Bedrock was called"))
+    monkeypatch.setattr(kb_cache_module.settings, "knowledge_base_backend", "bedrock")
+
+    result = RetrieveCache(MemoryCache()).retrieve(_tool("escalation", retrieveFilter={"bogus": {}}))
+
+    assert result["status"] == "error"
+    assert "Invalid operator: bogus" in result["content"][0]["text"]
+
+
+def test_errors_are_not_cached(monkeypatch):
+    fake = FakeBedrockSearch(error=RuntimeError("throttled"))
+    monkeypatch.setattr(kb_cache_module, "search_bedrock", fake)
+    cache = RetrieveCache(MemoryCache())
+
+    with collect_citations() as collector:
+        result = cache.retrieve(_tool("escalation"))
+        cache.retrieve(_tool("escalation"))
+
+    assert result["status"] == "error" and "throttled" in result["content"][0]["text"]
+    assert fake.calls == 2 and len(cache.backend) == 0
+    assert collector.citations() is None
+
+
+def test_sqlite_backend_survives_restart(tmp_path, monkeypatch):
+    fake = FakeBedrockSearch()
+    monkeypatch.setattr(kb_cache_module, "search_bedrock", fake)
+    path = str(tmp_path / "kb.sqlite3")
+
+    first = RetrieveCache(SQLiteCache(path)).retrieve(_tool("escalation"))
+    with collect_citations() as collector:
+        result = RetrieveCache(SQLiteCache(path)).retrieve(_tool("Escalation."))
+
+    assert fake.calls == 1
+    assert result["content"] == first["content"]
+    assert collector.citations()[0]["documentId"] == "s3://kb/mps-escalation.md"
+
+
+def test_collector_deduplicates_chunks_and_sorts_by_score():
+    collector = CitationCollector()
+
+    collector.add([_result("doc-a", 0.5), _result("doc-b", 0.9)])
+    collector.add([_result("doc-a", 0.7), _result("doc-a", 0.6, chunk_id="other-chunk")])
+
+    assert [(c["documentId"], c["score"]) for c in collector.citations()] == [
+        ("doc-b", 0.9), ("doc-a", 0.7), ("doc-a", 0.6)
+    ]
+
+
+class RetrievingAgent:
+    """Runs two retrieve calls on its worker thread, like a model doing two searches."""
+
+    def __init__(self, *args, **kwargs):
+        self.messages = []
+
+    def __call__(self, prompt, **kwargs):
+        for use_id, text in (("t1", "escalation"), ("t2", "breach handling")):
+            kb_cache_module.kb_cache.retrieve({"toolUseId": use_id, "input": {"text": text}})
+        return "Page the on-call lead."
+
+
+@pytest.mark.asyncio
+async def test_chat_returns_citations_collected_during_retrieve(fake_agent, monkeypatch):
+    searches = iter([[_result("doc-a", 0.5), _result("doc-b", 0.6)], [_result("doc-a", 0.8)]])
+    monkeypatch.setattr(kb_cache_module, "search_bedrock", lambda tool_input: next(searches))
+    monkeypatch.setattr(kb_cache_module.kb_cache, "enabled", False)
+    fake_agent(RetrievingAgent)
+
+    result = await chat_agent.chat("How do I handle an MPS breach?", [], {"data": []})
+
+    assert result["response"] == "Page the on-call lead."
+    assert [(c["documentId"], c["score"]) for c in result["citations"]] == [("doc-a", 0.8), ("doc-b", 0.6)]
+
+
+def test_chat_agent_registers_cached_retrieve_under_the_same_name():
+    tool = chat_agent._new_agent().tool_registry.registry["retrieve"]
+
+    assert isinstance(tool, PythonAgentTool)
+    assert tool.tool_spec == kb_cache_module.retrieve_module.TOOL_SPEC
+
+
+def test_kb_cache_stats_endpoint():
+    response = TestClient(app).get("/api/v1/chat/kb-cache/stats")
+
+    assert response.status_code == 200
+    assert {"enabled", "backend", "entries", "hits", "misses", "hit_rate"} <= set(response.json())
@@ -0,0 +1,105 @@
+"""
+Unit tests for the local offline knowledge base.
+"""
+
+from app.config import settings
+from app.services import kb_cache as kb_cache_module
+from app.services.citations import collect_citations
+from app.services.kb_cache import RetrieveCache, fetch
+from app.utils.cache import MemoryCache
+from app.services.local_kb import LocalKnowledgeBase, chunk_document
+
+ESCALATION_DOC = """# MPS SLA Escalation
+
+## Breach handling
+When an MPS ticket breaches its SLA, page the on-call lead and notify the account manager.
+
+## Printer replacement
+Replacement printers ship within two business days.
+"""
+
+VPN_DOC = "VPN access requests are approved by the MCS security team within one day.\n"
+
+
+def _docs(tmp_path):
+    docs = tmp_path / "docs"
+    (docs / "mps").mkdir(parents=True)
+    (docs / "mps" / "escalation.md").write_text(ESCALATION_DOC)
+    (docs / "vpn.txt").write_text(VPN_DOC)
+    (docs / "image.png").write_bytes(b"\x89PNG")
+    return docs
+
+
+def _tool(text, **extra):
+    return {"toolUseId": "t1", "input": {"text": text, **extra}}
+
+
+def test_chunks_follow_headings_and_size():
+    chunks = chunk_document(ESCALATION_DOC, max_chars=1200)
+    assert [c["heading"] for c in chunks] == ["Breach handling", "Printer replacement"]
+    assert chunks[0]["text"].startswith("Breach handling\nWhen an MPS ticket")
+
+    long_section = "# Big\n\n" + "\n\n".join(f"Paragraph {n} " + "x" * 80 for n in range(10))
+    assert all(len(c["text"]) <= 300 for c in chunk_document(long_section, max_chars=300))
+
+
+def test_retrieve_output_matches_bedrock_citation_format(tmp_path, monkeypatch):
+    monkeypatch.setattr(kb_cache_module, "local_kb", LocalKnowledgeBase(str(_docs(tmp_path))))
+    monkeypatch.setattr(settings, "knowledge_base_backend", "local")
+
+    with collect_citations() as collector:
+        result = RetrieveCache(MemoryCache()).retrieve(
+            _tool("how do I escalate an MPS SLA breach", score=0.1, enableMetadata=True)
+        )
+
+    assert result["status"] == "success"
+    assert "Document ID: mps/escalation.md#0" in result["content"][0]["text"]
+    top = collector.citations()[0]
+    assert top["documentId"] == "mps/escalation.md#0"
+    assert top["chunkId"] == "mps/escalation.md#0"
+    assert top["sourceUri"].startswith("file://") and top["sourceUri"].endswith("mps/escalation.md")
+    assert top["dataSourceId"] == "local"
+    assert 0 < top["score"] <= 1
+
+
+def test_min_score_filters_weak_matches(tmp_path):
+    kb = LocalKnowledgeBase(str(_docs(tmp_path)))
+
+    assert kb.search("printer", min_score=0.0)
+    assert kb.search("printer", min_score=0.99) == []
+    assert kb.search("kubernetes") == []
+
+
+def test_index_is_persisted_and_rebuilt_when_documents_change(tmp_path):
+    docs = _docs(tmp_path)
+    index_path = tmp_path / "index.json"
+    LocalKnowledgeBase(str(docs), index_path=str(index_path)).stats()
+    assert index_path.exists()
+
+    reloaded = LocalKnowledgeBase(str(docs), index_path=str(index_path))
+    reloaded._build = None  # must load from disk, not rebuild
+    assert reloaded.stats()["chunks"] == 3
+
+    (docs / "onboarding.md").write_text("# Onboarding\nNew operators shadow a senior engineer.\n")
+    kb = LocalKnowledgeBase(str(docs), index_path=str(index_path), rescan_seconds=0)
+    assert kb.search("operators shadow")[0]["location"]["customDocumentLocation"]["id"] == "onboarding.md#0"
+
+
+def test_backend_setting_selects_local_or_tiered(tmp_path, monkeypatch):
+    bedrock_calls = []
+
+    def bedrock(tool_input):
+        bedrock_calls.append(tool_input["text"])
+        return [{"score": 0.9, "location": {"s3Location": {"uri": "s3://kb/k8s.md"}}}]
+
+    monkeypatch.setattr(kb_cache_module, "search_bedrock", bedrock)
+    monkeypatch.setattr(kb_cache_module, "local_kb", LocalKnowledgeBase(str(_docs(tmp_path))))
+
+    monkeypatch.setattr(settings, "knowledge_base_backend", "local")
+    assert fetch({"text": "VPN access", "score": 0.1})[0]["location"]["customDocumentLocation"]["id"] == "vpn.txt#0"
+    assert fetch({"text": "kubernetes"}) == []
+
+    monkeypatch.setattr(settings, "knowledge_base_backend", "tiered")
+    assert fetch({"text": "VPN access", "score": 0.1})[0]["metadata"]["x-amz-bedrock-kb-data-source-id"] == "local"
+    assert fetch({"text": "kubernetes"})[0]["location"]["s3Location"]["uri"] == "s3://kb/k8s.md"
+    assert bedrock_calls == ["kubernetes"]
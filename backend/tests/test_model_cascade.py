@@ -0,0 +1,239 @@
+"""
+Unit tests for the fast/strong model cascade.
+"""
+
+import importlib
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.agents.action_agent import action_agent
+from app.agents.chat_agent import chat_agent
+from app.main import app
+from app.services import kb_cache as kb_cache_module
+from app.services.model_cascade import ModelCascade, strip_confidence
+
+chat_agent_module = importlib.import_module("app.agents.chat_agent")
+action_agent_module = importlib.import_module("app.agents.action_agent")
+
+FAST = "amazon.nova-lite-v1:0"
+STRONG = "amazon.nova-pro-v1:0"
+
+
+class Result:
+    """Stands in for a Strands AgentResult."""
+
+    def __init__(self, text, stop_reason="end_turn", tools=None):
+        self.text = text
+        self.stop_reason = stop_reason
+        self.metrics = SimpleNamespace(tool_metrics=tools or {})
+
+    def __str__(self):
+        return self.text
+
+
+def _cascade(**kwargs):
+    return ModelCascade("chat", FAST, STRONG, **kwargs)
+
+
+def test_strip_confidence():
+    assert strip_confidence("Restart it. <confidence>low</confidence>") == ("Restart it.", "low")
+    assert strip_confidence("Restart it.") == ("Restart it.", None)
+
+
+@pytest.mark.parametrize("result, trigger", [
+    (Result("<response>TKT-1 is open.</response>"), None),
+    (Result("TKT-1 is open. <confidence>high</confidence>"), None),
+    (Result("Not sure. <confidence>low</confidence>"), "low_confidence"),
+    (Result("<response>TKT-1 is"), "parse_failure"),
+    (Result("TKT-1 is", stop_reason="max_tokens"), "parse_failure"),
+    (Result("  "), "parse_failure"),
+    (Result("", stop_reason="limit_turns"), "tool_loop"),
+])
+def test_escalation_triggers(result, trigger):
+    assert ModelCascade.escalation_trigger(result) == trigger
+
+
+@pytest.mark.parametrize("message, tier", [
+    ("Why is TKT-1 overdue?", "fast"),
+    ("Compare TKT-1, TKT-2 and TKT-3", "strong"),
+    ("word " * 200, "strong"),
+])
+def test_long_and_multi_entity_questions_start_on_the_strong_tier(message, tier):
+    assert _cascade().start_tier(message)[0] == tier
+
+
+def test_answer_stays_on_the_fast_tier_with_a_turn_limit():
+    calls = []
+    cascade = _cascade(max_turns=5)
+
+    def invoke(tier, limits):
+        calls.append((tier, limits))
+        return Result("ok"), None
+
+    outcome = cascade.run("Why is TKT-1 overdue?", invoke)
+
+    assert outcome[0].text == "ok"
+    assert calls == [("fast", {"turns": 5})]
+    assert cascade.stats()["escalation_rate"] == 0.0
+
+
+def test_low_confidence_escalates_and_emits_an_event():
+    answers = {"fast": Result("Maybe. <confidence>low</confidence>"), "strong": Result("Definitely.")}
+    events = []
+    cascade = _cascade()
+
+    outcome = cascade.run("Why is TKT-1 overdue?", lambda tier, limits: (answers[tier], limits), events.append)
+
+    assert outcome == (answers["strong"], None)
+    assert events == [{"event": "escalated", "data": {"reason": "low_confidence", "model": STRONG}}]
+    stats = cascade.stats()
+    assert stats["escalations_by_trigger"]["low_confidence"] == 1
+    assert stats["escalation_rate"] == 1.0
+    assert stats["tiers"]["fast"]["calls"] == stats["tiers"]["strong"]["calls"] == 1
+
+
+def test_attempt_with_side_effects_is_not_repeated():
+    cascade = _cascade(retry_after_tools=False)
+    fast = Result("Closed TKT-1. <confidence>low</confidence>", tools={"update_ticket_status": object()})
+    tiers = []
+
+    outcome = cascade.run("Close TKT-1", lambda tier, limits: tiers.append(tier) or (fast, None))
+
+    assert outcome[0] is fast
+    assert tiers == ["fast"]
+    assert cascade.stats()["escalations"] == 0
+
+
+def test_attempts_with_side_effects_run_without_a_turn_limit():
+    cascade = _cascade(max_turns=4, retry_after_tools=False)
+    exhausted = Result("", stop_reason="limit_turns", tools={"update_ticket_status": object()})
+    calls = []
+
+    def invoke(tier, limits):
+        calls.append((tier, limits))
+        return exhausted, None
+
+    outcome = cascade.run("Escalate all overdue Acme tickets", invoke)
+
+    assert calls == [("fast", None)]
+    assert outcome[0] is exhausted
+
+
+def test_disabled_cascade_uses_the_default_tier_without_limits():
+    calls = []
+    cascade = _cascade(enabled=False, default_tier="strong")
+
+    def invoke(tier, limits):
+        calls.append((tier, limits))
+        return Result(""), None
+
+    cascade.run("Compare TKT-1, TKT-2 and TKT-3", invoke)
+
+    assert calls == [("strong", None)]
+
+
+class TieredAgent:
+    """Nova Lite is unsure; Nova Pro answers."""
+
+    calls = []
+
+    def __init__(self, model=None, **kwargs):
+        self.model = model
+        self.messages = []
+
+    def __call__(self, prompt, **kwargs):
+        TieredAgent.calls.append((self.model, kwargs.get("limits")))
+        if self.model == FAST:
+            return "<response>Possibly a login issue.</response><confidence>low</confidence>"
+        return "<response>TKT-1 is blocked on the auth migration.</response>"
+
+
+@pytest.fixture
+def tiered_chat(fake_agent, monkeypatch):
+    TieredAgent.calls = []
+    monkeypatch.setattr(chat_agent, "cascade", _cascade(max_turns=4))
+    fake_agent(TieredAgent)
+
+
+@pytest.mark.asyncio
+async def test_chat_escalates_low_confidence_answers(tiered_chat):
+    result = await chat_agent.chat("Why is TKT-1 blocked?", [], {"data": []})
+
+    assert result["response"] == "TKT-1 is blocked on the auth migration."
+    assert TieredAgent.calls == [(FAST, {"turns": 4}), (STRONG, None)]
+
+
+@pytest.mark.asyncio
+async def test_escalated_answer_cites_only_its_own_retrievals(fake_agent, monkeypatch):
+    class RetrievingTieredAgent(TieredAgent):
+        def __call__(self, prompt, **kwargs):
+            query = "fast guess" if self.model == FAST else "strong answer"
+            kb_cache_module.kb_cache.retrieve({"toolUseId": "t1", "input": {"text": query}})
+            return super().__call__(prompt, **kwargs)
+
+    def search(tool_input):
+        document = "doc-a" if tool_input["text"] == "fast guess" else "doc-b"
+        return [{"location": {"type": "S3", "s3Location": {"uri": document}}, "metadata": {}, "score": 0.8}]
+
+    TieredAgent.calls = []
+    monkeypatch.setattr(kb_cache_module, "search_bedrock", search)
+    monkeypatch.setattr(kb_cache_module.kb_cache, "enabled", False)
+    monkeypatch.setattr(chat_agent, "cascade", _cascade())
+    fake_agent(RetrievingTieredAgent)
+
+    result = await chat_agent.chat("Why is TKT-1 blocked?", [], {"data": []})
+
+    assert result["response"] == "TKT-1 is blocked on the auth migration."
+    assert [c["documentId"] for c in result["citations"]] == ["doc-b"]
+
+
+@pytest.mark.asyncio
+async def test_do_mode_keeps_the_fast_answer_after_actions_ran(fake_agent, monkeypatch):
+    class ActingAgent(TieredAgent):
+        def __call__(self, prompt, **kwargs):
+            TieredAgent.calls.append((self.model, kwargs.get("limits")))
+            return Result("Closed TKT-1. <confidence>low</confidence>", tools={"update_ticket_status": object()})
+
+    TieredAgent.calls = []
+    monkeypatch.setattr(action_agent, "cascade", ModelCascade("action", FAST, STRONG, retry_after_tools=False))
+    fake_agent(ActingAgent, mode="action")
+
+    result = await action_agent.execute("Close TKT-1", {"data": []})
+
+    assert result == "Closed TKT-1."
+    assert [model for model, _ in TieredAgent.calls] == [FAST]
+
+
+def test_agent_pools_run_the_models_the_cascade_reports(monkeypatch):
+    built = []
+
+    class RecordingAgent:
+        def __init__(self, model=None, **kwargs):
+            built.append(model)
+
+    monkeypatch.setenv("BEDROCK_MODEL_CHAT", "env-chat-model")
+    monkeypatch.setenv("BEDROCK_MODEL_ACTION", "env-action-model")
+    for module in (chat_agent_module, action_agent_module):
+        monkeypatch.setattr(module, "Agent", RecordingAgent)
+    chat, action = chat_agent_module.ChatAgent(), action_agent_module.ActionAgent()
+
+    for pool in (chat.pool, chat.strong_pool, action.fast_pool, action.pool):
+        with pool.lease():
+            pass
+
+    assert built == [
+        chat.cascade.models["fast"], chat.cascade.models["strong"],
+        action.cascade.models["fast"], action.cascade.models["strong"],
+    ]
+    assert "env-chat-model" not in built and "env-action-model" not in built
+
+
+def test_cascade_stats_endpoint():
+    response = TestClient(app).get("/api/v1/chat/cascade/stats")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body) == {"chat", "action"}
+    assert {"requests", "escalation_rate", "escalations_by_trigger", "tiers"} <= set(body["chat"])
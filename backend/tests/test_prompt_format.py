@@ -0,0 +1,78 @@
+"""
+Unit tests for prompt dataset serialization.
+"""
+
+import json
+import pytest
+
+from app.utils.prompt_format import (
+    FORMATS,
+    estimate_tokens,
+    serialize_briefing,
+    serialize_records,
+    to_dictionary,
+    to_table,
+)
+from test_data.loader import list_scenarios, load_test_scenario
+
+
+def test_table_preserves_every_value():
+    """Each ticket becomes one row containing all of its values."""
+    data = load_test_scenario("chaotic")
+    lines = to_table(data).split("\n")
+
+    assert lines[0] == "|".join(data[0].keys())
+    assert len(lines) == len(data) + 1
+    for ticket, row in zip(data, lines[1:]):
+        assert row.split("|") == [str(v) for v in ticket.values()]
+
+
+def test_dictionary_encoding_round_trips():
+    """Decoding legend codes reproduces the original values."""
+    data = load_test_scenario("extreme") * 3
+    lines = to_dictionary(data).split("\n")
+
+    legends = {}
+    while lines[0].startswith("@") and "|" not in lines[0]:
+        column, entries = lines.pop(0)[1:].split(": ", 1)
+        legends[column] = dict(entry.split("=", 1) for entry in entries.split("; "))
+    header = lines.pop(0).split("|")
+
+    assert legends
+    for ticket, row in zip(data, lines):
+        decoded = {
+            column.lstrip("@"): legends[column[1:]][cell] if column.startswith("@") else cell
+            for column, cell in zip(header, row.split("|"))
+        }
+        assert decoded == {k: str(v) for k, v in ticket.items()}
+
+
+def test_compact_formats_use_fewer_tokens_than_pretty_json():
+    """Table encoding cuts estimated tokens by more than half across the scenarios."""
+    totals = {fmt: 0 for fmt in FORMATS}
+    for scenario in list_scenarios():
+        data = load_test_scenario(scenario)
+        if not data:
+            continue
+        counts = {fmt: estimate_tokens(serialize_records(data, fmt)) for fmt in FORMATS}
+        assert counts["table"] < counts["minified"] < counts["json"]
+        for fmt, count in counts.items():
+            totals[fmt] += count
+
+    assert totals["table"] < totals["json"] / 2
+    assert totals["dictionary"] < totals["json"] / 2
+
+
+def test_minified_is_valid_json():
+    data = load_test_scenario("chaotic")
+    text = serialize_records(data, "minified")
+    assert json.loads(text.split("\n", 1)[1]) == data
+
+
+def test_serialize_briefing_and_unknown_format():
+    briefing = {"summary": "All quiet.", "items": []}
+    assert serialize_briefing(briefing).startswith("Summary: All quiet.")
+    assert serialize_briefing({}) == "(no briefing)"
+    assert set(FORMATS) == {"json", "minified", "table", "dictionary"}
+    with pytest.raises(ValueError):
+        serialize_records([], "yaml")
@@ -0,0 +1,45 @@
+"""
+Unit tests for the server-side bound query_tickets tool.
+"""
+
+import asyncio
+import importlib
+
+import pytest
+
+from app.agents.chat_agent import chat_agent
+
+chat_agent_module = importlib.import_module("app.agents.chat_agent")
+
+
+def test_tool_schema_takes_only_ids():
+    """The model never has to echo the dataset back as a tool argument."""
+    spec = chat_agent._new_agent().tool_registry.get_all_tools_config()["query_tickets"]
+    assert list(spec["inputSchema"]["json"]["properties"]) == ["ticket_ids"]
+
+
+@pytest.mark.asyncio
+async def test_tool_sees_its_own_request_dataset(fake_agent):
+    """Concurrent chats each resolve IDs against their own dataset only."""
+
+    class ToolCallingAgent:
+        def __init__(self, *args, **kwargs):
+            self.messages = []
+
+        def __call__(self, prompt, **kwargs):
+            rows = chat_agent.query_tickets(ticket_ids=["TKT-1", "TKT-9"])
+            return ";".join(f"{r['id']}@{r['customer']}" for r in rows)
+
+    fake_agent(ToolCallingAgent)
+
+    def dataset(customer):
+        return [{"id": f"TKT-{i}", "customer": customer, "status": "Open"} for i in range(1, 4)]
+
+    acme, globex = await asyncio.gather(
+        chat_agent.chat("Show TKT-1", [], {"data": dataset("Acme")}),
+        chat_agent.chat("Show TKT-1", [], {"data": dataset("Globex")}),
+    )
+
+    assert acme["response"] == "TKT-1@Acme"
+    assert globex["response"] == "TKT-1@Globex"
+    assert len(chat_agent_module._request_store.get()) == 0
@@ -0,0 +1,88 @@
+"""
+Unit tests for the deterministic SLA/conflict analyzer.
+"""
+
+import pytest
+from datetime import datetime, timezone
+
+from app.agents.briefing_agent import briefing_agent
+from app.services.sla_analyzer import SLAAnalyzer, parse_ticket_date, summarize_findings
+from test_data.loader import load_test_scenario
+
+REFERENCE_TIME = datetime(2026, 1, 24, 9, 0, tzinfo=timezone.utc)
+
+
+def _items_by_id(items):
+    return {item.id: item for item in items}
+
+
+def test_parse_ticket_date_formats():
+    """Plain dates and ISO timestamps both parse; junk returns None."""
+    assert parse_ticket_date("2026-01-19").isoformat() == "2026-01-19"
+    assert parse_ticket_date("2026-01-21T10:00:00Z").isoformat() == "2026-01-21"
+    assert parse_ticket_date("not a date") is None
+    assert parse_ticket_date(None) is None
+
+
+def test_chaotic_scenario_findings():
+    """Chaotic scenario yields the known breaches and conflicts."""
+    items = _items_by_id(SLAAnalyzer().analyze(load_test_scenario("chaotic"), now=REFERENCE_TIME))
+
+    assert items["sla-TKT-99"].severity == "CRITICAL"
+    assert "overdue by 5 days" in items["sla-TKT-99"].title
+    assert items["conflict-TKT-101"].type == "DATA_CONFLICT"
+    assert items["conflict-TKT-108"].severity == "CRITICAL"
+    # Closed duplicate must not produce an SLA breach for the closed record
+    assert "sla-TKT-101" not in items
+    assert "sla-TKT-105" not in items
+
+
+def test_items_sorted_by_severity():
+    """Most severe findings come first."""
+    items = SLAAnalyzer().analyze(load_test_scenario("extreme"), now=REFERENCE_TIME)
+    ranks = [["LOW", "MEDIUM", "HIGH", "CRITICAL"].index(i.severity) for i in items]
+    assert ranks == sorted(ranks, reverse=True)
+
+
+def test_empty_dataset():
+    """No data means no findings and a plain summary."""
+    assert SLAAnalyzer().analyze([], now=REFERENCE_TIME) == []
+    assert "No SLA breaches" in summarize_findings([], 0)
+
+
+@pytest.mark.asyncio
+async def test_analyze_data_keeps_findings_when_model_fails(monkeypatch):
+    """A model failure only loses the narrative, not the computed findings."""
+    def failing_agent(prompt, **kwargs):
+        raise RuntimeError("Bedrock unavailable")
+
+    monkeypatch.setattr(briefing_agent, "_new_agent", lambda: failing_agent)
+    briefing_agent.snapshots.clear()
+    result = await briefing_agent.analyze_data(load_test_scenario("chaotic"))
+
+    ids = {item["id"] for item in result["items"]}
+    assert {"conflict-TKT-101", "conflict-TKT-108"} <= ids
+    assert result["summary"].startswith("Analyzed 7 tickets")
+
+
+@pytest.mark.asyncio
+async def test_analyze_data_merges_model_insights(monkeypatch):
+    """Model output contributes summary and INSIGHT items on top of findings."""
+    def fake_agent(prompt, **kwargs):
+        assert "PRECOMPUTED FINDINGS" in prompt
+        return """```json
+{"summary": "Two conflicts need reconciling.",
+ "insights": [{"id": "conflict-TKT-101", "type": "SLA_BREACH", "title": "Sync gap",
+   "description": "Salesforce and ServiceNow drift.", "severity": "HIGH",
+   "relatedTicketIds": ["TKT-101"]},
+  {"title": "missing fields"}]}
+```"""
+
+    monkeypatch.setattr(briefing_agent, "_new_agent", lambda: fake_agent)
+    briefing_agent.snapshots.clear()
+    result = await briefing_agent.analyze_data(load_test_scenario("chaotic"))
+
+    insights = [item for item in result["items"] if item["type"] == "INSIGHT"]
+    assert result["summary"] == "Two conflicts need reconciling."
+    assert len(insights) == 1
+    assert insights[0]["id"] != "conflict-TKT-101"
@@ -0,0 +1,123 @@
+"""
+Unit tests for speculative knowledge base retrieval and parallel tool calls.
+"""
+
+import importlib
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+from strands.tools.executors import ConcurrentToolExecutor
+
+from app.agents.chat_agent import chat_agent
+from app.main import app
+from app.services import kb_cache as kb_cache_module
+from app.services.speculative_retrieval import (
+    SpeculativeRetriever,
+    Speculation,
+    is_hybrid,
+    speculative_query,
+)
+from app.services.ticket_store import TicketStore
+
+chat_agent_module = importlib.import_module("app.agents.chat_agent")
+
+TICKETS = [{"id": "TKT-101", "title": "Login outage", "status": "Open", "priority": "High"}]
+RESULT = {"score": 0.9, "location": {"s3Location": {"uri": "s3://kb/login.md"}}}
+
+
+@pytest.mark.parametrize("message, hybrid", [
+    ("What's wrong with TKT-101 and how do I fix it?", True),
+    ("What is the escalation procedure for tkt-101?", True),
+    ("Show TKT-101", False),
+    ("How do I reset a printer?", False),
+])
+def test_is_hybrid(message, hybrid):
+    assert is_hybrid(message) == hybrid
+
+
+def test_speculative_query_uses_ticket_titles():
+    store = TicketStore(TICKETS)
+
+    assert speculative_query("How do I fix tkt-101 and TKT-7?", store) == "How do I fix Login outage and TKT-7?"
+
+
+def test_speculation_matches_similar_queries_with_default_parameters():
+    speculation = Speculation("What's wrong with Login outage and how do I fix it?", None, 0.6, 1.0)
+
+    assert speculation.matches({"text": "how to fix login outage"})
+    assert speculation.matches({"text": "login outage fix", "enableMetadata": True})
+    assert not speculation.matches({"text": "printer toner replacement"})
+    assert not speculation.matches({"text": "login outage fix", "numberOfResults": 3})
+
+
+class SearchLog:
+    """Stands in for the Bedrock query; signals when the first search starts."""
+
+    def __init__(self):
+        self.queries = []
+        self.started = threading.Event()
+
+    def __call__(self, tool_input):
+        self.queries.append(tool_input["text"])
+        self.started.set()
+        return [RESULT]
+
+
+@pytest.fixture
+def hybrid_chat(monkeypatch):
+    search = SearchLog()
+    retriever = SpeculativeRetriever()
+    monkeypatch.setattr(kb_cache_module, "search_bedrock", search)
+    monkeypatch.setattr(kb_cache_module.kb_cache, "enabled", False)
+    monkeypatch.setattr(chat_agent_module, "speculative_retriever", retriever)
+    return search, retriever
+
+
+def _agent_retrieving(search, query):
+    class ModelThenRetrieve:
+        """The first model call finishes only once the knowledge base query is running."""
+
+        def __init__(self, *args, **kwargs):
+            self.messages = []
+
+        def __call__(self, prompt, **kwargs):
+            assert search.started.wait(timeout=5)
+            kb_cache_module.kb_cache.retrieve({"toolUseId": "t1", "input": {"text": query}})
+            return "Restart the auth service."
+
+    return ModelThenRetrieve
+
+
+@pytest.mark.asyncio
+async def test_hybrid_question_retrieves_during_the_first_model_call(hybrid_chat, fake_agent):
+    search, retriever = hybrid_chat
+    fake_agent(_agent_retrieving(search, "how to fix login outage"))
+
+    result = await chat_agent.chat("What's wrong with TKT-101 and how do I fix it?", [], {"data": TICKETS})
+
+    assert search.queries == ["What's wrong with Login outage and how do I fix it?"]
+    assert result["citations"][0]["documentId"] == "s3://kb/login.md"
+    assert retriever.stats()["used"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unrelated_retrieve_queries_again(hybrid_chat, fake_agent):
+    search, retriever = hybrid_chat
+    fake_agent(_agent_retrieving(search, "printer toner replacement"))
+
+    await chat_agent.chat("What's wrong with TKT-101 and how do I fix it?", [], {"data": TICKETS})
+
+    assert search.queries[1] == "printer toner replacement"
+    assert retriever.stats()["unused"] == 1
+
+
+def test_chat_agent_runs_tool_calls_concurrently():
+    assert isinstance(chat_agent._new_agent().tool_executor, ConcurrentToolExecutor)
+
+
+def test_speculative_retrieval_stats_endpoint():
+    response = TestClient(app).get("/api/v1/chat/speculative-retrieval/stats")
+
+    assert response.status_code == 200
+    assert {"enabled", "started", "used", "unused", "used_ratio", "avg_wait_ms"} <= set(response.json())
@@ -0,0 +1,118 @@
+"""
+Unit tests for structured briefing output and tolerant JSON extraction.
+"""
+
+import pytest
+
+from app.agents.briefing_agent import briefing_agent
+from app.models.briefing import BriefingItem, BriefingNarrative
+from app.utils.json_stream import extract_json_object
+from test_data.loader import load_test_scenario
+
+GOOD_INSIGHT = {
+    "id": "i1", "type": "INSIGHT", "title": "Vendor backlog", "description": "Pending vendor",
+    "severity": "MEDIUM", "relatedTicketIds": ["TKT-101"]
+}
+
+
+class StructuredResult:
+    def __init__(self, structured_output):
+        self.structured_output = structured_output
+
+    def __str__(self):
+        return ""
+
+
+class ValidationFailingAgent:
+    """Model produced a tool call whose input fails validation as a whole."""
+
+    def __init__(self):
+        self.messages = []
+
+    def __call__(self, prompt, **kwargs):
+        self.messages.append({"role": "assistant", "content": [{"toolUse": {
+            "name": "BriefingNarrative",
+            "input": {"summary": "Salvaged summary.", "insights": [GOOD_INSIGHT, {"id": "broken"}]}
+        }}]})
+        raise RuntimeError("structured output validation failed")
+
+
+async def _briefing_with(monkeypatch, agent_factory):
+    monkeypatch.setattr(briefing_agent, "_new_agent", agent_factory)
+    briefing_agent.snapshots.clear()
+    try:
+        return await briefing_agent.analyze_data(load_test_scenario("chaotic"))
+    finally:
+        briefing_agent.snapshots.clear()
+
+
+def test_extract_json_object_strict_and_salvage():
+    """Valid JSON parses as-is; broken JSON keeps every complete item."""
+    assert extract_json_object('```json\n{"summary": "ok", "insights": [],}\n```') == {
+        "summary": "ok", "insights": []
+    }
+
+    truncated = '{"summary": "Partial", "insights": [{"id": "a"}, {"id": oops}, {"id": "c"}, {"id": "d", "ti'
+    assert extract_json_object(truncated, array_key="insights", string_keys=("summary",)) == {
+        "summary": "Partial", "insights": [{"id": "a"}, {"id": "c"}]
+    }
+    assert extract_json_object("no json here", array_key="insights") == {}
+
+
+@pytest.mark.asyncio
+async def test_structured_output_binds_to_briefing_items(monkeypatch):
+    """A structured result is used directly without text parsing."""
+    narrative = BriefingNarrative(summary="Structured.", insights=[BriefingItem(**GOOD_INSIGHT)])
+    calls = []
+
+    def agent(prompt, **kwargs):
+        calls.append(kwargs)
+        return StructuredResult(narrative)
+
+    result = await _briefing_with(monkeypatch, lambda: agent)
+
+    assert calls[0]["structured_output_model"] is BriefingNarrative
+    assert result["summary"] == "Structured."
+    assert "i1" in {item["id"] for item in result["items"]}
+    assert "fallback" not in result
+
+
+@pytest.mark.asyncio
+async def test_failed_validation_salvages_tool_input(monkeypatch):
+    """Valid insights survive when one insight breaks validation; no retry."""
+    agents = []
+
+    def factory():
+        agents.append(ValidationFailingAgent())
+        return agents[-1]
+
+    result = await _briefing_with(monkeypatch, factory)
+    insights = [item for item in result["items"] if item["type"] == "INSIGHT"]
+
+    assert len(agents) == 1
+    assert result["summary"] == "Salvaged summary."
+    assert [item["id"] for item in insights] == ["i1"]
+
+
+@pytest.mark.asyncio
+async def test_missing_summary_keeps_salvaged_insights_uncached(monkeypatch):
+    """Insights without a summary are served with a local summary and not cached."""
+    def agent(prompt, **kwargs):
+        return '{"insights": [%s, {"id": "x"' % str(GOOD_INSIGHT).replace("'", '"')
+
+    result = await _briefing_with(monkeypatch, lambda: agent)
+
+    assert result["fallback"] is True
+    assert result["summary"].startswith("Analyzed 7 tickets")
+    assert "i1" in {item["id"] for item in result["items"]}
+
+
+def test_colliding_insight_ids_are_renamed_to_a_free_id():
+    finding = BriefingItem(**{**GOOD_INSIGHT, "id": "i1", "type": "SLA_BREACH"})
+    raw = [{**GOOD_INSIGHT, "id": "insight-2"}, {**GOOD_INSIGHT, "id": "i1"}]
+
+    insights = briefing_agent._collect_insights(raw, [finding])
+
+    ids = [item.id for item in insights]
+    assert ids[0] == "insight-2"
+    assert len(set(ids) | {"i1"}) == 3
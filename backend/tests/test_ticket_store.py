@@ -0,0 +1,109 @@
+"""
+Unit tests for the indexed ticket store and the find_tickets tool.
+"""
+
+import random
+
+import pytest
+
+from app.agents.chat_agent import chat_agent
+from app.services.ticket_store import TicketStore
+from test_data.loader import load_test_scenario
+
+
+def _ids(result):
+    return [t["id"] for t in result["tickets"]]
+
+
+def test_get_returns_every_duplicate_record():
+    """Conflicting records for one ID are all returned, in dataset order."""
+    data = load_test_scenario("chaotic")
+    store = TicketStore(data)
+    duplicated = next(t["id"] for t in data if sum(d["id"] == t["id"] for d in data) > 1)
+
+    records = store.get([duplicated, "NOPE"])
+    assert len(records) == sum(t["id"] == duplicated for t in data)
+    assert {r["source"] for r in records} == {t["source"] for t in data if t["id"] == duplicated}
+
+
+def test_find_filters_case_insensitively_and_intersects():
+    store = TicketStore([
+        {"id": "A", "status": "Open", "priority": "High", "customer": "Acme", "dueDate": "2026-01-20"},
+        {"id": "B", "status": "Closed", "priority": "High", "customer": "Acme", "dueDate": "2026-01-18"},
+        {"id": "C", "status": "Open", "priority": "Low", "customer": "Globex", "dueDate": "2026-01-22"},
+        {"id": "D", "status": "In Progress", "priority": "Critical", "customer": "acme"},
+    ])
+
+    assert _ids(store.find({"customer": "ACME", "priority": ["high", "critical"]})) == ["A", "B", "D"]
+    assert _ids(store.find({"customer": "acme", "open": True})) == ["A", "D"]
+    assert _ids(store.find({"dueAfter": "2026-01-19", "dueBefore": "2026-01-22"})) == ["A", "C"]
+    assert store.find({"status": "Pending"}) == {"total": 0, "tickets": []}
+
+
+def test_find_sorts_and_limits_with_total():
+    store = TicketStore([
+        {"id": "A", "priority": "Low", "dueDate": "2026-01-20"},
+        {"id": "B", "priority": "Critical", "dueDate": "2026-01-25"},
+        {"id": "C", "priority": "High"},
+        {"id": "D", "priority": "Critical", "dueDate": "2026-01-18"},
+    ])
+
+    assert _ids(store.find(sort="dueDate")) == ["D", "A", "B", "C"]
+    assert _ids(store.find(sort="-dueDate")) == ["B", "A", "D", "C"]
+    top = store.find(sort="-priority", limit=2)
+    assert _ids(top) == ["B", "D"] and top["total"] == 4
+
+
+def test_find_rejects_unknown_fields():
+    store = TicketStore([])
+    with pytest.raises(ValueError):
+        store.find({"colour": "red"})
+    with pytest.raises(ValueError):
+        store.find(sort="title")
+    with pytest.raises(ValueError):
+        store.find({"dueBefore": "soon"})
+
+
+def test_lookups_touch_only_indexed_candidates_at_100k_tickets():
+    """Indexed lookups do not scale with dataset size the way a scan would."""
+    rng = random.Random(7)
+    data = [
+        {
+            "id": f"TKT-{i}",
+            "status": rng.choice(["Open", "In Progress", "Closed"]),
+            "priority": rng.choice(["Low", "Medium", "High", "Critical"]),
+            "customer": f"Customer {i % 500}",
+            "dueDate": f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}",
+        }
+        for i in range(100_000)
+    ]
+    store = TicketStore(data)
+    touched = {"checks": 0, "sort_keys": 0}
+
+    def counting(method, counter):
+        def build(*args, **kwargs):
+            inner = method(*args, **kwargs)
+
+            def counted(p):
+                touched[counter] += 1
+                return inner(p)
+            return counted
+        return build
+
+    store._field_predicate = counting(store._field_predicate, "checks")
+    store._sort_key = counting(store._sort_key, "sort_keys")
+
+    for i in range(1000):
+        assert store.get([f"TKT-{i * 97}"])[0]["id"] == f"TKT-{i * 97}"
+        result = store.find({"customer": f"Customer {i % 500}", "priority": "Critical"}, sort="dueDate", limit=5)
+        assert all(t["priority"] == "Critical" for t in result["tickets"])
+
+    # Each customer has 200 tickets: the customer index drives the scan and only
+    # its tickets are checked against the priority filter (a scan checks 100k)
+    assert touched["checks"] == 1000 * 200
+    assert touched["sort_keys"] <= 1000 * 200
+
+
+def test_find_tickets_tool_schema():
+    spec = chat_agent._new_agent().tool_registry.get_all_tools_config()["find_tickets"]
+    assert set(spec["inputSchema"]["json"]["properties"]) == {"filters", "sort", "limit"}
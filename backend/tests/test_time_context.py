@@ -0,0 +1,139 @@
+"""
+Unit tests for the precomputed time context injected into agent prompts.
+"""
+
+import importlib
+from datetime import datetime, timezone
+
+import pytest
+
+from app.agents.action_agent import action_agent
+from app.agents.briefing_agent import briefing_agent
+from app.services.dataset_registry import dataset_registry
+from app.services.time_context import TimeContext, annotate_tickets, reference_time_line
+from app.utils.hashing import dataset_hash
+
+REFERENCE_TIME = datetime(2026, 1, 24, 9, 0, tzinfo=timezone.utc)
+
+
+def test_annotate_tickets_days_overdue_and_until_due():
+    """Open tickets get day counts; closed and undated tickets get None."""
+    data = [
+        {"id": "A", "status": "Open", "dueDate": "2026-01-21"},
+        {"id": "B", "status": "In Progress", "dueDate": "2026-01-27T10:00:00Z"},
+        {"id": "C", "status": "Closed", "dueDate": "2026-01-01"},
+        {"id": "D", "status": "Open"},
+    ]
+    annotated = {t["id"]: t for t in annotate_tickets(data, REFERENCE_TIME)}
+
+    assert (annotated["A"]["daysOverdue"], annotated["A"]["daysUntilDue"]) == (3, 0)
+    assert (annotated["B"]["daysOverdue"], annotated["B"]["daysUntilDue"]) == (0, 3)
+    assert annotated["C"]["daysOverdue"] is None
+    assert annotated["D"]["daysUntilDue"] is None
+    assert "daysOverdue" not in data[0]
+
+
+def test_time_context_computes_once_per_dataset_and_day(monkeypatch):
+    """Repeat requests for the same dataset reuse the annotated copy."""
+    module = importlib.import_module("app.services.time_context")
+    calls = []
+    original = module.annotate_tickets
+
+    def counting(data, now=None):
+        calls.append(now)
+        return original(data, now)
+
+    monkeypatch.setattr(module, "annotate_tickets", counting)
+    context = TimeContext()
+    data = [{"id": "A", "status": "Open", "dueDate": "2026-01-21"}]
+
+    first = context.annotate(data, REFERENCE_TIME)
+    second = context.annotate(list(data), REFERENCE_TIME.replace(hour=17))
+    context.annotate(data, datetime(2026, 1, 25, tzinfo=timezone.utc))
+
+    assert first is second
+    assert len(calls) == 2
+
+
+def test_reference_time_line():
+    assert reference_time_line(REFERENCE_TIME) == "REFERENCE TIME: 2026-01-24T09:00:00Z (Saturday)"
+
+
+@pytest.mark.asyncio
+async def test_chat_prompt_carries_time_context_without_time_tool(fake_agent):
+    """Chat agent gets the reference time and SLA fields instead of a current_time tool."""
+    chat_module = importlib.import_module("app.agents.chat_agent")
+    captured = {}
+
+    class FakeAgent:
+        def __init__(self, **kwargs):
+            captured["tools"] = kwargs.get("tools", [])
+
+        def __call__(self, prompt, **kwargs):
+            captured["prompt"] = prompt
+            return "TKT-1 is 3 days overdue."
+
+    fake_agent(FakeAgent)
+    context = {"data": [{"id": "TKT-1", "status": "Open", "dueDate": "2026-01-01"}]}
+    await chat_module.chat_agent.chat("What is overdue?", [], context)
+
+    assert captured["prompt"].startswith("REFERENCE TIME: ")
+    assert "daysOverdue" in captured["prompt"]
+    tool_names = [getattr(t, "tool_name", getattr(t, "__name__", "")) for t in captured["tools"]]
+    assert "current_time" not in tool_names
+
+
+class AnsweringAgent:
+    def __init__(self, **kwargs):
+        pass
+
+    def __call__(self, prompt, **kwargs):
+        return "Done."
+
+
+@pytest.mark.asyncio
+async def test_action_prompt_has_the_same_time_context_for_inline_and_uploaded_data(fake_agent):
+    prompts = []
+
+    class FakeAgent:
+        def __init__(self, **kwargs):
+            pass
+
+        def __call__(self, prompt, **kwargs):
+            prompts.append(prompt)
+            return "Done."
+
+    fake_agent(FakeAgent, mode="action")
+    data = [{"id": "TKT-1", "status": "Open", "dueDate": "2026-01-01"}]
+    await action_agent.execute("Escalate TKT-1", {"data": data})
+    await action_agent.execute("Escalate TKT-1", {}, dataset=dataset_registry.register(data))
+
+    for prompt in prompts:
+        assert prompt.startswith("REFERENCE TIME: ")
+        assert "daysOverdue" in prompt
+    assert prompts[0] == prompts[1]
+
+
+@pytest.mark.asyncio
+async def test_chat_hashes_inline_data_once_per_message(fake_agent, monkeypatch):
+    chat_module = importlib.import_module("app.agents.chat_agent")
+    module = importlib.import_module("app.services.time_context")
+    hashes = []
+
+    def counting(data):
+        hashes.append(len(data))
+        return dataset_hash(data)
+
+    monkeypatch.setattr(chat_module, "dataset_hash", counting)
+    monkeypatch.setattr(module, "dataset_hash", counting)
+    fake_agent(AnsweringAgent)
+
+    await chat_module.chat_agent.chat("What is overdue?", [], {"data": [{"id": "TKT-1", "status": "Open"}]})
+
+    assert hashes == [1]
+
+
+def test_briefing_prompt_uses_reference_time():
+    prompt = briefing_agent._build_narrative_prompt([], [], REFERENCE_TIME)
+    assert "REFERENCE TIME: 2026-01-24T09:00:00Z" in prompt
+    assert "current_time" not in briefing_agent._new_agent().tool_names